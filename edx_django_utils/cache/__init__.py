@@ -4,4 +4,19 @@ Cache utilities public api
 See README.rst for details.
 """
 
-from .utils import DEFAULT_REQUEST_CACHE, RequestCache, TieredCache, get_cache_key
+from .decorators import request_cached, tiered_cached
+from .invalidation import (
+    DjangoCacheInvalidationBackend,
+    ProcessCacheInvalidationBackend,
+    RedisPubSubInvalidationBackend
+)
+from .utils import (
+    DEFAULT_REQUEST_CACHE,
+    CacheKeyBuilder,
+    RequestCache,
+    TieredCache,
+    get_cache_custom_attributes,
+    get_cache_key,
+    get_cache_key_prefix,
+    get_request_cache_namespace_sizes
+)
@@ -0,0 +1,213 @@
+"""
+Optional compression and chunking of values stored in the django cache tier
+of the TieredCache.
+
+The codec is disabled unless the TIERED_CACHE_CODEC setting is set. Values are
+compressed once their serialized size reaches TIERED_CACHE_CODEC_MIN_SIZE, and
+values that are still larger than TIERED_CACHE_CODEC_CHUNK_SIZE are split
+across several keys, so that they fit within memcached's item size limit.
+
+Decoding does not depend on the settings, so values written while the codec
+was enabled can still be read after it is disabled.
+"""
+import pickle
+import time
+import zlib
+from uuid import uuid4
+
+from django.conf import settings
+
+try:
+    import lz4.frame
+except ImportError:  # pragma: no cover
+    lz4 = None
+
+CODEC_DEFAULT_MIN_SIZE = 1024
+# Memcached's default item size limit is 1 MiB, including some overhead.
+CODEC_DEFAULT_CHUNK_SIZE = 1000 * 1000
+
+_SERIALIZE_BYTES = 'bytes'
+_SERIALIZE_STR = 'str'
+_SERIALIZE_PICKLE = 'pickle'
+
+
+class _EncodedValue:
+    """
+    A value that was serialized and possibly compressed by the codec.
+    """
+    __slots__ = ('compression', 'serialization', 'payload')
+
+    def __init__(self, compression, serialization, payload):
+        self.compression = compression
+        self.serialization = serialization
+        self.payload = payload
+
+    def __getstate__(self):
+        return (self.compression, self.serialization, self.payload)
+
+    def __setstate__(self, state):
+        self.compression, self.serialization, self.payload = state
+
+
+class _ChunkedValue:
+    """
+    A manifest for an encoded value that was split across several keys.
+    """
+    __slots__ = ('compression', 'serialization', 'chunk_keys')
+
+    def __init__(self, compression, serialization, chunk_keys):
+        self.compression = compression
+        self.serialization = serialization
+        self.chunk_keys = chunk_keys
+
+    def __getstate__(self):
+        return (self.compression, self.serialization, self.chunk_keys)
+
+    def __setstate__(self, state):
+        self.compression, self.serialization, self.chunk_keys = state
+
+
+class CodecStats:
+    """
+    Sizes and timing for a single encode or decode.
+    """
+    __slots__ = ('serialized_size', 'stored_size', 'duration')
+
+    def __init__(self, serialized_size, stored_size, duration):
+        self.serialized_size = serialized_size
+        self.stored_size = stored_size
+        self.duration = duration
+
+
+def _get_compression():
+    """
+    Returns the configured compression, or None if the codec is disabled.
+    """
+    # .. setting_name: TIERED_CACHE_CODEC
+    # .. setting_default: None
+    # .. setting_description: Enables compression and chunking of large values stored in the
+    #   django cache tier of the TieredCache. Either 'zlib', or 'lz4' (requires the lz4 package).
+    compression = getattr(settings, 'TIERED_CACHE_CODEC', None)
+    if compression not in (None, 'zlib', 'lz4'):
+        raise ValueError(f'Unknown TIERED_CACHE_CODEC {compression!r}.')
+    if compression == 'lz4' and lz4 is None:
+        raise ValueError("TIERED_CACHE_CODEC 'lz4' requires the lz4 package.")
+    return compression
+
+
+def encode(key, value):
+    """
+    Encodes a value for the django cache.
+
+    Returns:
+        A tuple of a dict of the keys and values to store (which is just
+        ``{key: value}`` if the value was not encoded), and a CodecStats or
+        None if the value was not encoded.
+
+    """
+    compression = _get_compression()
+    if compression is None:
+        return {key: value}, None
+
+    start = time.perf_counter()
+    if isinstance(value, bytes):
+        serialization, data = _SERIALIZE_BYTES, value
+    elif isinstance(value, str):
+        serialization, data = _SERIALIZE_STR, value.encode('utf-8')
+    else:
+        serialization, data = _SERIALIZE_PICKLE, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    # .. setting_name: TIERED_CACHE_CODEC_MIN_SIZE
+    # .. setting_default: 1024
+    # .. setting_description: Serialized size, in bytes, from which values are compressed when
+    #   TIERED_CACHE_CODEC is set. Smaller values are stored as is.
+    if len(data) < getattr(settings, 'TIERED_CACHE_CODEC_MIN_SIZE', CODEC_DEFAULT_MIN_SIZE):
+        return {key: value}, None
+
+    payload = _compress(compression, data)
+    if len(payload) >= len(data):
+        compression, payload = None, data
+
+    # .. setting_name: TIERED_CACHE_CODEC_CHUNK_SIZE
+    # .. setting_default: 1000000
+    # .. setting_description: Maximum size, in bytes, of an encoded value stored under a single
+    #   key when TIERED_CACHE_CODEC is set. Larger values are split across several keys.
+    chunk_size = getattr(settings, 'TIERED_CACHE_CODEC_CHUNK_SIZE', CODEC_DEFAULT_CHUNK_SIZE)
+    if len(payload) <= chunk_size:
+        items = {key: _EncodedValue(compression, serialization, payload)}
+    else:
+        # A unique prefix keeps readers from mixing chunks of different versions.
+        chunk_prefix = f'{key}.chunk.{uuid4().hex[:8]}.'
+        chunks = {
+            f'{chunk_prefix}{index}': payload[offset:offset + chunk_size]
+            for index, offset in enumerate(range(0, len(payload), chunk_size))
+        }
+        items = {key: _ChunkedValue(compression, serialization, list(chunks)), **chunks}
+
+    return items, CodecStats(len(data), len(payload), time.perf_counter() - start)
+
+
+def is_encoded(stored_value):
+    """
+    Returns True if the value read from the django cache needs to be decoded.
+    """
+    return isinstance(stored_value, (_EncodedValue, _ChunkedValue))
+
+
+def get_chunk_keys(stored_value):
+    """
+    Returns the keys that must also be read to decode the value.
+    """
+    return stored_value.chunk_keys if isinstance(stored_value, _ChunkedValue) else []
+
+
+def decode(stored_value, chunks=None):
+    """
+    Decodes a value read from the django cache.
+
+    Arguments:
+        stored_value: An encoded value, for which ``is_encoded`` is True.
+        chunks (dict): The values read for the keys from ``get_chunk_keys``.
+
+    Returns:
+        A tuple of whether the value could be decoded, the value, and a
+        CodecStats. Values can't be decoded if any of their chunks are missing.
+
+    """
+    start = time.perf_counter()
+    if isinstance(stored_value, _ChunkedValue):
+        chunks = chunks or {}
+        if any(chunk_key not in chunks for chunk_key in stored_value.chunk_keys):
+            return False, None, None
+        payload = b''.join(chunks[chunk_key] for chunk_key in stored_value.chunk_keys)
+    else:
+        payload = stored_value.payload
+
+    data = _decompress(stored_value.compression, payload)
+    if stored_value.serialization == _SERIALIZE_BYTES:
+        value = data
+    elif stored_value.serialization == _SERIALIZE_STR:
+        value = data.decode('utf-8')
+    else:
+        value = pickle.loads(data)
+    return True, value, CodecStats(len(data), len(payload), time.perf_counter() - start)
+
+
+def _compress(compression, data):
+    """
+    Compresses the serialized data.
+    """
+    if compression == 'lz4':
+        return lz4.frame.compress(data)
+    return zlib.compress(data)
+
+
+def _decompress(compression, payload):
+    """
+    Decompresses the payload, unless it was stored uncompressed.
+    """
+    if compression is None:
+        return payload
+    if compression == 'lz4':
+        return lz4.frame.decompress(payload)
+    return zlib.decompress(payload)
@@ -0,0 +1,212 @@
+"""
+Decorators for memoizing functions in the RequestCache or the TieredCache.
+
+Usage:
+
+    from edx_django_utils.cache import request_cached, tiered_cached
+
+    @request_cached()
+    def get_course_overview(course_id):
+        ...
+
+    @tiered_cached(timeout=60 * 60)
+    def get_site_configuration(domain):
+        ...
+
+The undecorated function is available as ``__wrapped__``, and ``recompute``
+can be used to force a cache miss for a single call, e.g.
+``get_site_configuration.recompute('example.com')``.
+"""
+import functools
+import hashlib
+import inspect
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+from .utils import DEFAULT_NAMESPACE, RequestCache, TieredCache, _accumulate_cache_attribute
+
+REQUEST_CACHED_NAMESPACE = f'{DEFAULT_NAMESPACE}.request_cached'
+
+# Memcached rejects keys longer than 250 characters, so leave room for any
+# KEY_PREFIX and version added by the django cache.
+MAX_READABLE_KEY_LENGTH = 200
+
+# Types whose repr is the same in every process, and so can be part of a
+# default tiered_cached key. Tuples of these are allowed too.
+_STABLE_REPR_TYPES = (str, int, float, type(None))
+
+
+def request_cached(namespace=None, key_fn=None):
+    """
+    Decorator that caches a function's return value in the RequestCache, keyed
+    by the function and its arguments.
+
+    Arguments must be hashable, or have a consistent repr, to be used as part
+    of the key. Methods are cached per instance.
+
+    Arguments:
+        namespace (str): (Optional) RequestCache namespace to store values in.
+            Sharing a namespace between functions lets them be cleared together.
+        key_fn (callable): (Optional) Called with the same arguments as the
+            function to build the cache key, instead of using all arguments.
+
+    """
+    def decorator(func):
+        request_cache = RequestCache(namespace or REQUEST_CACHED_NAMESPACE)
+        func_name = f'{func.__module__}.{func.__qualname__}'
+
+        def _get_key(args, kwargs):
+            if key_fn is not None:
+                return (func_name, key_fn(*args, **kwargs))
+            key = (func_name, args, tuple(sorted(kwargs.items()))) if kwargs else (func_name, args)
+            try:
+                hash(key)
+            except TypeError:
+                key = repr(key)
+            return key
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _get_key(args, kwargs)
+            cached_response = request_cache.get_cached_response(key)
+            if cached_response.is_found:
+                _accumulate_cached_attribute('request_cached.hits')
+                return cached_response.value
+
+            _accumulate_cached_attribute('request_cached.misses')
+            value = func(*args, **kwargs)
+            request_cache.set(key, value)
+            return value
+
+        def recompute(*args, **kwargs):
+            """
+            Calls the function, bypassing and then updating the cache.
+            """
+            value = func(*args, **kwargs)
+            request_cache.set(_get_key(args, kwargs), value)
+            return value
+
+        wrapper.recompute = recompute
+        return wrapper
+    return decorator
+
+
+def tiered_cached(timeout=DEFAULT_TIMEOUT, key_fn=None):
+    """
+    Decorator that caches a function's return value in the TieredCache.
+
+    By default, the key is made readable from the function's module, name and
+    the length-prefixed repr of its arguments, and is only hashed when it would
+    be too long or contain characters that memcached does not allow. Only
+    arguments that are str, int, float, bool, None, or tuples of these can be
+    part of a default key, since the repr of other objects may differ between
+    processes, like the default repr with its memory address. Methods have no
+    default key, since the instance or class can't be part of a key shared
+    across processes, so a ``key_fn`` must be provided for them.
+
+    Arguments:
+        timeout (int): (Optional) The django cache timeout. See
+            ``TieredCache.set_all_tiers``.
+        key_fn (callable): (Optional) Called with the same arguments as the
+            function to build the string cache key. Required for methods.
+
+    Raises:
+        TypeError: If the function is a method and no ``key_fn`` is provided,
+            or, when it is called, if an argument can't be part of the default
+            key.
+
+    """
+    def decorator(func):
+        prefix = f'{func.__module__}.{func.__qualname__}'
+        parameters = list(inspect.signature(func).parameters)
+        if key_fn is None and parameters and parameters[0] in ('self', 'cls'):
+            raise TypeError(f'tiered_cached requires a key_fn for the method {prefix}.')
+
+        def _get_key(args, kwargs):
+            if key_fn is not None:
+                return key_fn(*args, **kwargs)
+            for value in (*args, *kwargs.values()):
+                if not _has_stable_repr(value):
+                    raise TypeError(
+                        f'tiered_cached requires a key_fn for {prefix}, since an argument of type '
+                        f'{type(value).__name__} may not have the same repr in every process.'
+                    )
+            return _get_readable_cache_key(prefix, args, kwargs)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _get_key(args, kwargs)
+            cached_response = TieredCache.get_cached_response(key)
+            if cached_response.is_found:
+                _accumulate_cached_attribute('tiered_cached.hits')
+                return cached_response.value
+
+            _accumulate_cached_attribute('tiered_cached.misses')
+            value = func(*args, **kwargs)
+            TieredCache.set_all_tiers(key, value, timeout)
+            return value
+
+        def recompute(*args, **kwargs):
+            """
+            Calls the function, bypassing and then updating the cache.
+            """
+            value = func(*args, **kwargs)
+            TieredCache.set_all_tiers(_get_key(args, kwargs), value, timeout)
+            return value
+
+        wrapper.recompute = recompute
+        return wrapper
+    return decorator
+
+
+def _has_stable_repr(value):
+    """
+    Returns True if the value's repr is the same in every process.
+    """
+    if isinstance(value, tuple):
+        return all(_has_stable_repr(item) for item in value)
+    return isinstance(value, _STABLE_REPR_TYPES)
+
+
+def _get_readable_cache_key(prefix, args, kwargs):
+    """
+    Returns a cache key built from the prefix and the repr of the arguments,
+    falling back to an MD5 hash only if the key is not safe to use with
+    memcached.
+
+    Each repr is prefixed by its length, so that different arguments can't
+    make the same key, like ``('a:b',)`` and ``('a', 'b')``.
+    """
+    parts = [prefix]
+    for arg in args:
+        arg_repr = repr(arg)
+        parts.append(f'{len(arg_repr)}:{arg_repr}')
+    if kwargs:
+        for name, value in sorted(kwargs.items()):
+            value_repr = repr(value)
+            parts.append(f'{name}={len(value_repr)}:{value_repr}')
+    key = ':'.join(parts)
+
+    if len(key) <= MAX_READABLE_KEY_LENGTH and key.isascii() and key.isprintable() and ' ' not in key:
+        return key
+    return hashlib.md5(key.encode('utf-8')).hexdigest()
+
+
+def _accumulate_cached_attribute(name):
+    """
+    Counts a hit or miss for the memoization decorators.
+
+    .. custom_attribute_name: request_cached.hits
+    .. custom_attribute_description: The number of calls to ``request_cached`` functions
+       that were served from the RequestCache during the request.
+    .. custom_attribute_name: request_cached.misses
+    .. custom_attribute_description: The number of calls to ``request_cached`` functions
+       that had to be computed during the request.
+    .. custom_attribute_name: tiered_cached.hits
+    .. custom_attribute_description: The number of calls to ``tiered_cached`` functions
+       that were served from the TieredCache during the request.
+    .. custom_attribute_name: tiered_cached.misses
+    .. custom_attribute_description: The number of calls to ``tiered_cached`` functions
+       that had to be computed during the request.
+    """
+    _accumulate_cache_attribute(name, 1)
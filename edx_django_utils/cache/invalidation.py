@@ -0,0 +1,182 @@
+"""
+Cross-process invalidation for the process cache tier of the TieredCache.
+
+The process cache is local to each process, so when ``delete_all_tiers`` runs
+in one process, the other processes need to be told to evict the key. The
+invalidation backend publishes each invalidated key, and every process checks
+for new invalidations once per request in ``TieredCacheMiddleware``.
+"""
+
+import logging
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache as django_cache
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+from django.utils.module_loading import import_string
+
+log = logging.getLogger(__name__)
+
+INVALIDATION_NAMESPACE = 'edx_django_utils.cache.process_cache.invalidation'
+
+_NOT_CHECKED = object()
+
+
+class ProcessCacheInvalidationBackend(ABC):
+    """
+    Base class for process cache invalidation backends.
+    """
+    @abstractmethod
+    def publish(self, key):
+        """
+        Tell all processes to evict the key from their process cache.
+        """
+
+    @abstractmethod
+    def get_invalidations(self):
+        """
+        Returns the set of keys invalidated since the last call in this process,
+        or None if the entire process cache should be cleared because the
+        invalidated keys can't be determined.
+        """
+
+
+class DjangoCacheInvalidationBackend(ProcessCacheInvalidationBackend):
+    """
+    Publishes invalidations through the django cache.
+
+    A version counter is incremented for each invalidated key, and the key is
+    stored under the new version. Checking for invalidations costs a single
+    django cache ``get`` when nothing has changed, and one more ``get_many``
+    when something has.
+    """
+    VERSION_KEY = f'{INVALIDATION_NAMESPACE}.version'
+    KEY_PREFIX = f'{INVALIDATION_NAMESPACE}.key.'
+    # Invalidated keys are kept long enough for every process to see them.
+    KEY_TIMEOUT = 60 * 60
+    # If more keys than this were invalidated since the last check, clear everything.
+    MAX_KEYS_PER_CHECK = 100
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = _NOT_CHECKED
+
+    def publish(self, key):
+        try:
+            version = django_cache.incr(self.VERSION_KEY)
+        except ValueError:
+            django_cache.add(self.VERSION_KEY, 0, None)
+            version = django_cache.incr(self.VERSION_KEY)
+        django_cache.set(f'{self.KEY_PREFIX}{version}', key, self.KEY_TIMEOUT)
+
+    def get_invalidations(self):
+        current_version = django_cache.get(self.VERSION_KEY)
+        with self._lock:
+            previous_version, self._version = self._version, current_version
+
+        if previous_version == current_version:
+            return set()
+        if previous_version is _NOT_CHECKED or current_version is None:
+            # First check in this process, or the django cache was cleared.
+            return None
+        if previous_version is None:
+            # The version counter starts at zero.
+            previous_version = 0
+        if current_version < previous_version:
+            return None
+        if current_version - previous_version > self.MAX_KEYS_PER_CHECK:
+            return None
+
+        version_keys = [f'{self.KEY_PREFIX}{version}' for version in range(previous_version + 1, current_version + 1)]
+        invalidated = django_cache.get_many(version_keys)
+        if len(invalidated) < len(version_keys):
+            # Some keys were evicted or are not written yet, so play it safe.
+            return None
+        return set(invalidated.values())
+
+
+class RedisPubSubInvalidationBackend(ProcessCacheInvalidationBackend):
+    """
+    Publishes invalidations on a Redis pub/sub channel.
+
+    Each process subscribes on a background thread and collects invalidated
+    keys, so checking for invalidations makes no network calls. Invalidations
+    published while a process is disconnected from Redis are lost.
+
+    Requires the ``redis`` package.
+    """
+    CHANNEL = INVALIDATION_NAMESPACE
+
+    # pylint: disable=import-outside-toplevel
+    def __init__(self):
+        # If import fails, the backend won't be used.
+        import redis  # pylint: disable=import-error
+
+        # .. setting_name: TIERED_CACHE_INVALIDATION_REDIS_URL
+        # .. setting_default: None
+        # .. setting_description: Redis URL used by the RedisPubSubInvalidationBackend to
+        #   publish and subscribe to process cache invalidations.
+        self._client = redis.Redis.from_url(settings.TIERED_CACHE_INVALIDATION_REDIS_URL)
+        self._lock = threading.Lock()
+        self._pending_keys = set()
+
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{self.CHANNEL: self._on_message})
+        self._thread = pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+    def _on_message(self, message):
+        """
+        Collects an invalidated key published by any process.
+        """
+        key = message['data']
+        if isinstance(key, bytes):
+            key = key.decode('utf-8')
+        with self._lock:
+            self._pending_keys.add(key)
+
+    def publish(self, key):
+        self._client.publish(self.CHANNEL, key)
+
+    def get_invalidations(self):
+        with self._lock:
+            invalidated_keys, self._pending_keys = self._pending_keys, set()
+        return invalidated_keys
+
+
+@lru_cache
+def configured_invalidation_backend():
+    """
+    Produce the ProcessCacheInvalidationBackend instance from Django settings,
+    or None if cross-process invalidation is not configured.
+    """
+    # .. setting_name: TIERED_CACHE_INVALIDATION_BACKEND
+    # .. setting_default: None
+    # .. setting_description: Dotted module path to a class implementing
+    #   `edx_django_utils.cache.ProcessCacheInvalidationBackend`, such as the built-in
+    #   `DjangoCacheInvalidationBackend` or `RedisPubSubInvalidationBackend`. When set,
+    #   ``TieredCache.delete_all_tiers`` evicts the key from the process cache tier of every
+    #   process within one request. Requires the TieredCacheMiddleware.
+    backend_class = getattr(settings, 'TIERED_CACHE_INVALIDATION_BACKEND', None)
+    if not backend_class:
+        return None
+
+    try:
+        cls = import_string(backend_class)
+        if issubclass(cls, ProcessCacheInvalidationBackend):
+            return cls()
+        log.warning(
+            f"Could not load TIERED_CACHE_INVALIDATION_BACKEND {backend_class!r}: "
+            f"{cls} is not a subclass of ProcessCacheInvalidationBackend"
+        )
+    except BaseException as e:
+        log.warning(f"Could not load TIERED_CACHE_INVALIDATION_BACKEND {backend_class!r}: {e!r}")
+    return None
+
+
+@receiver(setting_changed)
+def _reset_state(sender, **kwargs):  # pylint: disable=unused-argument
+    """Reset caches when settings change during unit tests."""
+    configured_invalidation_backend.cache_clear()
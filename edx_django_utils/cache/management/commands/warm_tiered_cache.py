@@ -0,0 +1,114 @@
+"""
+Management command `warm_tiered_cache` writes the values from the cache warmers
+of all plugin apps to the django cache tier of the TieredCache, so that a new
+deploy or a restarted cache does not start cold.
+
+Plugin apps register warmers with ``PluginCacheWarmers.CONFIG`` in their
+plugin_app config. See ``edx_django_utils.plugins.get_plugin_cache_warmers``.
+"""
+import logging
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from edx_django_utils.cache.utils import RequestCache, _django_cache_set_many
+from edx_django_utils.plugins import get_plugin_cache_warmers
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Runs the TieredCache warmers of all plugin apps for the project type."""
+    help = __doc__
+
+    def add_arguments(self, parser):
+        parser.add_argument('project_type', help="The plugin project type, like 'lms.djangoapp'.")
+        parser.add_argument(
+            '--warmer', dest='warmer_names', action='append', default=[],
+            help='The full path of a warmer to run. May be repeated. Defaults to all warmers.',
+        )
+        parser.add_argument('--workers', type=int, default=4, help='The number of warmers to run at once.')
+        parser.add_argument(
+            '--batch-size', type=int, default=100, help='The number of keys to write with each set_many.',
+        )
+
+    def handle(self, project_type, warmer_names, workers, batch_size, **options):  # pylint: disable=arguments-differ
+        if workers < 1 or batch_size < 1:
+            raise CommandError('--workers and --batch-size must be positive.')
+
+        warmers = get_plugin_cache_warmers(project_type)
+        unknown_warmer_names = set(warmer_names) - set(warmers)
+        if unknown_warmer_names:
+            raise CommandError(f'Unknown cache warmers: {", ".join(sorted(unknown_warmer_names))}')
+        if warmer_names:
+            warmers = {name: warmers[name] for name in warmer_names}
+        if not warmers:
+            self.stdout.write(f'No cache warmers found for {project_type}.')
+            return
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                lambda item: _run_warmer(*item, batch_size=batch_size), warmers.items()
+            ))
+        duration = time.perf_counter() - start
+
+        failed_warmer_names = []
+        for name, key_count, warmer_duration, error in results:
+            if error is None:
+                self.stdout.write(
+                    f'{name}: wrote {key_count} keys in {warmer_duration:.2f}s '
+                    f'({_get_rate(key_count, warmer_duration):.0f} keys/s).'
+                )
+            else:
+                failed_warmer_names.append(name)
+                self.stderr.write(
+                    f'{name}: failed after writing {key_count} keys in {warmer_duration:.2f}s: {error!r}'
+                )
+
+        total_key_count = sum(key_count for _, key_count, _, _ in results)
+        self.stdout.write(
+            f'Wrote {total_key_count} keys from {len(results)} cache warmers in {duration:.2f}s '
+            f'({_get_rate(total_key_count, duration):.0f} keys/s).'
+        )
+        if failed_warmer_names:
+            raise CommandError(f'Cache warmers failed: {", ".join(failed_warmer_names)}')
+
+
+def _run_warmer(name, warmer, batch_size):
+    """
+    Writes the values from a warmer to the django cache in batches.
+
+    Returns:
+        A tuple of the warmer's name, the number of keys written, the duration,
+        and the exception that stopped the warmer, or None.
+
+    """
+    key_count = 0
+    start = time.perf_counter()
+    try:
+        # The warmer runs outside of a request, so its request cache must be cleared.
+        with RequestCache.scope():
+            batches = defaultdict(dict)  # timeout -> {key: value}
+            for key, value, timeout in warmer():
+                batch = batches[timeout]
+                batch[key] = value
+                if len(batch) >= batch_size:
+                    _django_cache_set_many(batches.pop(timeout), timeout)
+                    key_count += len(batch)
+            for timeout, batch in batches.items():
+                _django_cache_set_many(batch, timeout)
+                key_count += len(batch)
+    except Exception as e:
+        log.exception(f'Cache warmer {name} failed.')
+        return name, key_count, time.perf_counter() - start, e
+    finally:
+        connections.close_all()
+    return name, key_count, time.perf_counter() - start, None
+
+
+def _get_rate(key_count, duration):
+    return key_count / duration if duration else 0
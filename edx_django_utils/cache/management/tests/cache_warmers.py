@@ -0,0 +1,18 @@
+"""
+Cache warmers for testing the `warm_tiered_cache` command.
+"""
+
+
+def warm_values():
+    for index in range(5):
+        yield f'warm_values:{index}', index, 60
+    yield 'warm_values:forever', 'forever', None
+
+
+def warm_other_values():
+    yield 'warm_other_values:0', 0, 60
+
+
+def warm_and_fail():
+    yield 'warm_and_fail:0', 0, 60
+    raise ValueError('Database unavailable')
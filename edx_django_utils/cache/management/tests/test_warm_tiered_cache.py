@@ -0,0 +1,93 @@
+"""
+Tests for the `warm_tiered_cache` management command.
+"""
+from io import StringIO
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.core.cache import cache as django_cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from edx_django_utils.cache import RequestCache, TieredCache
+from edx_django_utils.cache.utils import _django_cache_set_many
+from edx_django_utils.plugins import PluginCacheWarmers
+
+TEST_PROJECT_TYPE = 'lms.djangoapp'
+WARMERS_MODULE = 'edx_django_utils.cache.management.tests.cache_warmers'
+
+
+def _get_plugin_app_configs(warmer_func_names):
+    return [SimpleNamespace(
+        name='edx_django_utils.cache.management.tests',
+        plugin_app={PluginCacheWarmers.CONFIG: {TEST_PROJECT_TYPE: {PluginCacheWarmers.WARMERS: warmer_func_names}}},
+    )]
+
+
+class TestWarmTieredCacheCommand(TestCase):
+    """
+    Tests the `warm_tiered_cache` command.
+    """
+    def setUp(self):
+        super().setUp()
+        TieredCache.dangerous_clear_all_tiers()
+        RequestCache.clear_all_namespaces()
+        self.stdout, self.stderr = '', ''
+
+    def _call_command(self, warmer_func_names, *args, **kwargs):
+        """
+        Calls the command with plugin warmers from the cache_warmers module.
+        """
+        stdout, stderr = StringIO(), StringIO()
+        with patch(
+            'edx_django_utils.plugins.registry.get_plugin_app_configs',
+            return_value=_get_plugin_app_configs(warmer_func_names),
+        ):
+            try:
+                call_command('warm_tiered_cache', TEST_PROJECT_TYPE, *args, stdout=stdout, stderr=stderr, **kwargs)
+            finally:
+                self.stdout, self.stderr = stdout.getvalue(), stderr.getvalue()
+
+    def test_warm(self):
+        with patch(
+            'edx_django_utils.cache.management.commands.warm_tiered_cache._django_cache_set_many',
+            wraps=_django_cache_set_many,
+        ) as mock_set_many:
+            self._call_command(['warm_values', 'warm_other_values'], batch_size=2)
+
+        self.assertEqual(django_cache.get_many([f'warm_values:{index}' for index in range(5)]), {
+            f'warm_values:{index}': index for index in range(5)
+        })
+        self.assertEqual(django_cache.get('warm_values:forever'), 'forever')
+        self.assertEqual(django_cache.get('warm_other_values:0'), 0)
+        # Batches of 2, 2, 1 and 1 (by timeout) values, plus 1 for the other warmer.
+        self.assertEqual(mock_set_many.call_count, 5)
+        self.assertIn(f'{WARMERS_MODULE}.warm_values: wrote 6 keys', self.stdout)
+        self.assertIn('Wrote 7 keys from 2 cache warmers', self.stdout)
+        # Warmed values are only written to the django cache.
+        self.assertEqual(RequestCache().data, {})
+
+    def test_selected_warmer(self):
+        self._call_command(['warm_values', 'warm_other_values'], '--warmer', f'{WARMERS_MODULE}.warm_other_values')
+        self.assertIsNone(django_cache.get('warm_values:0'))
+        self.assertEqual(django_cache.get('warm_other_values:0'), 0)
+
+    def test_unknown_warmer(self):
+        with self.assertRaisesRegex(CommandError, 'Unknown cache warmers: unknown'):
+            self._call_command(['warm_values'], '--warmer', 'unknown')
+
+    def test_no_warmers(self):
+        self._call_command([])
+        self.assertIn(f'No cache warmers found for {TEST_PROJECT_TYPE}.', self.stdout)
+
+    def test_failed_warmer(self):
+        with self.assertRaisesRegex(CommandError, f'Cache warmers failed: {WARMERS_MODULE}.warm_and_fail'):
+            self._call_command(['warm_and_fail', 'warm_other_values'])
+
+        self.assertIn(f"{WARMERS_MODULE}.warm_and_fail: failed after writing 0 keys", self.stderr)
+        self.assertIn("ValueError('Database unavailable')", self.stderr)
+        self.assertEqual(django_cache.get('warm_other_values:0'), 0)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(CommandError):
+            self._call_command(['warm_values'], workers=0)
@@ -4,11 +4,24 @@ Caching utility middleware.
 from django.utils.deprecation import MiddlewareMixin
 
 from . import RequestCache, TieredCache
+from .utils import _ContextVarRequestCache, _get_request_cache
+
+
+def _uses_context_var_request_cache():
+    """
+    Returns True if the request cache is stored in a context variable, which is
+    shared by the event loop and the threads that sync views run in.
+    """
+    return isinstance(_get_request_cache(), _ContextVarRequestCache)
 
 
 class RequestCacheMiddleware(MiddlewareMixin):
     """
     Middleware to clear the request cache as appropriate for new requests.
+
+    This middleware is async capable. Under ASGI, set REQUEST_CACHE_BACKEND to
+    'context_var' so that concurrent requests do not share a request cache.
+    Otherwise, the cache is cleared in the thread that sync views run in.
     """
     def process_request(self, request):
         """
@@ -30,14 +43,61 @@ class RequestCacheMiddleware(MiddlewareMixin):
         RequestCache.clear_all_namespaces()
         return response
 
+    async def __acall__(self, request):
+        """
+        Async version of the middleware, which clears the request cache without
+        the thread hops ``MiddlewareMixin`` would add around the sync hooks.
+
+        The thread hops are still needed for the 'thread_local' request cache,
+        since sync views would otherwise see the previous request's cache.
+        """
+        if not _uses_context_var_request_cache():
+            return await super().__acall__(request)
+        RequestCache.clear_all_namespaces()
+        response = await self.get_response(request)
+        RequestCache.clear_all_namespaces()
+        return response
+
 
 class TieredCacheMiddleware(MiddlewareMixin):
     """
-    Middleware to store whether or not to force django cache misses.
+    Middleware to store whether or not to force django cache misses, to
+    apply process cache invalidations from other processes, and to flush
+    TieredCache writes buffered with ``write_behind``.
+
+    This middleware is async capable, and only avoids thread hops when
+    REQUEST_CACHE_BACKEND is 'context_var'.
     """
     def process_request(self, request):
         """
         Stores whether or not FORCE_CACHE_MISS_PARAM was supplied in the
-        request.
+        request, and evicts any keys invalidated by other processes from the
+        process cache.
         """
         TieredCache._get_and_set_force_cache_miss(request)  # pylint: disable=protected-access
+        TieredCache._apply_process_cache_invalidations()  # pylint: disable=protected-access
+
+    def process_response(self, request, response):
+        """
+        Writes any values buffered by ``TieredCache.set_all_tiers`` with
+        ``write_behind`` to the django cache.
+        """
+        TieredCache.flush()
+        return response
+
+    async def __acall__(self, request):
+        """
+        Async version of the middleware, which only runs code in a thread when
+        it may block.
+
+        With the 'thread_local' request cache, the sync hooks are run in the
+        thread of sync views instead, so that those views read the forced
+        cache miss and their ``write_behind`` writes are flushed.
+        """
+        if not _uses_context_var_request_cache():
+            return await super().__acall__(request)
+        await TieredCache._aget_and_set_force_cache_miss(request)  # pylint: disable=protected-access
+        await TieredCache._aapply_process_cache_invalidations()  # pylint: disable=protected-access
+        response = await self.get_response(request)
+        await TieredCache.aflush()
+        return response
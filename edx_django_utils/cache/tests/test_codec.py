@@ -0,0 +1,145 @@
+"""
+Tests for the TieredCache codec.
+"""
+import random
+import zlib
+from unittest import mock
+
+import ddt
+from django.core.cache import cache as django_cache
+from django.test import TestCase as DjangoTestCase
+from django.test import override_settings
+
+from edx_django_utils.cache import codec
+from edx_django_utils.cache.utils import RequestCache, TieredCache, get_cache_custom_attributes
+
+TEST_KEY = "clöbert"
+TEST_KEY_2 = "clöbert2"
+# Hex digits compress to about half their size.
+LARGE_VALUE = random.Random(0).randbytes(2000).hex()
+
+
+@ddt.ddt
+@override_settings(TIERED_CACHE_CODEC='zlib')
+class TestCodec(DjangoTestCase):  # pylint: disable=missing-class-docstring
+
+    @override_settings(TIERED_CACHE_CODEC=None)
+    def test_disabled(self):
+        self.assertEqual(codec.encode(TEST_KEY, LARGE_VALUE), ({TEST_KEY: LARGE_VALUE}, None))
+
+    def test_small_value_not_encoded(self):
+        self.assertEqual(codec.encode(TEST_KEY, "bertclöb"), ({TEST_KEY: "bertclöb"}, None))
+
+    @ddt.data(LARGE_VALUE, LARGE_VALUE.encode('utf-8'), {'values': [LARGE_VALUE, 1, None]})
+    def test_round_trip(self, value):
+        items, stats = codec.encode(TEST_KEY, value)
+        self.assertEqual(list(items), [TEST_KEY])
+        self.assertTrue(codec.is_encoded(items[TEST_KEY]))
+        self.assertLess(stats.stored_size, stats.serialized_size)
+        self.assertEqual(codec.get_chunk_keys(items[TEST_KEY]), [])
+
+        is_decoded, decoded_value, _ = codec.decode(items[TEST_KEY])
+        self.assertTrue(is_decoded)
+        self.assertEqual(decoded_value, value)
+
+    def test_incompressible_value_stored_uncompressed(self):
+        value = random.Random(0).randbytes(2000)
+        items, stats = codec.encode(TEST_KEY, value)
+        self.assertIsNone(items[TEST_KEY].compression)
+        self.assertEqual(stats.stored_size, stats.serialized_size)
+        self.assertEqual(codec.decode(items[TEST_KEY])[1], value)
+
+    @override_settings(TIERED_CACHE_CODEC_CHUNK_SIZE=100)
+    def test_chunked(self):
+        items, _ = codec.encode(TEST_KEY, LARGE_VALUE)
+        chunk_keys = codec.get_chunk_keys(items[TEST_KEY])
+        self.assertGreater(len(chunk_keys), 1)
+        self.assertEqual(set(items), {TEST_KEY, *chunk_keys})
+        self.assertTrue(all(len(items[chunk_key]) <= 100 for chunk_key in chunk_keys))
+
+        chunks = {chunk_key: items[chunk_key] for chunk_key in chunk_keys}
+        self.assertEqual(codec.decode(items[TEST_KEY], chunks)[:2], (True, LARGE_VALUE))
+        del chunks[chunk_keys[-1]]
+        self.assertEqual(codec.decode(items[TEST_KEY], chunks), (False, None, None))
+
+    @override_settings(TIERED_CACHE_CODEC='bz2')
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            codec.encode(TEST_KEY, LARGE_VALUE)
+
+    @override_settings(TIERED_CACHE_CODEC='lz4')
+    @mock.patch('edx_django_utils.cache.codec.lz4', None)
+    def test_lz4_not_installed(self):
+        with self.assertRaises(ValueError):
+            codec.encode(TEST_KEY, LARGE_VALUE)
+
+    @override_settings(TIERED_CACHE_CODEC='lz4')
+    @mock.patch('edx_django_utils.cache.codec.lz4')
+    def test_lz4(self, mock_lz4):
+        mock_lz4.frame.compress.side_effect = zlib.compress
+        mock_lz4.frame.decompress.side_effect = zlib.decompress
+        items, _ = codec.encode(TEST_KEY, LARGE_VALUE)
+        self.assertEqual(items[TEST_KEY].compression, 'lz4')
+        self.assertEqual(codec.decode(items[TEST_KEY])[1], LARGE_VALUE)
+        mock_lz4.frame.decompress.assert_called_once()
+
+
+@override_settings(TIERED_CACHE_CODEC='zlib', TIERED_CACHE_CODEC_CHUNK_SIZE=100)
+class TestTieredCacheCodec(DjangoTestCase):  # pylint: disable=missing-class-docstring
+    def setUp(self):
+        super().setUp()
+        RequestCache.clear_all_namespaces()
+        TieredCache.dangerous_clear_all_tiers()
+
+    def test_set_and_get(self):
+        TieredCache.set_all_tiers(TEST_KEY, LARGE_VALUE, 60)
+        self.assertTrue(codec.is_encoded(django_cache.get(TEST_KEY)))
+
+        RequestCache.clear_all_namespaces()
+        self.assertEqual(TieredCache.get_cached_response(TEST_KEY).value, LARGE_VALUE)
+
+    def test_set_and_get_many(self):
+        TieredCache.set_all_tiers_many({TEST_KEY: LARGE_VALUE, TEST_KEY_2: "bertclöb"}, 60)
+        RequestCache.clear_all_namespaces()
+
+        with mock.patch.object(django_cache, 'get_many', wraps=django_cache.get_many) as mock_get_many:
+            cached_responses = TieredCache.get_cached_responses([TEST_KEY, TEST_KEY_2])
+        self.assertEqual(cached_responses[TEST_KEY].value, LARGE_VALUE)
+        self.assertEqual(cached_responses[TEST_KEY_2].value, "bertclöb")
+        # One read for the keys, and one for all of the chunks.
+        self.assertEqual(mock_get_many.call_count, 2)
+
+    def test_missing_chunk_is_a_miss(self):
+        TieredCache.set_all_tiers(TEST_KEY, LARGE_VALUE, 60)
+        django_cache.delete(codec.get_chunk_keys(django_cache.get(TEST_KEY))[0])
+
+        RequestCache.clear_all_namespaces()
+        self.assertFalse(TieredCache.get_cached_response(TEST_KEY).is_found)
+
+    def test_envelope(self):
+        TieredCache.set_all_tiers(TEST_KEY, LARGE_VALUE, 60, stale_after=0)
+        RequestCache.clear_all_namespaces()
+        cached_response = TieredCache.get_cached_response(TEST_KEY)
+        self.assertEqual(cached_response.value, LARGE_VALUE)
+        self.assertTrue(cached_response.is_stale)
+
+    def test_readable_after_disabled(self):
+        TieredCache.set_all_tiers(TEST_KEY, LARGE_VALUE, 60)
+        RequestCache.clear_all_namespaces()
+        with override_settings(TIERED_CACHE_CODEC=None):
+            self.assertEqual(TieredCache.get_cached_response(TEST_KEY).value, LARGE_VALUE)
+
+    def test_stats_reported(self):
+        TieredCache.set_all_tiers(TEST_KEY, LARGE_VALUE, 60)
+        RequestCache().clear()
+        TieredCache.get_cached_response(TEST_KEY)
+
+        attributes = get_cache_custom_attributes()
+        self.assertEqual(set(attributes), {
+            'tiered_cache.codec.encode_ms',
+            'tiered_cache.codec.decode_ms',
+            'tiered_cache.codec.serialized_bytes',
+            'tiered_cache.codec.stored_bytes',
+            'tiered_cache.codec.compression_ratio',
+        })
+        self.assertLess(attributes['tiered_cache.codec.compression_ratio'], 1)
@@ -0,0 +1,200 @@
+"""
+Tests for the memoization decorators.
+"""
+from unittest import mock
+
+from django.test import TestCase
+
+from edx_django_utils.cache import RequestCache, TieredCache, get_cache_custom_attributes, request_cached, tiered_cached
+from edx_django_utils.cache.decorators import REQUEST_CACHED_NAMESPACE, _get_readable_cache_key
+
+TEST_NAMESPACE = "test_namespåce"
+
+
+def _delegate_to(mock_compute):
+    """
+    Returns a plain function that calls the mock, since mocks lack function attributes.
+    """
+    def compute(*args, **kwargs):
+        return mock_compute(*args, **kwargs)
+    return compute
+
+
+class Widget:
+    """
+    A class with cached methods.
+    """
+    def __init__(self, size):
+        self.size = size
+        self.calls = 0
+
+    @request_cached()
+    def get_size(self, multiplier=1):
+        self.calls += 1
+        return self.size * multiplier
+
+    @tiered_cached(key_fn=lambda self, suffix: f'widget_name:{self.size}:{suffix}')
+    def get_name(self, suffix):
+        return f'widget-{suffix}'
+
+
+class TestRequestCached(TestCase):  # pylint: disable=missing-class-docstring
+    def setUp(self):
+        super().setUp()
+        RequestCache.clear_all_namespaces()
+        self.compute = mock.Mock(side_effect=lambda *args, **kwargs: (args, kwargs))
+        self.func = _delegate_to(self.compute)
+
+    def test_cached_by_arguments(self):
+        cached_compute = request_cached()(self.func)
+        self.assertEqual(cached_compute(1, b=2), ((1,), {'b': 2}))
+        self.assertEqual(cached_compute(1, b=2), ((1,), {'b': 2}))
+        self.assertEqual(self.compute.call_count, 1)
+        cached_compute(2, b=2)
+        cached_compute(1)
+        self.assertEqual(self.compute.call_count, 3)
+
+    def test_cached_none(self):
+        compute = mock.Mock(return_value=None)
+        cached_compute = request_cached()(_delegate_to(compute))
+        self.assertIsNone(cached_compute())
+        self.assertIsNone(cached_compute())
+        compute.assert_called_once_with()
+
+    def test_unhashable_arguments(self):
+        cached_compute = request_cached()(self.func)
+        cached_compute([1, 2])
+        cached_compute([1, 2])
+        self.assertEqual(self.compute.call_count, 1)
+
+    def test_namespace_and_key_fn(self):
+        cached_compute = request_cached(namespace=TEST_NAMESPACE, key_fn=lambda a, b: a)(self.func)
+        cached_compute(1, 2)
+        cached_compute(1, 3)
+        self.assertEqual(self.compute.call_count, 1)
+        RequestCache(TEST_NAMESPACE).clear()
+        cached_compute(1, 3)
+        self.assertEqual(self.compute.call_count, 2)
+        self.assertEqual(RequestCache(REQUEST_CACHED_NAMESPACE).data, {})
+
+    def test_wrapped_and_recompute(self):
+        cached_compute = request_cached()(self.func)
+        cached_compute(1)
+        cached_compute.__wrapped__(1)
+        self.assertEqual(self.compute.call_count, 2)
+        cached_compute.recompute(1)
+        cached_compute(1)
+        self.assertEqual(self.compute.call_count, 3)
+
+    def test_same_name_in_other_module(self):
+        cached_compute = request_cached()(self.func)
+        other_func = _delegate_to(mock.Mock(return_value='other'))
+        other_func.__module__ = 'other.module'
+        other_cached_compute = request_cached()(other_func)
+        self.assertEqual(cached_compute(1), ((1,), {}))
+        self.assertEqual(other_cached_compute(1), 'other')
+
+    def test_methods_cached_per_instance(self):
+        widget, other_widget = Widget(2), Widget(3)
+        self.assertEqual(widget.get_size(), 2)
+        self.assertEqual(widget.get_size(), 2)
+        self.assertEqual(other_widget.get_size(multiplier=2), 6)
+        self.assertEqual((widget.calls, other_widget.calls), (1, 1))
+
+    def test_hit_and_miss_counts(self):
+        RequestCache.clear_all_namespaces()
+        cached_compute = request_cached()(self.func)
+        cached_compute(1)
+        cached_compute(1)
+        cached_compute(2)
+        attributes = get_cache_custom_attributes()
+        self.assertEqual(attributes['request_cached.misses'], 2)
+        self.assertEqual(attributes['request_cached.hits'], 1)
+
+
+class TestTieredCached(TestCase):  # pylint: disable=missing-class-docstring
+    def setUp(self):
+        super().setUp()
+        TieredCache.dangerous_clear_all_tiers()
+        self.compute = mock.Mock(side_effect=lambda *args, **kwargs: (args, kwargs))
+        self.func = _delegate_to(self.compute)
+
+    def test_cached_across_requests(self):
+        cached_compute = tiered_cached(timeout=60)(self.func)
+        cached_compute(1, b=2)
+        RequestCache.clear_all_namespaces()
+        self.assertEqual(cached_compute(1, b=2), ((1,), {'b': 2}))
+        self.assertEqual(self.compute.call_count, 1)
+
+    def test_key_fn(self):
+        cached_compute = tiered_cached(key_fn=lambda a, b: f'test_key_fn:{a}')(self.func)
+        cached_compute(1, 2)
+        self.assertTrue(TieredCache.get_cached_response('test_key_fn:1').is_found)
+
+    def test_wrapped_and_recompute(self):
+        cached_compute = tiered_cached()(self.func)
+        cached_compute(1)
+        cached_compute.__wrapped__(1)
+        cached_compute.recompute(1)
+        RequestCache.clear_all_namespaces()
+        cached_compute(1)
+        self.assertEqual(self.compute.call_count, 3)
+
+    def test_method_key(self):
+        with mock.patch.object(TieredCache, 'set_all_tiers') as mock_set_all_tiers:
+            Widget(2).get_name('a')
+        self.assertEqual(mock_set_all_tiers.call_args.args[0], 'widget_name:2:a')
+
+    def test_method_without_key_fn(self):
+        def get_color(self, shade):  # pylint: disable=unused-argument
+            return shade
+
+        with self.assertRaises(TypeError):
+            tiered_cached()(get_color)
+
+    def test_hit_and_miss_counts(self):
+        RequestCache.clear_all_namespaces()
+        cached_compute = tiered_cached()(self.func)
+        cached_compute(1)
+        cached_compute(1)
+        cached_compute(2)
+        attributes = get_cache_custom_attributes()
+        self.assertEqual(attributes['tiered_cached.misses'], 2)
+        self.assertEqual(attributes['tiered_cached.hits'], 1)
+
+    def test_arguments_without_stable_repr(self):
+        @tiered_cached()
+        def get_name(value):
+            return str(value)
+
+        self.assertEqual(get_name((1, 2.5, True, None, ('a',))), "(1, 2.5, True, None, ('a',))")
+        for value in (object(), [1], {'a'}, (1, object())):
+            with self.assertRaises(TypeError):
+                get_name(value)
+            with self.assertRaises(TypeError):
+                get_name(value=value)
+
+    def test_readable_cache_key(self):
+        self.assertEqual(_get_readable_cache_key('prefix', (1, 'a'), {'b': 2}), "prefix:1:1:3:'a':b=1:2")
+        hashed_keys = [
+            _get_readable_cache_key('prefix', ('has space',), {}),
+            _get_readable_cache_key('prefix', ('clöbert',), {}),
+            _get_readable_cache_key('prefix', ('x' * 500,), {}),
+        ]
+        for key in hashed_keys:
+            self.assertEqual(len(key), 32)
+
+    def test_readable_cache_key_collisions(self):
+        colliding_arguments = [
+            (('a:b',), {}),
+            (('a', 'b'), {}),
+            ((None,), {}),
+            (('None',), {}),
+            ((1,), {}),
+            (('1',), {}),
+            (("1:'a'",), {}),
+            ((), {'b': 'a'}),
+            (('b=a',), {}),
+        ]
+        keys = {_get_readable_cache_key('prefix', args, kwargs) for args, kwargs in colliding_arguments}
+        self.assertEqual(len(keys), len(colliding_arguments))
@@ -0,0 +1,134 @@
+"""
+Tests for process cache invalidation.
+"""
+from unittest import mock
+
+from django.core.cache import cache as django_cache
+from django.test import TestCase, override_settings
+
+from edx_django_utils.cache.invalidation import (
+    DjangoCacheInvalidationBackend,
+    RedisPubSubInvalidationBackend,
+    configured_invalidation_backend
+)
+from edx_django_utils.cache.utils import _CACHE_MISS, _PROCESS_CACHE, RequestCache, TieredCache
+
+TEST_KEY = "clöbert"
+TEST_KEY_2 = "clöbert2"
+EXPECTED_VALUE = "bertclöb"
+
+
+class TestDjangoCacheInvalidationBackend(TestCase):  # pylint: disable=missing-class-docstring
+    def setUp(self):
+        super().setUp()
+        django_cache.clear()
+        self.publisher = DjangoCacheInvalidationBackend()
+        self.subscriber = DjangoCacheInvalidationBackend()
+
+    def test_first_check_clears_all(self):
+        self.assertIsNone(self.subscriber.get_invalidations())
+        self.assertEqual(self.subscriber.get_invalidations(), set())
+
+    def test_first_publish(self):
+        self.subscriber.get_invalidations()
+        self.publisher.publish(TEST_KEY)
+        self.assertEqual(self.subscriber.get_invalidations(), {TEST_KEY})
+
+    def test_invalidated_keys(self):
+        self.publisher.publish(TEST_KEY)
+        self.subscriber.get_invalidations()
+
+        self.publisher.publish(TEST_KEY)
+        self.publisher.publish(TEST_KEY_2)
+        self.assertEqual(self.subscriber.get_invalidations(), {TEST_KEY, TEST_KEY_2})
+        self.assertEqual(self.subscriber.get_invalidations(), set())
+
+    def test_django_cache_cleared(self):
+        self.publisher.publish(TEST_KEY)
+        self.subscriber.get_invalidations()
+        django_cache.clear()
+        self.assertIsNone(self.subscriber.get_invalidations())
+
+    def test_missing_invalidated_key(self):
+        self.publisher.publish(TEST_KEY)
+        self.subscriber.get_invalidations()
+        self.publisher.publish(TEST_KEY_2)
+        django_cache.delete(f'{DjangoCacheInvalidationBackend.KEY_PREFIX}2')
+        self.assertIsNone(self.subscriber.get_invalidations())
+
+    @mock.patch.object(DjangoCacheInvalidationBackend, 'MAX_KEYS_PER_CHECK', 1)
+    def test_too_many_invalidations(self):
+        self.publisher.publish(TEST_KEY)
+        self.subscriber.get_invalidations()
+        self.publisher.publish(TEST_KEY)
+        self.publisher.publish(TEST_KEY_2)
+        self.assertIsNone(self.subscriber.get_invalidations())
+
+
+class TestRedisPubSubInvalidationBackend(TestCase):  # pylint: disable=missing-class-docstring
+    @override_settings(TIERED_CACHE_INVALIDATION_REDIS_URL='redis://localhost:6379/0')
+    def test_publish_and_receive(self):
+        mock_redis = mock.MagicMock()
+        with mock.patch.dict('sys.modules', redis=mock_redis):
+            backend = RedisPubSubInvalidationBackend()
+
+        mock_redis.Redis.from_url.assert_called_once_with('redis://localhost:6379/0')
+        client = mock_redis.Redis.from_url.return_value
+        backend.publish(TEST_KEY)
+        client.publish.assert_called_once_with(RedisPubSubInvalidationBackend.CHANNEL, TEST_KEY)
+
+        on_message = client.pubsub.return_value.subscribe.call_args.kwargs[RedisPubSubInvalidationBackend.CHANNEL]
+        on_message({'data': TEST_KEY.encode('utf-8')})
+        self.assertEqual(backend.get_invalidations(), {TEST_KEY})
+        self.assertEqual(backend.get_invalidations(), set())
+
+
+class TestProcessCacheInvalidation(TestCase):  # pylint: disable=missing-class-docstring
+    def setUp(self):
+        super().setUp()
+        TieredCache.dangerous_clear_all_tiers()
+
+    def test_not_configured(self):
+        self.assertIsNone(configured_invalidation_backend())
+        _PROCESS_CACHE.set(TEST_KEY, EXPECTED_VALUE, 60)
+        TieredCache._apply_process_cache_invalidations()  # pylint: disable=protected-access
+        self.assertEqual(_PROCESS_CACHE.get(TEST_KEY), EXPECTED_VALUE)
+
+    @override_settings(TIERED_CACHE_INVALIDATION_BACKEND='edx_django_utils.cache.TieredCache')
+    def test_invalid_backend(self):
+        with self.assertLogs('edx_django_utils.cache.invalidation', level='WARNING'):
+            self.assertIsNone(configured_invalidation_backend())
+
+    @override_settings(
+        TIERED_CACHE_INVALIDATION_BACKEND='edx_django_utils.cache.DjangoCacheInvalidationBackend'
+    )
+    def test_delete_evicts_in_other_processes(self):
+        TieredCache._apply_process_cache_invalidations()  # pylint: disable=protected-access
+        TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE, process_cache_timeout=60)
+        TieredCache.set_all_tiers(TEST_KEY_2, EXPECTED_VALUE, process_cache_timeout=60)
+        # Sets are published too, so that other processes evict their old values.
+        TieredCache._apply_process_cache_invalidations()  # pylint: disable=protected-access
+        self.assertIs(_PROCESS_CACHE.get(TEST_KEY_2), _CACHE_MISS)
+        RequestCache.clear_all_namespaces()
+        TieredCache.get_cached_responses([TEST_KEY, TEST_KEY_2])
+        self.assertEqual(_PROCESS_CACHE.get(TEST_KEY), EXPECTED_VALUE)
+
+        # Simulate a delete from another process, which shares only the django cache.
+        DjangoCacheInvalidationBackend().publish(TEST_KEY)
+        TieredCache._apply_process_cache_invalidations()  # pylint: disable=protected-access
+
+        self.assertIs(_PROCESS_CACHE.get(TEST_KEY), _CACHE_MISS)
+        self.assertEqual(_PROCESS_CACHE.get(TEST_KEY_2), EXPECTED_VALUE)
+
+    @mock.patch('edx_django_utils.cache.utils.configured_invalidation_backend')
+    def test_set_publishes_after_django_cache_write(self, mock_backend):
+        # Another process that rereads the key as soon as it is invalidated must see the new value.
+        mock_backend.return_value.publish.side_effect = lambda key: self.assertIsNotNone(django_cache.get(key))
+        TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE, process_cache_timeout=60)
+        mock_backend.return_value.publish.assert_called_once_with(TEST_KEY)
+
+    @mock.patch('edx_django_utils.cache.utils.configured_invalidation_backend')
+    async def test_async_set_publishes_after_django_cache_write(self, mock_backend):
+        mock_backend.return_value.publish.side_effect = lambda key: self.assertIsNotNone(django_cache.get(key))
+        await TieredCache.aset_all_tiers(TEST_KEY, EXPECTED_VALUE, process_cache_timeout=60)
+        mock_backend.return_value.publish.assert_called_once_with(TEST_KEY)
@@ -1,12 +1,14 @@
 """
 Tests for the RequestCacheMiddleware.
 """
-from unittest.mock import MagicMock, Mock
+from unittest.mock import MagicMock, Mock, patch
 
-from django.test import RequestFactory, TestCase
+from asgiref.sync import sync_to_async
+from django.core.cache import cache as django_cache
+from django.test import RequestFactory, TestCase, override_settings
 
 from edx_django_utils.cache import middleware
-from edx_django_utils.cache.utils import FORCE_CACHE_MISS_PARAM, SHOULD_FORCE_CACHE_MISS_KEY, RequestCache
+from edx_django_utils.cache.utils import FORCE_CACHE_MISS_PARAM, SHOULD_FORCE_CACHE_MISS_KEY, RequestCache, TieredCache
 
 TEST_KEY = "clobert"
 EXPECTED_VALUE = "bertclob"
@@ -36,6 +38,34 @@ class TestRequestCacheMiddleware(TestCase):  # pylint: disable=missing-class-doc
         self.assertEqual(response, EXPECTED_VALUE)
         self._check_request_caches_cleared()
 
+    @override_settings(REQUEST_CACHE_BACKEND='context_var')
+    async def test_async(self):
+        async def get_response(request):
+            self._check_request_caches_cleared()
+            self._dirty_request_cache()
+            return EXPECTED_VALUE
+
+        self._dirty_request_cache()
+        response = await middleware.RequestCacheMiddleware(get_response)(self.request)
+
+        self.assertEqual(response, EXPECTED_VALUE)
+        self._check_request_caches_cleared()
+
+    async def test_async_sync_view(self):
+        # Under ASGI, django runs sync views in a thread, which has its own thread-local request cache.
+        found = []
+
+        def view(request):
+            found.append(self.request_cache.get_cached_response(TEST_KEY).is_found)
+            self.request_cache.set(TEST_KEY, EXPECTED_VALUE)
+            return EXPECTED_VALUE
+
+        request_cache_middleware = middleware.RequestCacheMiddleware(sync_to_async(view))
+        for _ in range(3):
+            await request_cache_middleware(self.request)
+
+        self.assertEqual(found, [False, False, False])
+
     def _check_request_caches_cleared(self):
         """ Checks that all request caches were cleared. """
         self.assertFalse(self.request_cache.get_cached_response(TEST_KEY).is_found)
@@ -58,6 +88,7 @@ class TestTieredCacheMiddleware(TestCase):  # pylint: disable=missing-class-docs
 
         self.request_cache = RequestCache()
         self.request_cache.clear_all_namespaces()
+        TieredCache.dangerous_clear_all_tiers()
 
     def test_process_request(self):
         self.middleware.process_request(self.request)
@@ -80,6 +111,79 @@ class TestTieredCacheMiddleware(TestCase):  # pylint: disable=missing-class-docs
 
         self.assertFalse(self.request_cache.get_cached_response(SHOULD_FORCE_CACHE_MISS_KEY).value)
 
+    @override_settings(REQUEST_CACHE_BACKEND='context_var')
+    async def test_async(self):
+        async def get_response(request):
+            return EXPECTED_VALUE
+
+        # request.user is not set, since it may need a database query.
+        request = RequestFactory().get('/')
+        response = await middleware.TieredCacheMiddleware(get_response)(request)
+
+        self.assertEqual(response, EXPECTED_VALUE)
+        self.assertFalse(self.request_cache.get_cached_response(SHOULD_FORCE_CACHE_MISS_KEY).value)
+
+    @override_settings(REQUEST_CACHE_BACKEND='context_var')
+    async def test_async_force_cache_miss(self):
+        async def get_response(request):
+            return EXPECTED_VALUE
+
+        request = RequestFactory().get(f'/?{FORCE_CACHE_MISS_PARAM}=tRuE')
+        request.user = self._mock_user(is_staff=True)
+        await middleware.TieredCacheMiddleware(get_response)(request)
+
+        self.assertTrue(self.request_cache.get_cached_response(SHOULD_FORCE_CACHE_MISS_KEY).value)
+
+    @override_settings(REQUEST_CACHE_BACKEND='context_var')
+    @patch('edx_django_utils.cache.utils.configured_invalidation_backend')
+    async def test_async_applies_process_cache_invalidations(self, mock_backend):
+        async def get_response(request):
+            return EXPECTED_VALUE
+
+        mock_backend.return_value.get_invalidations.return_value = set()
+        await middleware.TieredCacheMiddleware(get_response)(self.request)
+
+        mock_backend.return_value.get_invalidations.assert_called_once_with()
+
+    def test_process_response_flushes_write_behind(self):
+        TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE, write_behind=True)
+        self.assertIsNone(django_cache.get(TEST_KEY))
+
+        self.middleware.process_response(self.request, self.mock_response)
+        self.assertEqual(django_cache.get(TEST_KEY), EXPECTED_VALUE)
+
+    @override_settings(REQUEST_CACHE_BACKEND='context_var')
+    async def test_async_flushes_write_behind(self):
+        async def get_response(request):
+            await TieredCache.aset_all_tiers(TEST_KEY, EXPECTED_VALUE, write_behind=True)
+            self.assertIsNone(await django_cache.aget(TEST_KEY))
+            return EXPECTED_VALUE
+
+        await middleware.TieredCacheMiddleware(get_response)(self.request)
+        self.assertEqual(await django_cache.aget(TEST_KEY), EXPECTED_VALUE)
+
+    async def test_async_sync_view(self):
+        force_cache_miss = []
+
+        def view(request):
+            force_cache_miss.append(self.request_cache.get_cached_response(SHOULD_FORCE_CACHE_MISS_KEY).value)
+            TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE, write_behind=True)
+            return EXPECTED_VALUE
+
+        request = RequestFactory().get(f'/?{FORCE_CACHE_MISS_PARAM}=tRuE')
+        request.user = self._mock_user(is_staff=True)
+        await middleware.TieredCacheMiddleware(sync_to_async(view))(request)
+
+        self.assertEqual(force_cache_miss, [True])
+        self.assertEqual(await django_cache.aget(TEST_KEY), EXPECTED_VALUE)
+
+    @patch('edx_django_utils.cache.utils.configured_invalidation_backend')
+    def test_process_request_applies_process_cache_invalidations(self, mock_backend):
+        mock_backend.return_value.get_invalidations.return_value = set()
+        self.middleware.process_request(self.request)
+
+        mock_backend.return_value.get_invalidations.assert_called_once_with()
+
     def _mock_user(self, is_staff=True):
         mock_user = MagicMock()
         mock_user.is_active = True
@@ -2,25 +2,45 @@
 Tests for the request cache.
 """
 
+import asyncio
+import hashlib
+import pickle
+import sys
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
 from threading import Thread
 from unittest import TestCase, mock
 
 import ddt
+from django.core.cache import cache as django_cache
 from django.test import TestCase as DjangoTestCase
+from django.test import override_settings
 
 from edx_django_utils.cache.utils import (
+    _CACHE_MISS,
+    _NEGATIVE_CACHE_TOMBSTONE,
+    _PROCESS_CACHE,
+    _STALE_REFRESH_PENDING_KEYS,
     DEFAULT_REQUEST_CACHE_NAMESPACE,
     SHOULD_FORCE_CACHE_MISS_KEY,
+    STAMPEDE_LOCK_KEY_SUFFIX,
     CachedResponse,
     CachedResponseError,
+    CacheKeyBuilder,
     RequestCache,
     TieredCache,
-    get_cache_key
+    _TieredCacheEnvelope,
+    get_cache_custom_attributes,
+    get_cache_key,
+    get_cache_key_prefix,
+    get_request_cache_namespace_sizes
 )
 
 TEST_KEY = "clöbert"
 TEST_KEY_2 = "clöbert2"
 TEST_KEY_UNICODE = "clöbert"
+TEST_KEY_3 = "clöbert3"
 EXPECTED_VALUE = "bertclöb"
 EXPECTED_VALUE_2 = "bertclöb2"
 TEST_NAMESPACE = "test_namespåce"
@@ -142,11 +162,139 @@ class TestRequestCache(TestCase):  # pylint: disable=missing-class-docstring
         with self.assertRaises(AssertionError):
             RequestCache(DEFAULT_REQUEST_CACHE_NAMESPACE)
 
+    def test_get(self):
+        self.assertIsNone(self.request_cache.get(TEST_KEY))
+        self.assertEqual(self.request_cache.get(TEST_KEY, EXPECTED_VALUE_2), EXPECTED_VALUE_2)
+        self.request_cache.set(TEST_KEY, None)
+        self.assertIsNone(self.request_cache.get(TEST_KEY, EXPECTED_VALUE_2))
+        self.request_cache.set(TEST_KEY, EXPECTED_VALUE)
+        self.assertEqual(self.request_cache.get(TEST_KEY, EXPECTED_VALUE_2), EXPECTED_VALUE)
+        self.assertIsNone(self.other_request_cache.get(TEST_KEY))
+
+    def test_bind(self):
+        bound_request_cache = self.request_cache.bind()
+        bound_request_cache.set(TEST_KEY, EXPECTED_VALUE)
+        bound_request_cache.setdefault(TEST_KEY, EXPECTED_VALUE_2)
+        bound_request_cache.setdefault(TEST_KEY_2, EXPECTED_VALUE_2)
+        self.assertEqual(self.request_cache.data, {TEST_KEY: EXPECTED_VALUE, TEST_KEY_2: EXPECTED_VALUE_2})
+
+        self.request_cache.set(TEST_KEY, EXPECTED_VALUE_2)
+        self.assertEqual(bound_request_cache.get(TEST_KEY), EXPECTED_VALUE_2)
+        self.assertEqual(bound_request_cache.get_cached_response(TEST_KEY).value, EXPECTED_VALUE_2)
+
+        bound_request_cache.delete(TEST_KEY)
+        bound_request_cache.delete(TEST_KEY)
+        self.assertEqual(bound_request_cache.get(TEST_KEY, EXPECTED_VALUE), EXPECTED_VALUE)
+        self.assertFalse(bound_request_cache.get_cached_response(TEST_KEY).is_found)
+        self.assertFalse(self.request_cache.get_cached_response(TEST_KEY).is_found)
+
+    def test_max_entries(self):
+        request_cache = RequestCache(TEST_NAMESPACE, max_entries=2)
+        request_cache.set(TEST_KEY, EXPECTED_VALUE)
+        request_cache.set(TEST_KEY_2, EXPECTED_VALUE_2)
+        self.assertEqual(request_cache.get(TEST_KEY), EXPECTED_VALUE)
+        request_cache.setdefault(TEST_KEY_3, EXPECTED_VALUE)
+
+        self.assertEqual(list(request_cache.data), [TEST_KEY, TEST_KEY_3])
+        self.assertEqual(
+            get_cache_custom_attributes(), {f'request_cache.namespace.{TEST_NAMESPACE}.evictions': 1}
+        )
+
+    def test_max_entries_bound(self):
+        bound_request_cache = RequestCache(TEST_NAMESPACE, max_entries=2).bind()
+        bound_request_cache.set(TEST_KEY, EXPECTED_VALUE)
+        bound_request_cache.set(TEST_KEY_2, EXPECTED_VALUE_2)
+        self.assertTrue(bound_request_cache.get_cached_response(TEST_KEY).is_found)
+        bound_request_cache.set(TEST_KEY_3, EXPECTED_VALUE)
+        bound_request_cache.set(TEST_KEY, EXPECTED_VALUE_2)
+
+        self.assertEqual(self.other_request_cache.data, {TEST_KEY_3: EXPECTED_VALUE, TEST_KEY: EXPECTED_VALUE_2})
+
+    def test_invalid_max_entries(self):
+        with self.assertRaises(AssertionError):
+            RequestCache(TEST_NAMESPACE, max_entries=0)
+
+    def test_scope(self):
+        self.request_cache.set(TEST_KEY, EXPECTED_VALUE)
+        with self.assertRaises(ValueError):
+            with RequestCache.scope():
+                self.assertIsNone(self.request_cache.get(TEST_KEY))
+                self.other_request_cache.set(TEST_KEY, EXPECTED_VALUE)
+                raise ValueError()
+        self.assertIsNone(self.other_request_cache.get(TEST_KEY))
+
+    def test_namespace_sizes(self):
+        self.request_cache.get(TEST_KEY)
+        for index in range(100):
+            self.other_request_cache.set(index, EXPECTED_VALUE)
+
+        namespace_sizes = get_request_cache_namespace_sizes()
+        self.assertEqual(list(namespace_sizes), [TEST_NAMESPACE])
+        entries, approximate_bytes = namespace_sizes[TEST_NAMESPACE]
+        self.assertEqual(entries, 100)
+        expected_bytes = sys.getsizeof(self.other_request_cache.data) + 100 * (
+            sys.getsizeof(0) + sys.getsizeof(EXPECTED_VALUE)
+        )
+        self.assertAlmostEqual(approximate_bytes, expected_bytes, delta=100)
+
+    def test_get_performance(self):
+        self.request_cache.set(TEST_KEY, EXPECTED_VALUE)
+        bound_request_cache = self.request_cache.bind()
+
+        def get_duration(get_value):
+            # The best of several runs is the least affected by other load on the machine.
+            return min(timeit.repeat(get_value, number=10000, repeat=5))
+
+        cached_response_duration = get_duration(lambda: self.request_cache.get_cached_response(TEST_KEY).value)
+        for get_value in (
+            lambda: self.request_cache.get(TEST_KEY),
+            lambda: bound_request_cache.get(TEST_KEY),
+        ):
+            duration = get_duration(get_value)
+            self.assertLess(
+                duration, cached_response_duration,
+                f'Request cache get takes {duration}s, but get_cached_response takes {cached_response_duration}s.',
+            )
+
+
+@override_settings(REQUEST_CACHE_BACKEND='context_var')
+class TestContextVarRequestCache(DjangoTestCase):  # pylint: disable=missing-class-docstring
+    def setUp(self):
+        super().setUp()
+        RequestCache.clear_all_namespaces()
+        self.request_cache = RequestCache()
+        self.other_request_cache = RequestCache(TEST_NAMESPACE)
 
+    def test_get_cached_response(self):
+        self.request_cache.set(TEST_KEY, EXPECTED_VALUE)
+        self.assertEqual(self.request_cache.get_cached_response(TEST_KEY).value, EXPECTED_VALUE)
+        self.assertFalse(self.other_request_cache.get_cached_response(TEST_KEY).is_found)
+
+        RequestCache.clear_all_namespaces()
+        self.assertFalse(self.request_cache.get_cached_response(TEST_KEY).is_found)
+
+    async def test_isolated_between_tasks(self):
+        async def handle_request(value):
+            RequestCache.clear_all_namespaces()
+            self.request_cache.set(TEST_KEY, value)
+            await asyncio.sleep(0)
+            return self.request_cache.get_cached_response(TEST_KEY).value
+
+        values = await asyncio.gather(handle_request(EXPECTED_VALUE), handle_request(EXPECTED_VALUE_2))
+        self.assertEqual(values, [EXPECTED_VALUE, EXPECTED_VALUE_2])
+
+    @override_settings(REQUEST_CACHE_BACKEND='process_local')
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            self.request_cache.set(TEST_KEY, EXPECTED_VALUE)
+
+
+@ddt.ddt
 class TestTieredCache(DjangoTestCase):  # pylint: disable=missing-class-docstring
     def setUp(self):
         super().setUp()
         self.request_cache = RequestCache()
+        RequestCache.clear_all_namespaces()
         TieredCache.dangerous_clear_all_tiers()
 
     def test_get_cached_response_all_tier_miss(self):
@@ -186,6 +334,396 @@ class TestTieredCache(DjangoTestCase):  # pylint: disable=missing-class-docstrin
         mock_cache_set.assert_called_with(TEST_KEY, EXPECTED_VALUE, TEST_DJANGO_TIMEOUT_CACHE)
         self.assertEqual(self.request_cache.get_cached_response(TEST_KEY).value, EXPECTED_VALUE)
 
+    def test_get_cached_responses(self):
+        self.request_cache.set(TEST_KEY, EXPECTED_VALUE)
+        with mock.patch('django.core.cache.cache.get_many') as mock_cache_get_many:
+            mock_cache_get_many.return_value = {TEST_KEY_2: EXPECTED_VALUE_2}
+            cached_responses = TieredCache.get_cached_responses([TEST_KEY, TEST_KEY_2, TEST_KEY_UNICODE + '3'])
+        mock_cache_get_many.assert_called_once_with([TEST_KEY_2, TEST_KEY_UNICODE + '3'])
+
+        self.assertEqual(cached_responses[TEST_KEY].value, EXPECTED_VALUE)
+        self.assertEqual(cached_responses[TEST_KEY_2].value, EXPECTED_VALUE_2)
+        self.assertFalse(cached_responses[TEST_KEY_UNICODE + '3'].is_found)
+        self.assertEqual(
+            self.request_cache.get_cached_response(TEST_KEY_2).value, EXPECTED_VALUE_2,
+            'Django cache hit should cache value in request cache.'
+        )
+
+    @mock.patch('django.core.cache.cache.get_many')
+    def test_get_cached_responses_all_request_cache_hits(self, mock_cache_get_many):
+        self.request_cache.set(TEST_KEY, EXPECTED_VALUE)
+        cached_responses = TieredCache.get_cached_responses([TEST_KEY])
+        self.assertEqual(cached_responses[TEST_KEY].value, EXPECTED_VALUE)
+        mock_cache_get_many.assert_not_called()
+
+    @mock.patch('django.core.cache.cache.get_many')
+    def test_get_cached_responses_force_cache_miss(self, mock_cache_get_many):
+        self.request_cache.set(SHOULD_FORCE_CACHE_MISS_KEY, True)
+        mock_cache_get_many.return_value = {TEST_KEY: EXPECTED_VALUE}
+        cached_responses = TieredCache.get_cached_responses([TEST_KEY])
+        self.assertFalse(cached_responses[TEST_KEY].is_found)
+        self.assertFalse(self.request_cache.get_cached_response(TEST_KEY).is_found)
+        mock_cache_get_many.assert_not_called()
+
+    @mock.patch('django.core.cache.cache.set_many')
+    def test_set_all_tiers_many(self, mock_cache_set_many):
+        mapping = {TEST_KEY: EXPECTED_VALUE, TEST_KEY_2: EXPECTED_VALUE_2}
+        TieredCache.set_all_tiers_many(mapping, TEST_DJANGO_TIMEOUT_CACHE)
+        mock_cache_set_many.assert_called_once_with(mapping, TEST_DJANGO_TIMEOUT_CACHE)
+        self.assertEqual(self.request_cache.get_cached_response(TEST_KEY).value, EXPECTED_VALUE)
+        self.assertEqual(self.request_cache.get_cached_response(TEST_KEY_2).value, EXPECTED_VALUE_2)
+
+    def test_set_all_tiers_many_round_trip(self):
+        TieredCache.set_all_tiers_many({TEST_KEY: EXPECTED_VALUE, TEST_KEY_2: None})
+        self.request_cache.clear()
+        cached_responses = TieredCache.get_cached_responses([TEST_KEY, TEST_KEY_2])
+        self.assertEqual(cached_responses[TEST_KEY].value, EXPECTED_VALUE)
+        self.assertTrue(cached_responses[TEST_KEY_2].is_found)
+        self.assertIsNone(cached_responses[TEST_KEY_2].value)
+
+    def test_set_negative(self):
+        TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE, process_cache_timeout=60)
+        TieredCache.set_negative(TEST_KEY)
+        self.assertIs(_PROCESS_CACHE.get(TEST_KEY), _CACHE_MISS)
+
+        for _ in range(2):
+            cached_response = TieredCache.get_cached_response(TEST_KEY)
+            self.assertTrue(cached_response.is_found)
+            self.assertTrue(cached_response.is_negative)
+            self.assertIsNone(cached_response.value)
+            self.assertEqual(self.request_cache.get(TEST_KEY, EXPECTED_VALUE_2), EXPECTED_VALUE_2)
+            self.assertEqual(self.request_cache.bind().get(TEST_KEY, EXPECTED_VALUE_2), EXPECTED_VALUE_2)
+            # The second read is from the django cache.
+            self.request_cache.clear()
+
+        TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE)
+        self.assertFalse(TieredCache.get_cached_response(TEST_KEY).is_negative)
+
+    def test_set_negative_many(self):
+        TieredCache.set_negative(TEST_KEY)
+        self.request_cache.clear()
+        cached_responses = TieredCache.get_cached_responses([TEST_KEY, TEST_KEY_2])
+        self.assertTrue(cached_responses[TEST_KEY].is_negative)
+        self.assertFalse(cached_responses[TEST_KEY_2].is_found)
+        self.assertTrue(TieredCache.get_cached_response(TEST_KEY).is_negative)
+
+    @ddt.data(
+        ({}, None, 60),
+        ({'TIERED_CACHE_NEGATIVE_TIMEOUT': 5}, None, 5),
+        ({'TIERED_CACHE_NEGATIVE_TIMEOUT': 5}, TEST_DJANGO_TIMEOUT_CACHE, TEST_DJANGO_TIMEOUT_CACHE),
+    )
+    @ddt.unpack
+    @mock.patch('django.core.cache.cache.set')
+    def test_set_negative_timeout(self, settings, timeout, expected_timeout, mock_cache_set):
+        with override_settings(**settings):
+            if timeout is None:
+                TieredCache.set_negative(TEST_KEY)
+            else:
+                TieredCache.set_negative(TEST_KEY, timeout)
+        mock_cache_set.assert_called_once_with(TEST_KEY, _NEGATIVE_CACHE_TOMBSTONE, expected_timeout)
+
+    def test_negative_cache_tombstone_pickle(self):
+        self.assertIs(pickle.loads(pickle.dumps(_NEGATIVE_CACHE_TOMBSTONE)), _NEGATIVE_CACHE_TOMBSTONE)
+
+    async def test_async_set_and_get(self):
+        await TieredCache.aset_all_tiers(TEST_KEY, EXPECTED_VALUE, stale_after=0, process_cache_timeout=60)
+        self.request_cache.clear()
+        _PROCESS_CACHE.clear()
+
+        cached_response = await TieredCache.aget_cached_response(TEST_KEY)
+        self.assertEqual(cached_response.value, EXPECTED_VALUE)
+        self.assertTrue(cached_response.is_stale)
+        self.assertEqual(self.request_cache.get_cached_response(TEST_KEY).value, EXPECTED_VALUE)
+        self.assertEqual(_PROCESS_CACHE.get(TEST_KEY), EXPECTED_VALUE)
+
+        await TieredCache.adelete_all_tiers(TEST_KEY)
+        self.assertFalse((await TieredCache.aget_cached_response(TEST_KEY)).is_found)
+        self.assertIs(django_cache.get(TEST_KEY, _CACHE_MISS), _CACHE_MISS)
+
+    async def test_async_set_and_get_many(self):
+        await TieredCache.aset_all_tiers_many({TEST_KEY: EXPECTED_VALUE, TEST_KEY_2: None})
+        self.request_cache.clear()
+
+        cached_responses = await TieredCache.aget_cached_responses([TEST_KEY, TEST_KEY_2, TEST_KEY_UNICODE + 'x'])
+        self.assertEqual(cached_responses[TEST_KEY].value, EXPECTED_VALUE)
+        self.assertTrue(cached_responses[TEST_KEY_2].is_found)
+        self.assertFalse(cached_responses[TEST_KEY_UNICODE + 'x'].is_found)
+        self.assertIsNone(self.request_cache.get_cached_response(TEST_KEY_2).value)
+
+    async def test_async_get_force_cache_miss(self):
+        django_cache.set(TEST_KEY, EXPECTED_VALUE)
+        self.request_cache.set(SHOULD_FORCE_CACHE_MISS_KEY, True)
+        self.assertFalse((await TieredCache.aget_cached_response(TEST_KEY)).is_found)
+        self.assertFalse((await TieredCache.aget_cached_responses([TEST_KEY]))[TEST_KEY].is_found)
+
+    def test_get_or_set_computes_once(self):
+        compute_fn = mock.Mock(return_value=EXPECTED_VALUE)
+        self.assertEqual(TieredCache.get_or_set(TEST_KEY, compute_fn), EXPECTED_VALUE)
+        self.request_cache.clear()
+        self.assertEqual(TieredCache.get_or_set(TEST_KEY, compute_fn), EXPECTED_VALUE)
+        compute_fn.assert_called_once_with()
+
+        # Other read paths see the unwrapped value.
+        self.request_cache.clear()
+        self.assertEqual(TieredCache.get_cached_response(TEST_KEY).value, EXPECTED_VALUE)
+        self.request_cache.clear()
+        self.assertEqual(TieredCache.get_cached_responses([TEST_KEY])[TEST_KEY].value, EXPECTED_VALUE)
+
+    def test_get_or_set_request_cache_hit(self):
+        self.request_cache.set(TEST_KEY, EXPECTED_VALUE)
+        compute_fn = mock.Mock()
+        self.assertEqual(TieredCache.get_or_set(TEST_KEY, compute_fn), EXPECTED_VALUE)
+        compute_fn.assert_not_called()
+
+    def test_get_or_set_other_writes(self):
+        compute_fn = mock.Mock(return_value=EXPECTED_VALUE_2)
+        for write, expected_value in (
+            (lambda: TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE), EXPECTED_VALUE),
+            (lambda: TieredCache.set_all_tiers_many({TEST_KEY: EXPECTED_VALUE}), EXPECTED_VALUE),
+            (lambda: TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE, stale_after=0), EXPECTED_VALUE),
+            (lambda: TieredCache.set_negative(TEST_KEY), None),
+        ):
+            write()
+            self.request_cache.clear()
+            self.assertEqual(TieredCache.get_or_set(TEST_KEY, compute_fn), expected_value)
+            self.assertEqual(self.request_cache.get_cached_response(TEST_KEY).value, expected_value)
+        compute_fn.assert_not_called()
+
+    def test_get_or_set_process_cache_hit(self):
+        TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE, process_cache_timeout=60)
+        self.request_cache.clear()
+        compute_fn = mock.Mock()
+        with mock.patch('django.core.cache.cache.get') as mock_cache_get:
+            self.assertEqual(TieredCache.get_or_set(TEST_KEY, compute_fn), EXPECTED_VALUE)
+        mock_cache_get.assert_not_called()
+        compute_fn.assert_not_called()
+
+    def test_get_or_set_force_cache_miss(self):
+        TieredCache.get_or_set(TEST_KEY, lambda: EXPECTED_VALUE)
+        self.request_cache.clear()
+        self.request_cache.set(SHOULD_FORCE_CACHE_MISS_KEY, True)
+        self.assertEqual(TieredCache.get_or_set(TEST_KEY, lambda: EXPECTED_VALUE_2), EXPECTED_VALUE_2)
+
+    @mock.patch('edx_django_utils.cache.utils.random.random', return_value=0.999999)
+    def test_get_or_set_early_recompute(self, _mock_random):
+        TieredCache.get_or_set(TEST_KEY, lambda: EXPECTED_VALUE, TEST_DJANGO_TIMEOUT_CACHE)
+        self.request_cache.clear()
+        # A large beta makes recomputation before expiry certain.
+        value = TieredCache.get_or_set(TEST_KEY, lambda: EXPECTED_VALUE_2, TEST_DJANGO_TIMEOUT_CACHE, beta=1e9)
+        self.assertEqual(value, EXPECTED_VALUE_2)
+
+    @mock.patch('edx_django_utils.cache.utils.random.random', return_value=0.999999)
+    def test_get_or_set_serves_stale_while_locked(self, _mock_random):
+        TieredCache.get_or_set(TEST_KEY, lambda: EXPECTED_VALUE, TEST_DJANGO_TIMEOUT_CACHE)
+        self.request_cache.clear()
+        django_cache.add(TEST_KEY + STAMPEDE_LOCK_KEY_SUFFIX, True)
+        compute_fn = mock.Mock(return_value=EXPECTED_VALUE_2)
+        value = TieredCache.get_or_set(TEST_KEY, compute_fn, TEST_DJANGO_TIMEOUT_CACHE, beta=1e9)
+        self.assertEqual(value, EXPECTED_VALUE)
+        compute_fn.assert_not_called()
+
+    @mock.patch('edx_django_utils.cache.utils.time.sleep')
+    def test_get_or_set_waits_for_lock_holder(self, mock_sleep):
+        django_cache.add(TEST_KEY + STAMPEDE_LOCK_KEY_SUFFIX, True)
+
+        def _other_process_sets_value(_interval):
+            django_cache.set(TEST_KEY, _TieredCacheEnvelope(EXPECTED_VALUE, 0, None))
+        mock_sleep.side_effect = _other_process_sets_value
+
+        compute_fn = mock.Mock(return_value=EXPECTED_VALUE_2)
+        self.assertEqual(TieredCache.get_or_set(TEST_KEY, compute_fn), EXPECTED_VALUE)
+        compute_fn.assert_not_called()
+
+    @mock.patch('edx_django_utils.cache.utils.STAMPEDE_MAX_WAIT', 0)
+    def test_get_or_set_computes_after_max_wait(self):
+        django_cache.add(TEST_KEY + STAMPEDE_LOCK_KEY_SUFFIX, True)
+        self.assertEqual(TieredCache.get_or_set(TEST_KEY, lambda: EXPECTED_VALUE), EXPECTED_VALUE)
+
+    def test_get_or_revalidate_miss(self):
+        cached_response = TieredCache.get_or_revalidate(TEST_KEY, lambda: EXPECTED_VALUE, stale_after=60)
+        self.assertTrue(cached_response.is_found)
+        self.assertFalse(cached_response.is_stale)
+        self.assertEqual(cached_response.value, EXPECTED_VALUE)
+
+        self.request_cache.clear()
+        cached_response = TieredCache.get_cached_response(TEST_KEY)
+        self.assertEqual(cached_response.value, EXPECTED_VALUE)
+        self.assertFalse(cached_response.is_stale)
+
+    @mock.patch('edx_django_utils.cache.utils._get_stale_refresh_executor')
+    def test_get_or_revalidate_stale(self, mock_get_executor):
+        mock_get_executor.return_value.submit.side_effect = lambda fn: fn()
+        TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE, stale_after=0)
+        self.request_cache.clear()
+
+        cached_response = TieredCache.get_or_revalidate(TEST_KEY, lambda: EXPECTED_VALUE_2, stale_after=60)
+        self.assertTrue(cached_response.is_stale)
+        self.assertEqual(cached_response.value, EXPECTED_VALUE)
+        self.assertFalse(django_cache.get(TEST_KEY + STAMPEDE_LOCK_KEY_SUFFIX), 'Refresh lock should be released.')
+
+        self.request_cache.clear()
+        cached_response = TieredCache.get_cached_response(TEST_KEY)
+        self.assertFalse(cached_response.is_stale)
+        self.assertEqual(cached_response.value, EXPECTED_VALUE_2)
+
+    @mock.patch('edx_django_utils.cache.utils._get_stale_refresh_executor')
+    def test_get_or_revalidate_refresh_already_locked(self, mock_get_executor):
+        TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE, stale_after=0)
+        self.request_cache.clear()
+        django_cache.add(TEST_KEY + STAMPEDE_LOCK_KEY_SUFFIX, True)
+
+        cached_response = TieredCache.get_or_revalidate(TEST_KEY, lambda: EXPECTED_VALUE_2, stale_after=60)
+        self.assertEqual(cached_response.value, EXPECTED_VALUE)
+        mock_get_executor.return_value.submit.assert_not_called()
+
+    def test_get_or_revalidate_background_refresh(self):
+        TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE, stale_after=0)
+        self.request_cache.clear()
+        with mock.patch('edx_django_utils.cache.utils.log') as mock_log:
+            TieredCache.get_or_revalidate(TEST_KEY, mock.Mock(side_effect=ValueError), stale_after=60)
+            deadline = time.monotonic() + 5
+            while _STALE_REFRESH_PENDING_KEYS and time.monotonic() < deadline:
+                time.sleep(0.01)
+            mock_log.exception.assert_called_once()
+        self.assertFalse(django_cache.get(TEST_KEY + STAMPEDE_LOCK_KEY_SUFFIX), 'Refresh lock should be released.')
+
+    def test_get_or_revalidate_background_refresh_request_cache(self):
+        """
+        Test each background refresh starts with an empty request cache, on the same pool thread.
+        """
+        request_cache = RequestCache('test_refresh')
+        dependency_values = []
+
+        def compute():
+            dependency_values.append(request_cache.get('dependency'))
+            request_cache.set('dependency', 'cached by an earlier refresh')
+            return EXPECTED_VALUE_2
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        with mock.patch('edx_django_utils.cache.utils._get_stale_refresh_executor', return_value=executor):
+            for _ in range(2):
+                TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE, stale_after=0)
+                self.request_cache.clear()
+                TieredCache.get_or_revalidate(TEST_KEY, compute, stale_after=60)
+                executor.submit(lambda: None).result()
+        self.assertEqual(dependency_values, [None, None])
+
+    def test_process_cache_tier(self):
+        TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE, process_cache_timeout=60)
+        self.request_cache.clear()
+        with mock.patch('django.core.cache.cache.get') as mock_cache_get:
+            cached_response = TieredCache.get_cached_response(TEST_KEY)
+        mock_cache_get.assert_not_called()
+        self.assertEqual(cached_response.value, EXPECTED_VALUE)
+        self.assertEqual(self.request_cache.get_cached_response(TEST_KEY).value, EXPECTED_VALUE)
+
+        self.request_cache.clear()
+        with mock.patch('django.core.cache.cache.get_many') as mock_cache_get_many:
+            cached_responses = TieredCache.get_cached_responses([TEST_KEY])
+        mock_cache_get_many.assert_not_called()
+        self.assertEqual(cached_responses[TEST_KEY].value, EXPECTED_VALUE)
+
+    def test_process_cache_populated_from_django_cache(self):
+        TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE, process_cache_timeout=60)
+        # Simulate another process, which has only the django cache.
+        _PROCESS_CACHE.clear()
+        self.request_cache.clear()
+        self.assertEqual(TieredCache.get_cached_response(TEST_KEY).value, EXPECTED_VALUE)
+        self.assertEqual(_PROCESS_CACHE.get(TEST_KEY), EXPECTED_VALUE)
+
+    def test_process_cache_delete_and_force_cache_miss(self):
+        TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE, process_cache_timeout=60)
+        self.request_cache.clear()
+        self.request_cache.set(SHOULD_FORCE_CACHE_MISS_KEY, True)
+        self.assertFalse(TieredCache.get_cached_response(TEST_KEY).is_found)
+
+        self.request_cache.clear()
+        TieredCache.delete_all_tiers(TEST_KEY)
+        self.assertIs(_PROCESS_CACHE.get(TEST_KEY), _CACHE_MISS)
+
+    def test_process_cache_expiry_and_counters(self):
+        TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE, 0, process_cache_timeout=60)
+        TieredCache.set_all_tiers(TEST_KEY_2, EXPECTED_VALUE, 0, process_cache_timeout=60)
+        self.assertEqual(_PROCESS_CACHE.get(TEST_KEY), EXPECTED_VALUE)
+        with mock.patch('edx_django_utils.cache.utils.time.monotonic', return_value=time.monotonic() + 61):
+            self.assertIs(_PROCESS_CACHE.get(TEST_KEY), _CACHE_MISS)
+        attributes = get_cache_custom_attributes()
+        self.assertEqual(attributes['tiered_cache.process_cache.hits'], 1)
+        self.assertEqual(attributes['tiered_cache.process_cache.misses'], 1)
+
+    @override_settings(TIERED_CACHE_PROCESS_CACHE_MAX_ENTRIES=2)
+    def test_process_cache_max_entries(self):
+        for key in (TEST_KEY, TEST_KEY_2, TEST_NAMESPACE):
+            _PROCESS_CACHE.set(key, EXPECTED_VALUE, 60)
+        self.assertIs(_PROCESS_CACHE.get(TEST_KEY), _CACHE_MISS)
+        self.assertEqual(_PROCESS_CACHE.get(TEST_NAMESPACE), EXPECTED_VALUE)
+        self.assertEqual(get_cache_custom_attributes()['tiered_cache.process_cache.evictions'], 1)
+
+    @override_settings(TIERED_CACHE_PROCESS_CACHE_MAX_ENTRIES=2)
+    def test_process_cache_least_recently_used(self):
+        _PROCESS_CACHE.set(TEST_KEY, EXPECTED_VALUE, 60)
+        _PROCESS_CACHE.set(TEST_KEY_2, EXPECTED_VALUE, 60)
+        # Touch the first key so that the second one is least recently used.
+        _PROCESS_CACHE.get(TEST_KEY)
+        _PROCESS_CACHE.set(TEST_NAMESPACE, EXPECTED_VALUE, 60)
+        self.assertEqual(_PROCESS_CACHE.get(TEST_KEY), EXPECTED_VALUE)
+        self.assertIs(_PROCESS_CACHE.get(TEST_KEY_2), _CACHE_MISS)
+
+    @mock.patch('edx_django_utils.cache.utils.configured_invalidation_backend')
+    def test_process_cache_evicted_by_other_writes(self, mock_backend):
+        for write in (
+            lambda: TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE_2, 60),
+            lambda: TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE_2, 60, write_behind=True),
+            lambda: TieredCache.set_all_tiers_many({TEST_KEY: EXPECTED_VALUE_2}, 60),
+            lambda: asyncio.run(TieredCache.aset_all_tiers(TEST_KEY, EXPECTED_VALUE_2, 60)),
+            lambda: asyncio.run(TieredCache.aset_all_tiers_many({TEST_KEY: EXPECTED_VALUE_2}, 60)),
+        ):
+            TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE, 60, process_cache_timeout=60)
+            mock_backend.return_value.publish.reset_mock()
+            write()
+            TieredCache.flush()
+            self.request_cache.clear()
+            self.assertEqual(TieredCache.get_cached_response(TEST_KEY).value, EXPECTED_VALUE_2)
+            # Other processes are told to evict their old values too.
+            mock_backend.return_value.publish.assert_called_once_with(TEST_KEY)
+
+    @mock.patch('edx_django_utils.cache.utils.configured_invalidation_backend')
+    def test_process_cache_evicted_by_recompute(self, mock_backend):
+        TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE, 60, process_cache_timeout=60)
+        mock_backend.return_value.publish.reset_mock()
+        TieredCache._compute_and_set_all_tiers(TEST_KEY, lambda: EXPECTED_VALUE_2, 60)  # pylint: disable=protected-access
+        self.assertIs(_PROCESS_CACHE.get(TEST_KEY), _CACHE_MISS)
+        mock_backend.return_value.publish.assert_called_once_with(TEST_KEY)
+
+    def test_namespaced_key(self):
+        key = TieredCache.get_namespaced_key(TEST_NAMESPACE, TEST_KEY)
+        self.assertTrue(key.startswith(f'{TEST_NAMESPACE}:'))
+        self.assertTrue(key.endswith(f':{TEST_KEY}'))
+        with mock.patch('django.core.cache.cache.get') as mock_cache_get:
+            self.assertEqual(TieredCache.get_namespaced_key(TEST_NAMESPACE, TEST_KEY), key)
+        mock_cache_get.assert_not_called()
+
+        RequestCache.clear_all_namespaces()
+        self.assertEqual(TieredCache.get_namespaced_key(TEST_NAMESPACE, TEST_KEY), key)
+        self.assertNotEqual(TieredCache.get_namespaced_key(TEST_NAMESPACE + '2', TEST_KEY), key)
+
+    def test_invalidate_namespace(self):
+        key = TieredCache.get_namespaced_key(TEST_NAMESPACE, TEST_KEY)
+        other_namespace_key = TieredCache.get_namespaced_key(TEST_NAMESPACE + '2', TEST_KEY)
+        TieredCache.set_all_tiers(key, EXPECTED_VALUE)
+
+        TieredCache.invalidate_namespace(TEST_NAMESPACE)
+
+        new_key = TieredCache.get_namespaced_key(TEST_NAMESPACE, TEST_KEY)
+        self.assertNotEqual(new_key, key)
+        self.assertFalse(TieredCache.get_cached_response(new_key).is_found)
+        self.assertEqual(TieredCache.get_namespaced_key(TEST_NAMESPACE + '2', TEST_KEY), other_namespace_key)
+
+    def test_invalidate_unused_namespace(self):
+        TieredCache.invalidate_namespace(TEST_NAMESPACE)
+        self.assertIsNotNone(TieredCache.get_namespaced_key(TEST_NAMESPACE, TEST_KEY))
+
     @mock.patch('django.core.cache.cache.clear')
     def test_dangerous_clear_all_tiers_and_namespaces(self, mock_cache_clear):
         TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE)
@@ -193,6 +731,48 @@ class TestTieredCache(DjangoTestCase):  # pylint: disable=missing-class-docstrin
         self.assertFalse(self.request_cache.get_cached_response(TEST_KEY).is_found)
         mock_cache_clear.assert_called_once_with()
 
+    def test_set_all_tiers_write_behind(self):
+        TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE, 60, write_behind=True)
+        TieredCache.set_all_tiers(TEST_KEY_2, EXPECTED_VALUE, 60, write_behind=True)
+        TieredCache.set_all_tiers(TEST_KEY_2, EXPECTED_VALUE_2, 60, write_behind=True)
+        TieredCache.set_all_tiers(TEST_KEY_3, EXPECTED_VALUE, 120, write_behind=True)
+        self.assertEqual(TieredCache.get_cached_response(TEST_KEY_2).value, EXPECTED_VALUE_2)
+        self.assertIsNone(django_cache.get(TEST_KEY))
+
+        with mock.patch.object(django_cache, 'set_many', wraps=django_cache.set_many) as mock_set_many:
+            TieredCache.flush()
+            TieredCache.flush()
+        mock_set_many.assert_has_calls([
+            mock.call({TEST_KEY: EXPECTED_VALUE, TEST_KEY_2: EXPECTED_VALUE_2}, 60),
+            mock.call({TEST_KEY_3: EXPECTED_VALUE}, 120),
+        ])
+        self.assertEqual(mock_set_many.call_count, 2)
+
+    def test_write_behind_discarded_by_later_write(self):
+        TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE, write_behind=True)
+        TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE_2)
+        TieredCache.set_all_tiers(TEST_KEY_2, EXPECTED_VALUE, write_behind=True)
+        TieredCache.delete_all_tiers(TEST_KEY_2)
+        TieredCache.flush()
+
+        self.assertEqual(django_cache.get(TEST_KEY), EXPECTED_VALUE_2)
+        self.assertIsNone(django_cache.get(TEST_KEY_2))
+
+    @mock.patch('edx_django_utils.cache.utils.configured_invalidation_backend')
+    def test_write_behind_publishes_invalidation_on_flush(self, mock_backend):
+        TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE, write_behind=True, process_cache_timeout=60)
+        self.assertEqual(_PROCESS_CACHE.get(TEST_KEY), EXPECTED_VALUE)
+        mock_backend.return_value.publish.assert_not_called()
+
+        TieredCache.flush()
+        mock_backend.return_value.publish.assert_called_once_with(TEST_KEY)
+        self.assertEqual(django_cache.get(TEST_KEY).value, EXPECTED_VALUE)
+
+    def test_request_cache_scope_flushes_write_behind(self):
+        with RequestCache.scope():
+            TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE, write_behind=True)
+        self.assertEqual(django_cache.get(TEST_KEY), EXPECTED_VALUE)
+
     @mock.patch('django.core.cache.cache.delete')
     def test_delete(self, mock_cache_delete):
         TieredCache.set_all_tiers(TEST_KEY, EXPECTED_VALUE)
@@ -229,6 +809,23 @@ class CacheResponseTests(TestCase):  # pylint: disable=missing-class-docstring
             cached_response.__repr__()  # pylint: disable=unnecessary-dunder-call
         )
 
+    def test_miss_is_shared(self):
+        TieredCache.dangerous_clear_all_tiers()
+        cached_response = RequestCache().get_cached_response(TEST_KEY)
+        self.assertIs(cached_response, TieredCache.get_cached_response(TEST_KEY))
+        self.assertFalse(cached_response.is_found)
+        self.assertFalse(cached_response.is_negative)
+        self.assertEqual(cached_response, CachedResponse(False, TEST_KEY, None))
+        with self.assertRaises(AttributeError):
+            cached_response.is_found = True
+
+    def test_is_negative(self):
+        self.assertFalse(CachedResponse(True, TEST_KEY, None).is_negative)
+        self.assertFalse(CachedResponse(False, TEST_KEY, None).is_negative)
+        cached_response = CachedResponse(True, TEST_KEY, _NEGATIVE_CACHE_TOMBSTONE)
+        self.assertTrue(cached_response.is_negative)
+        self.assertIsNone(cached_response.get_value_or_default(EXPECTED_VALUE))
+
     def test_cached_response_equals(self):
         self.assertEqual(
             CachedResponse(True, TEST_KEY, EXPECTED_VALUE),
@@ -268,6 +865,96 @@ class CacheResponseTests(TestCase):  # pylint: disable=missing-class-docstring
             cached_response == other_object  # pylint: disable=pointless-statement
 
 
+def _get_key_length(key):
+    return str(len(key))
+
+
+@override_settings(CACHE_INSTRUMENTATION_ENABLED=True)
+class TestCacheInstrumentation(DjangoTestCase):  # pylint: disable=missing-class-docstring
+    def setUp(self):
+        super().setUp()
+        TieredCache.dangerous_clear_all_tiers()
+        RequestCache.clear_all_namespaces()
+
+    def test_tiered_cache(self):
+        key = f'{TEST_NAMESPACE}:{TEST_KEY}'
+        TieredCache.get_cached_response(key)
+        TieredCache.set_all_tiers(key, EXPECTED_VALUE)
+        TieredCache.get_cached_response(key)
+        RequestCache().clear()
+        TieredCache.get_cached_responses([key, TEST_KEY])
+
+        attributes = get_cache_custom_attributes()
+        prefix = f'tiered_cache.prefix.{TEST_NAMESPACE}'
+        self.assertEqual(attributes[f'{prefix}.hits'], 2)
+        self.assertEqual(attributes[f'{prefix}.misses'], 1)
+        self.assertEqual(attributes[f'{prefix}.hit_ratio'], 0.667)
+        self.assertNotIn(f'{prefix}.bytes_written', attributes, 'Only values encoded by the codec are counted.')
+        self.assertGreater(attributes[f'{prefix}.django_cache_ms'], 0)
+        self.assertEqual(attributes['tiered_cache.prefix.other.misses'], 1)
+
+    @override_settings(TIERED_CACHE_CODEC='zlib', TIERED_CACHE_CODEC_MIN_SIZE=0)
+    def test_bytes_written(self):
+        TieredCache.set_all_tiers(f'{TEST_NAMESPACE}:{TEST_KEY}', EXPECTED_VALUE)
+        TieredCache.set_all_tiers_many({f'{TEST_NAMESPACE}:{TEST_KEY_2}': EXPECTED_VALUE})
+        attributes = get_cache_custom_attributes()
+        self.assertEqual(
+            attributes[f'tiered_cache.prefix.{TEST_NAMESPACE}.bytes_written'],
+            attributes['tiered_cache.codec.stored_bytes'],
+        )
+
+    def test_request_cache(self):
+        request_cache = RequestCache(TEST_NAMESPACE)
+        request_cache.get_cached_response(TEST_KEY)
+        request_cache.set(TEST_KEY, EXPECTED_VALUE)
+        request_cache.get_cached_response(TEST_KEY)
+        RequestCache('edx_django_utils.test').get_cached_response(TEST_KEY)
+
+        self.assertEqual(get_cache_custom_attributes(), {
+            f'request_cache.namespace.{TEST_NAMESPACE}.hits': 1,
+            f'request_cache.namespace.{TEST_NAMESPACE}.misses': 1,
+            f'request_cache.namespace.{TEST_NAMESPACE}.entries': 1,
+            f'request_cache.namespace.{TEST_NAMESPACE}.approximate_bytes': (
+                sys.getsizeof(request_cache.data) + sys.getsizeof(TEST_KEY) + sys.getsizeof(EXPECTED_VALUE)
+            ),
+        })
+
+    @override_settings(CACHE_INSTRUMENTATION_ENABLED=False)
+    def test_disabled(self):
+        TieredCache.get_cached_response(TEST_KEY)
+        RequestCache(TEST_NAMESPACE).get_cached_response(TEST_KEY)
+        self.assertEqual(get_cache_custom_attributes(), {})
+
+    @override_settings(CACHE_INSTRUMENTATION_KEY_PREFIX_FUNCTION=f'{__name__}._get_key_length')
+    def test_custom_prefix_function(self):
+        TieredCache.get_cached_response(TEST_KEY)
+        self.assertEqual(get_cache_custom_attributes()[f'tiered_cache.prefix.{len(TEST_KEY)}.misses'], 1)
+
+    @override_settings(CACHE_INSTRUMENTATION_KEY_PREFIX_FUNCTION='edx_django_utils.cache.missing')
+    def test_invalid_prefix_function(self):
+        with self.assertLogs('edx_django_utils.cache.utils', level='WARNING'):
+            TieredCache.get_cached_response(TEST_KEY)
+        self.assertEqual(get_cache_custom_attributes(), {})
+
+    @override_settings(CACHE_INSTRUMENTATION_MAX_PREFIXES=1)
+    def test_max_prefixes(self):
+        TieredCache.get_cached_response('a:key')
+        TieredCache.get_cached_response('b:key')
+        TieredCache.get_cached_response('c:key')
+        attributes = get_cache_custom_attributes()
+        self.assertEqual(attributes['tiered_cache.prefix.a.misses'], 1)
+        self.assertEqual(attributes['tiered_cache.prefix.other.misses'], 2)
+
+    def test_get_cache_key_prefix(self):
+        self.assertEqual(get_cache_key_prefix('course:outline:v1'), 'course')
+        self.assertEqual(get_cache_key_prefix(get_cache_key(a=1)), 'other')
+        self.assertEqual(get_cache_key_prefix(':outline'), 'other')
+        self.assertEqual(get_cache_key_prefix(('course', 1)), 'other')
+        # Namespaces that contain a colon are grouped by their first part.
+        namespaced_key = TieredCache.get_namespaced_key('course-v1:edX+DemoX+1', 'outline')
+        self.assertEqual(get_cache_key_prefix(namespaced_key), 'course-v1')
+
+
 @ddt.ddt
 class TestCacheUtils(TestCase):
 
@@ -288,3 +975,48 @@ class TestCacheUtils(TestCase):
         """
         key = get_cache_key(site_domain="example.com", resource="catalogs")
         self.assertEqual(key == test_key, result)
+
+    def test_get_cache_key_is_md5(self):
+        self.assertEqual(
+            get_cache_key(site_domain="example.com", resource="catalogs", version=2),
+            hashlib.md5(b"resource:catalogs__site_domain:example.com__version:2").hexdigest(),
+        )
+
+    @ddt.data('blake2b', 'md5')
+    def test_cache_key_builder(self, hash_algorithm):
+        builder = CacheKeyBuilder(hash_algorithm, site_domain="example.com")
+        key = builder.get_cache_key(resource="catalogs")
+        self.assertEqual(len(key), 32)
+        self.assertEqual(key, builder.get_cache_key(resource="catalogs"))
+        self.assertNotEqual(key, builder.get_cache_key(resource="users"))
+        self.assertNotEqual(key, CacheKeyBuilder(hash_algorithm, site_domain="other.com").get_cache_key(
+            resource="catalogs"
+        ))
+        self.assertEqual(
+            builder.get_cache_keys([{"resource": "catalogs"}, {"resource": "users"}]),
+            [key, builder.get_cache_key(resource="users")],
+        )
+
+    def test_cache_key_builder_legacy_mode(self):
+        builder = CacheKeyBuilder('md5', site_domain="example.com")
+        self.assertEqual(
+            builder.get_cache_key(resource="catalogs"),
+            get_cache_key(site_domain="example.com", resource="catalogs"),
+        )
+        self.assertEqual(CacheKeyBuilder('md5').get_cache_key(a=1), get_cache_key(a=1))
+
+    def test_cache_key_builder_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            CacheKeyBuilder('sha1')
+
+    @mock.patch('edx_django_utils.cache.utils.xxhash', None)
+    def test_cache_key_builder_xxhash_not_installed(self):
+        with self.assertRaises(ValueError):
+            CacheKeyBuilder('xxhash')
+
+    @mock.patch('edx_django_utils.cache.utils.xxhash')
+    def test_cache_key_builder_xxhash(self, mock_xxhash):
+        mock_xxhash.xxh3_128.return_value = hashlib.blake2b(digest_size=16)
+        key = CacheKeyBuilder('xxhash', site_domain="example.com").get_cache_key(resource="catalogs")
+        mock_xxhash.xxh3_128.assert_called_once_with()
+        self.assertEqual(len(key), 32)
@@ -2,20 +2,94 @@
 Cache utilities.
 """
 import hashlib
+import logging
+import math
+import random
+import sys
 import threading
-
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.core.cache import cache as django_cache
 from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.dispatch import receiver
+from django.test.signals import setting_changed
 from django.utils.encoding import force_str
+from django.utils.module_loading import import_string
+
+from . import codec
+from .invalidation import configured_invalidation_backend
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover
+    xxhash = None
+
+log = logging.getLogger(__name__)
 
 FORCE_CACHE_MISS_PARAM = 'force_cache_miss'
 DEFAULT_NAMESPACE = 'edx_django_utils.cache'
 DEFAULT_REQUEST_CACHE_NAMESPACE = f'{DEFAULT_NAMESPACE}.default'
 SHOULD_FORCE_CACHE_MISS_KEY = 'edx_django_utils.cache.should_force_cache_miss'
+NAMESPACE_GENERATION_KEY_PREFIX = f'{DEFAULT_NAMESPACE}.namespace_generation.'
+NAMESPACE_GENERATION_REQUEST_CACHE_NAMESPACE = f'{DEFAULT_NAMESPACE}.namespace_generations'
+CACHE_CUSTOM_ATTRIBUTES_NAMESPACE = f'{DEFAULT_NAMESPACE}.custom_attributes'
+CACHE_INSTRUMENTATION_NAMESPACE = f'{DEFAULT_NAMESPACE}.instrumentation'
+WRITE_BEHIND_REQUEST_CACHE_NAMESPACE = f'{DEFAULT_NAMESPACE}.write_behind'
 
 _CACHE_MISS = object()
 
 
+class _NegativeCacheTombstone:
+    """
+    Marks a key that was looked up and found not to exist. See
+    ``TieredCache.set_negative``.
+    """
+    def __reduce__(self):
+        # Unpickle as the module's singleton, so that identity checks work.
+        return '_NEGATIVE_CACHE_TOMBSTONE'
+
+    def __repr__(self):
+        return '_NEGATIVE_CACHE_TOMBSTONE'
+
+
+_NEGATIVE_CACHE_TOMBSTONE = _NegativeCacheTombstone()
+
+# Default django cache timeout for TieredCache.set_negative.
+NEGATIVE_CACHE_DEFAULT_TIMEOUT = 60
+
+# Settings for TieredCache.get_or_set stampede protection.
+STAMPEDE_LOCK_KEY_SUFFIX = '.recompute_lock'
+STAMPEDE_LOCK_TIMEOUT = 30
+STAMPEDE_POLL_INTERVAL = 0.05
+STAMPEDE_MAX_WAIT = 5
+
+# Settings for TieredCache.get_or_revalidate background refreshes.
+STALE_REFRESH_MAX_WORKERS = 4
+STALE_REFRESH_MAX_PENDING = 100
+
+_STALE_REFRESH_LOCK = threading.Lock()
+_STALE_REFRESH_PENDING_KEYS = set()
+_STALE_REFRESH_EXECUTOR = None
+
+# Defaults for the optional process cache tier of the TieredCache.
+PROCESS_CACHE_DEFAULT_MAX_ENTRIES = 1000
+
+# Defaults for the optional cache instrumentation.
+CACHE_INSTRUMENTATION_DEFAULT_MAX_PREFIXES = 50
+CACHE_INSTRUMENTATION_OTHER_PREFIX = 'other'
+
+# Number of entries per namespace measured to estimate RequestCache sizes.
+REQUEST_CACHE_SIZE_SAMPLE_SIZE = 20
+
+
 def get_cache_key(**kwargs):
     """
     Get MD5 encoded cache key for given arguments.
@@ -35,11 +109,89 @@ def get_cache_key(**kwargs):
     Returns:
          An MD5 encoded key uniquely identified by the key word arguments.
     """
-    key = '__'.join(['{}:{}'.format(k, force_str(v)) for k, v in sorted(kwargs.items())])
+    key = '__'.join([_format_cache_key_part(k, v) for k, v in sorted(kwargs.items())])
 
     return hashlib.md5(key.encode('utf-8')).hexdigest()
 
 
+def _format_cache_key_part(name, value):
+    """
+    Returns the ``name:value`` part of a cache key, skipping force_str for the
+    common case of str values.
+    """
+    return f'{name}:{value if isinstance(value, str) else force_str(value)}'
+
+
+class CacheKeyBuilder:
+    """
+    Builds cache keys like ``get_cache_key``, but with a choice of hash
+    algorithm and with any fixed keyword arguments formatted and hashed once.
+
+    Example:
+        >>> course_key_builder = CacheKeyBuilder(resource='course_outline', version=3)
+        >>> course_key_builder.get_cache_key(course_id=course_id)
+        >>> course_key_builder.get_cache_keys([{'course_id': course_id} for course_id in course_ids])
+
+    Hash algorithms:
+        'blake2b': (default) A 128-bit BLAKE2b digest. Faster than MD5.
+        'xxhash': A 128-bit XXH3 digest. Fastest, but requires the ``xxhash``
+            package.
+        'md5': Legacy mode. Keys are identical to those of ``get_cache_key``
+            called with the fixed and per-call keyword arguments together.
+
+    Keys built with different algorithms, or with arguments split differently
+    between fixed and per-call keyword arguments, are not interchangeable,
+    except in legacy mode.
+    """
+    HASH_ALGORITHMS = ('blake2b', 'xxhash', 'md5')
+
+    def __init__(self, hash_algorithm='blake2b', **fixed_kwargs):
+        """
+        Arguments:
+            hash_algorithm (str): (Optional) One of HASH_ALGORITHMS.
+            **fixed_kwargs: Key word arguments to include in every key.
+        """
+        if hash_algorithm not in self.HASH_ALGORITHMS:
+            raise ValueError(f'Unknown cache key hash algorithm {hash_algorithm!r}.')
+        if hash_algorithm == 'xxhash' and xxhash is None:
+            raise ValueError("The 'xxhash' cache key hash algorithm requires the xxhash package.")
+
+        self.hash_algorithm = hash_algorithm
+        self._fixed_kwargs = fixed_kwargs
+        self._fixed_parts = [_format_cache_key_part(k, v) for k, v in sorted(fixed_kwargs.items())]
+
+        if hash_algorithm == 'md5':
+            self._prefix_hasher = None
+        else:
+            if hash_algorithm == 'xxhash':
+                self._prefix_hasher = xxhash.xxh3_128()
+            else:
+                self._prefix_hasher = hashlib.blake2b(digest_size=16)
+            self._prefix_hasher.update('__'.join(self._fixed_parts).encode('utf-8'))
+
+    def get_cache_key(self, **kwargs):
+        """
+        Returns the cache key for the fixed keyword arguments together with the
+        provided ones.
+        """
+        if self._prefix_hasher is None:
+            if self._fixed_kwargs:
+                kwargs = {**self._fixed_kwargs, **kwargs}
+            return get_cache_key(**kwargs)
+
+        hasher = self._prefix_hasher.copy()
+        hasher.update(b'|')
+        hasher.update('__'.join([_format_cache_key_part(k, v) for k, v in sorted(kwargs.items())]).encode('utf-8'))
+        return hasher.hexdigest()
+
+    def get_cache_keys(self, kwargs_list):
+        """
+        Returns a list of cache keys, one for each dict of keyword arguments.
+        """
+        get_key = self.get_cache_key
+        return [get_key(**kwargs) for kwargs in kwargs_list]
+
+
 class _RequestCache(threading.local):
     """
     A thread-local for storing the per-request caches.
@@ -56,181 +208,1447 @@ class _RequestCache(threading.local):
         """
         self._data = {}
 
+    def namespaces(self):
+        """
+        Returns the dict of data dicts, keyed by namespace.
+        """
+        return self._data
+
     def data(self, namespace):
         """
-        Gets the thread.local data (dict) for a given namespace.
+        Gets the thread.local data (dict) for a given namespace.
+
+        Args:
+            namespace (string): The namespace, or key, of the data dict.
+
+        Returns:
+            (dict)
+
+        """
+        assert namespace
+
+        if namespace in self._data:
+            return self._data[namespace]
+
+        new_data = {}
+        self._data[namespace] = new_data
+        return new_data
+
+
+class _ContextVarRequestCache:
+    """
+    A context-local for storing the per-request caches, for use under ASGI.
+
+    Unlike a thread-local, the data is not shared between concurrent requests
+    handled by coroutines on the same thread, and follows each request across
+    ``sync_to_async`` and ``async_to_sync`` calls.
+
+    The data is a dict of dicts, keyed by namespace.
+    """
+    def __init__(self):
+        self._data_var = ContextVar('edx_django_utils.cache.request_cache', default=None)
+
+    def clear(self):
+        """
+        Clears all data for all namespaces.
+        """
+        self._data_var.set({})
+
+    def namespaces(self):
+        """
+        Returns the dict of data dicts, keyed by namespace.
+        """
+        return self._data_var.get() or {}
+
+    def data(self, namespace):
+        """
+        Gets the context-local data (dict) for a given namespace.
+
+        Args:
+            namespace (string): The namespace, or key, of the data dict.
+
+        Returns:
+            (dict)
+
+        """
+        assert namespace
+
+        all_data = self._data_var.get()
+        if all_data is None:
+            all_data = {}
+            self._data_var.set(all_data)
+
+        if namespace in all_data:
+            return all_data[namespace]
+
+        new_data = {}
+        all_data[namespace] = new_data
+        return new_data
+
+
+REQUEST_CACHE_BACKENDS = {
+    'thread_local': _RequestCache,
+    'context_var': _ContextVarRequestCache,
+}
+
+
+@lru_cache
+def _get_request_cache():
+    """
+    Returns the singleton storage for the per-request caches, as configured by
+    the REQUEST_CACHE_BACKEND setting.
+    """
+    # .. setting_name: REQUEST_CACHE_BACKEND
+    # .. setting_default: 'thread_local'
+    # .. setting_description: Storage used for the RequestCache. Either 'thread_local', or
+    #   'context_var', which must be used to isolate requests when running under ASGI or with
+    #   async views.
+    backend = getattr(settings, 'REQUEST_CACHE_BACKEND', 'thread_local')
+    if backend not in REQUEST_CACHE_BACKENDS:
+        raise ValueError(f'Unknown REQUEST_CACHE_BACKEND {backend!r}.')
+    return REQUEST_CACHE_BACKENDS[backend]()
+
+
+@receiver(setting_changed)
+def _reset_state(sender, setting, **kwargs):  # pylint: disable=unused-argument
+    """Reset caches when settings change during unit tests."""
+    if setting == 'REQUEST_CACHE_BACKEND':
+        _get_request_cache.cache_clear()
+    _get_cache_key_prefix_function.cache_clear()
+
+
+def get_cache_key_prefix(key):
+    """
+    Returns the part of a TieredCache key before the first colon, which is the
+    namespace for keys from ``TieredCache.get_namespaced_key``, and the
+    function for keys from ``tiered_cached``. Namespaces that contain a colon,
+    like course keys, are grouped by their first part, e.g. 'course-v1'.
+
+    Keys without a colon, like those from ``get_cache_key``, are grouped
+    together under 'other'.
+
+    This is the default CACHE_INSTRUMENTATION_KEY_PREFIX_FUNCTION.
+    """
+    if isinstance(key, str):
+        prefix, separator, _ = key.partition(':')
+        if separator and prefix:
+            return prefix
+    return CACHE_INSTRUMENTATION_OTHER_PREFIX
+
+
+@lru_cache
+def _get_cache_key_prefix_function():
+    """
+    Returns the function used to group TieredCache keys for instrumentation,
+    or None if cache instrumentation is disabled.
+    """
+    # .. toggle_name: CACHE_INSTRUMENTATION_ENABLED
+    # .. toggle_implementation: DjangoSetting
+    # .. toggle_default: False
+    # .. toggle_description: Enables per-request instrumentation of the TieredCache, by key prefix,
+    #   and of the RequestCache, by namespace. The results are reported as custom attributes by the
+    #   MonitoringSupportMiddleware.
+    # .. toggle_use_cases: opt_in
+    # .. toggle_creation_date: 2026-10-16
+    if not getattr(settings, 'CACHE_INSTRUMENTATION_ENABLED', False):
+        return None
+
+    # .. setting_name: CACHE_INSTRUMENTATION_KEY_PREFIX_FUNCTION
+    # .. setting_default: 'edx_django_utils.cache.get_cache_key_prefix'
+    # .. setting_description: Dotted path to a function that takes a TieredCache key and returns
+    #   the prefix to group its instrumentation under. Prefixes are used in custom attribute names,
+    #   so the function should only return a small number of distinct prefixes.
+    prefix_function = getattr(settings, 'CACHE_INSTRUMENTATION_KEY_PREFIX_FUNCTION', None)
+    if not prefix_function:
+        return get_cache_key_prefix
+    try:
+        return import_string(prefix_function)
+    except ImportError as e:
+        log.warning(f"Could not load CACHE_INSTRUMENTATION_KEY_PREFIX_FUNCTION {prefix_function!r}: {e!r}")
+        return None
+
+
+def _accumulate_cache_attribute(name, value):
+    """
+    Accumulates a custom attribute for the current request.
+
+    The cache package can't use ``edx_django_utils.monitoring.accumulate``,
+    since the monitoring package depends on it. Instead, the
+    MonitoringSupportMiddleware reports these attributes using
+    ``get_cache_custom_attributes``.
+    """
+    attributes = _get_request_cache().data(CACHE_CUSTOM_ATTRIBUTES_NAMESPACE)
+    attributes[name] = attributes.get(name, 0) + value
+
+
+def _record_cache_stats(cache_name, prefix, *, hits=0, misses=0, duration_ms=0.0, size=0):
+    """
+    Adds to the instrumentation stats of the current request for the prefix.
+
+    Once CACHE_INSTRUMENTATION_MAX_PREFIXES prefixes have been seen in a
+    request, any others are grouped under 'other'.
+    """
+    all_stats = _get_request_cache().data(CACHE_INSTRUMENTATION_NAMESPACE)
+    stats = all_stats.get((cache_name, prefix))
+    if stats is None:
+        # .. setting_name: CACHE_INSTRUMENTATION_MAX_PREFIXES
+        # .. setting_default: 50
+        # .. setting_description: Maximum number of distinct key prefixes and namespaces reported
+        #   per request when CACHE_INSTRUMENTATION_ENABLED is set.
+        max_prefixes = getattr(
+            settings, 'CACHE_INSTRUMENTATION_MAX_PREFIXES', CACHE_INSTRUMENTATION_DEFAULT_MAX_PREFIXES
+        )
+        if len(all_stats) >= max_prefixes:
+            prefix = CACHE_INSTRUMENTATION_OTHER_PREFIX
+        stats = all_stats.setdefault((cache_name, prefix), [0, 0, 0.0, 0])
+    stats[0] += hits
+    stats[1] += misses
+    stats[2] += duration_ms
+    stats[3] += size
+
+
+def _record_tiered_cache_hit(key):
+    """
+    Records a TieredCache hit in the request cache or process cache tier, if
+    cache instrumentation is enabled.
+    """
+    get_prefix = _get_cache_key_prefix_function()
+    if get_prefix is not None:
+        _record_cache_stats('tiered_cache', get_prefix(key), hits=1)
+
+
+def _record_django_cache_reads(keys, values, start):
+    """
+    Records the hits, misses and latency of a django cache read started at
+    ``start``, if cache instrumentation is enabled. The latency of a bulk
+    read is split evenly between its keys.
+    """
+    get_prefix = _get_cache_key_prefix_function()
+    if get_prefix is None or not keys:
+        return
+    duration_ms = (time.perf_counter() - start) * 1000 / len(keys)
+    for key in keys:
+        is_found = key in values
+        _record_cache_stats(
+            'tiered_cache', get_prefix(key), hits=int(is_found), misses=int(not is_found), duration_ms=duration_ms,
+        )
+
+
+def _record_django_cache_writes(stored_sizes, start):
+    """
+    Records the latency and stored size of a django cache write started at
+    ``start``, if cache instrumentation is enabled.
+
+    Args:
+        stored_sizes (dict): The size in bytes of each key's value after
+            encoding by the codec, or 0 if the value was not encoded.
+        start (float): The ``time.perf_counter()`` before the write.
+
+    """
+    get_prefix = _get_cache_key_prefix_function()
+    if get_prefix is None or not stored_sizes:
+        return
+    duration_ms = (time.perf_counter() - start) * 1000 / len(stored_sizes)
+    for key, stored_size in stored_sizes.items():
+        _record_cache_stats('tiered_cache', get_prefix(key), duration_ms=duration_ms, size=stored_size)
+
+
+def get_request_cache_namespace_sizes():
+    """
+    Returns the approximate size of each RequestCache namespace for the
+    current request (or thread, outside of requests), as a dict mapping the
+    namespace to a tuple of its number of entries and its approximate size
+    in bytes.
+
+    The size is estimated from the shallow ``sys.getsizeof`` of a sample of
+    up to REQUEST_CACHE_SIZE_SAMPLE_SIZE keys and values, so it undercounts
+    values that contain other objects. Empty namespaces, and those used to
+    record cache instrumentation, are not included.
+    """
+    sizes = {}
+    for namespace, data in _get_request_cache().namespaces().items():
+        if not data or namespace in (CACHE_CUSTOM_ATTRIBUTES_NAMESPACE, CACHE_INSTRUMENTATION_NAMESPACE):
+            continue
+        sample = list(islice(data.items(), REQUEST_CACHE_SIZE_SAMPLE_SIZE))
+        sample_size = sum(sys.getsizeof(key) + sys.getsizeof(value) for key, value in sample)
+        sizes[namespace] = (len(data), sys.getsizeof(data) + sample_size * len(data) // len(sample))
+    return sizes
+
+
+def get_cache_custom_attributes():
+    """
+    Returns the custom attributes accumulated by the cache utilities during the
+    current request, including any cache instrumentation, which the
+    MonitoringSupportMiddleware reports once at the end of the request.
+
+    .. custom_attribute_name: tiered_cache.prefix.<prefix>.hits
+    .. custom_attribute_description: The number of TieredCache reads of keys with the prefix that
+       were found in any tier during the request. Requires CACHE_INSTRUMENTATION_ENABLED.
+    .. custom_attribute_name: tiered_cache.prefix.<prefix>.misses
+    .. custom_attribute_description: The number of TieredCache reads of keys with the prefix that
+       were not found in any tier during the request.
+    .. custom_attribute_name: tiered_cache.prefix.<prefix>.hit_ratio
+    .. custom_attribute_description: The hits divided by the reads of keys with the prefix.
+    .. custom_attribute_name: tiered_cache.prefix.<prefix>.django_cache_ms
+    .. custom_attribute_description: The total time spent reading and writing keys with the prefix
+       in the django cache tier during the request, in milliseconds.
+    .. custom_attribute_name: tiered_cache.prefix.<prefix>.bytes_written
+    .. custom_attribute_description: The total size after encoding of the values written to the
+       django cache tier for keys with the prefix during the request. Only values encoded by the
+       codec are counted, so this is only reported if TIERED_CACHE_CODEC is set.
+    .. custom_attribute_name: request_cache.namespace.<namespace>.hits
+    .. custom_attribute_description: The number of RequestCache reads in the namespace that were
+       found during the request. Namespaces used within edx-django-utils are not included.
+    .. custom_attribute_name: request_cache.namespace.<namespace>.misses
+    .. custom_attribute_description: The number of RequestCache reads in the namespace that were
+       not found during the request.
+    .. custom_attribute_name: request_cache.namespace.<namespace>.entries
+    .. custom_attribute_description: The number of entries in the namespace at the end of the
+       request. Requires CACHE_INSTRUMENTATION_ENABLED. Only the largest namespaces, up to
+       CACHE_INSTRUMENTATION_MAX_PREFIXES, are reported.
+    .. custom_attribute_name: request_cache.namespace.<namespace>.approximate_bytes
+    .. custom_attribute_description: The approximate size of the namespace at the end of the
+       request, from ``get_request_cache_namespace_sizes``.
+    .. custom_attribute_name: request_cache.namespace.<namespace>.evictions
+    .. custom_attribute_description: The number of entries evicted from a namespace with
+       max_entries during the request.
+    """
+    attributes = dict(RequestCache(CACHE_CUSTOM_ATTRIBUTES_NAMESPACE).data)
+    if attributes.get('tiered_cache.codec.serialized_bytes'):
+        attributes['tiered_cache.codec.compression_ratio'] = round(
+            attributes['tiered_cache.codec.stored_bytes'] / attributes['tiered_cache.codec.serialized_bytes'], 3
+        )
+
+    for (cache_name, prefix), (hits, misses, duration_ms, size) in RequestCache(
+        CACHE_INSTRUMENTATION_NAMESPACE
+    ).data.items():
+        name = f'{cache_name}.prefix.{prefix}' if cache_name == 'tiered_cache' else f'{cache_name}.namespace.{prefix}'
+        attributes[f'{name}.hits'] = hits
+        attributes[f'{name}.misses'] = misses
+        if cache_name == 'tiered_cache':
+            if hits or misses:
+                attributes[f'{name}.hit_ratio'] = round(hits / (hits + misses), 3)
+            attributes[f'{name}.django_cache_ms'] = round(duration_ms, 3)
+            if size:
+                attributes[f'{name}.bytes_written'] = size
+
+    if _get_cache_key_prefix_function() is not None:
+        max_namespaces = getattr(
+            settings, 'CACHE_INSTRUMENTATION_MAX_PREFIXES', CACHE_INSTRUMENTATION_DEFAULT_MAX_PREFIXES
+        )
+        namespace_sizes = sorted(get_request_cache_namespace_sizes().items(), key=lambda item: -item[1][0])
+        for namespace, (entries, approximate_bytes) in namespace_sizes[:max_namespaces]:
+            attributes[f'request_cache.namespace.{namespace}.entries'] = entries
+            attributes[f'request_cache.namespace.{namespace}.approximate_bytes'] = approximate_bytes
+    return attributes
+
+
+class RequestCache:
+    """
+    A namespaced request cache for caching per-request data.
+    """
+
+    def __init__(self, namespace=None, max_entries=None):
+        """
+        Creates a request cache with the provided namespace.
+
+        Args:
+            namespace (string): (optional) uses 'default' if not provided.
+            max_entries (int): (optional) the maximum number of entries kept in
+                the namespace, after which the least recently used entries are
+                evicted. Unbounded if not provided.
+        """
+        assert namespace != DEFAULT_REQUEST_CACHE_NAMESPACE, \
+            f'Optional namespace can not be {DEFAULT_REQUEST_CACHE_NAMESPACE}.'
+        assert max_entries is None or max_entries > 0, 'Optional max_entries must be positive.'
+        self.namespace = namespace or DEFAULT_REQUEST_CACHE_NAMESPACE
+        self.max_entries = max_entries
+        # Namespaces used within edx-django-utils are instrumented separately, if at all.
+        self._is_instrumented = not self.namespace.startswith('edx_django_utils.')
+
+    @classmethod
+    def clear_all_namespaces(cls):
+        """
+        Clears the data for all namespaces.
+        """
+        _get_request_cache().clear()
+
+    @classmethod
+    @contextmanager
+    def scope(cls):
+        """
+        A context manager that clears all namespaces before and after its body,
+        for code that does not run in a request, like Celery tasks and
+        management commands::
+
+            with RequestCache.scope():
+                process_item(item)
+
+        Any TieredCache writes buffered with ``write_behind`` are flushed
+        before the namespaces are cleared.
+        """
+        TieredCache.flush()
+        cls.clear_all_namespaces()
+        try:
+            yield
+        finally:
+            try:
+                TieredCache.flush()
+            finally:
+                cls.clear_all_namespaces()
+
+    @property
+    def data(self):
+        """
+        Returns the namespaced cached key/value pairs as a dict.
+        """
+        return _get_request_cache().data(self.namespace)
+
+    def clear(self):
+        """
+        Clears data for the namespaced request cache.
+        """
+        self.data.clear()
+
+    def bind(self):
+        """
+        Returns a handle to the namespace for the current request, which looks
+        up its dict once rather than on every call.
+
+        The handle must not be kept beyond the current request, or across
+        calls to ``clear_all_namespaces``. It is meant for hot loops, like::
+
+            cache = RequestCache('my_namespace').bind()
+            for key in keys:
+                value = cache.get(key)
+
+        """
+        return _BoundRequestCache(self, self.data)
+
+    def get(self, key, default=None):
+        """
+        Returns the cached value for the provided key, or the default.
+
+        This is faster than ``get_cached_response``, since it does not create a
+        CachedResponse. As with ``get_value_or_default``, do not pass None as
+        the default and then test the return value.
+
+        Args:
+            key (string)
+            default (object): (Optional) Returned if the key is not found, or
+                was cached with ``TieredCache.set_negative``.
+
+        """
+        value = self._get(self.data, key)
+        return default if value is _CACHE_MISS or value is _NEGATIVE_CACHE_TOMBSTONE else value
+
+    def get_cached_response(self, key):
+        """
+        Retrieves a CachedResponse for the provided key.
+
+        Args:
+            key (string)
+
+        Returns:
+            A CachedResponse with is_found status and value.
+
+        """
+        cached_value = self._get(self.data, key)
+        if cached_value is _CACHE_MISS:
+            return _get_cache_miss_response(key)
+        return CachedResponse(True, key, cached_value)
+
+    def set(self, key, value):
+        """
+        Caches the value for the provided key.
+
+        Args:
+            key (string)
+            value (object)
+
+        """
+        self._set(self.data, key, value)
+
+    def setdefault(self, key, value):
+        """
+        Sets the value for the provided key if it has not yet been set.
+
+        Args:
+            key (string)
+            value (object)
+
+        """
+        data = self.data
+        if key not in data:
+            self._set(data, key, value)
+
+    def delete(self, key):
+        """
+        Deletes the cached value for the provided key.
+
+        Args:
+            key (string)
+
+        """
+        self.data.pop(key, None)
+
+    def _get(self, data, key):
+        """
+        Returns the cached value for the provided key from the namespace's data,
+        or _CACHE_MISS, marking it as recently used.
+        """
+        value = data.get(key, _CACHE_MISS)
+        if self.max_entries is not None and value is not _CACHE_MISS:
+            # Dicts are ordered, so moving the key to the end keeps them in LRU order.
+            data[key] = data.pop(key)
+        if self._is_instrumented and _get_cache_key_prefix_function() is not None:
+            is_found = value is not _CACHE_MISS
+            _record_cache_stats('request_cache', self.namespace, hits=int(is_found), misses=int(not is_found))
+        return value
+
+    def _set(self, data, key, value):
+        """
+        Caches the value in the namespace's data, evicting the least recently
+        used entries if the namespace is over max_entries.
+        """
+        if self.max_entries is None:
+            data[key] = value
+            return
+
+        data.pop(key, None)
+        data[key] = value
+        evictions = len(data) - self.max_entries
+        if evictions > 0:
+            for oldest_key in list(islice(data, evictions)):
+                del data[oldest_key]
+            _accumulate_cache_attribute(f'request_cache.namespace.{self.namespace}.evictions', evictions)
+
+
+class _BoundRequestCache:
+    """
+    A handle to a RequestCache namespace for the current request. See
+    ``RequestCache.bind``.
+    """
+    __slots__ = ('_request_cache', '_data')
+
+    def __init__(self, request_cache, data):
+        self._request_cache = request_cache
+        self._data = data
+
+    def get(self, key, default=None):
+        """
+        Returns the cached value for the provided key, or the default.
+        """
+        value = self._request_cache._get(self._data, key)  # pylint: disable=protected-access
+        return default if value is _CACHE_MISS or value is _NEGATIVE_CACHE_TOMBSTONE else value
+
+    def get_cached_response(self, key):
+        """
+        Retrieves a CachedResponse for the provided key.
+        """
+        value = self._request_cache._get(self._data, key)  # pylint: disable=protected-access
+        if value is _CACHE_MISS:
+            return _get_cache_miss_response(key)
+        return CachedResponse(True, key, value)
+
+    def set(self, key, value):
+        """
+        Caches the value for the provided key.
+        """
+        self._request_cache._set(self._data, key, value)  # pylint: disable=protected-access
+
+    def setdefault(self, key, value):
+        """
+        Sets the value for the provided key if it has not yet been set.
+        """
+        if key not in self._data:
+            self._request_cache._set(self._data, key, value)  # pylint: disable=protected-access
+
+    def delete(self, key):
+        """
+        Deletes the cached value for the provided key.
+        """
+        self._data.pop(key, None)
+
+
+DEFAULT_REQUEST_CACHE = RequestCache()
+# Values buffered by ``TieredCache.set_all_tiers(..., write_behind=True)``, by key, as
+# tuples of the value to store, the django cache timeout, and whether to publish a process
+# cache invalidation.
+_WRITE_BEHIND_REQUEST_CACHE = RequestCache(WRITE_BEHIND_REQUEST_CACHE_NAMESPACE)
+
+
+class _ProcessCache:
+    """
+    A process-wide, bounded, TTL-aware LRU cache, shared by all threads.
+
+    This is the optional middle tier of the TieredCache. The limit is read
+    from settings on each write, so that it can be changed without a restart
+    of the cache.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, expires_at)
+
+    def get(self, key):
+        """
+        Returns the cached value for the provided key, or _CACHE_MISS.
+
+        Hits and misses are only reported once something has been stored in
+        the process cache, so that processes that do not use it pay nothing.
+        """
+        if not self._entries:
+            return _CACHE_MISS
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None:
+            _accumulate_process_cache_attribute('misses', 1)
+            return _CACHE_MISS
+        _accumulate_process_cache_attribute('hits', 1)
+        return entry[0]
+
+    def set(self, key, value, timeout):
+        """
+        Caches the value for the provided key for ``timeout`` seconds, evicting
+        the least recently used entries as needed to stay within the limit.
+        """
+        # .. setting_name: TIERED_CACHE_PROCESS_CACHE_MAX_ENTRIES
+        # .. setting_default: 1000
+        # .. setting_description: Maximum number of entries kept in the process cache tier of the
+        #   TieredCache. See ``process_cache_timeout`` on ``TieredCache.set_all_tiers``.
+        max_entries = getattr(settings, 'TIERED_CACHE_PROCESS_CACHE_MAX_ENTRIES', PROCESS_CACHE_DEFAULT_MAX_ENTRIES)
+
+        evictions = 0
+        with self._lock:
+            self._entries.pop(key, None)
+            if max_entries <= 0:
+                return
+            self._entries[key] = (value, time.monotonic() + timeout)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+                evictions += 1
+
+        if evictions:
+            _accumulate_process_cache_attribute('evictions', evictions)
+
+    def delete(self, key):
+        """
+        Deletes the cached value for the provided key.
+
+        As with ``get``, this is free in processes that do not use the process
+        cache, since every TieredCache write deletes the key.
+        """
+        if not self._entries:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def update(self, key, value, timeout):
+        """
+        Caches the value for the provided key for ``timeout`` seconds, or
+        deletes any cached value if the timeout is not set, so that a write
+        that does not opt the key in does not leave an old value behind.
+        """
+        if timeout:
+            self.set(key, value, timeout)
+        else:
+            self.delete(key)
+
+    def clear(self):
+        """
+        Clears all entries.
+        """
+        with self._lock:
+            self._entries = OrderedDict()
+
+
+def _accumulate_process_cache_attribute(name, value):
+    """
+    Accumulates a process cache custom attribute for the current request.
+
+    .. custom_attribute_name: tiered_cache.process_cache.hits
+    .. custom_attribute_description: The number of TieredCache reads served by the process cache tier
+       during the request. Only reported once the process cache has been used.
+    .. custom_attribute_name: tiered_cache.process_cache.misses
+    .. custom_attribute_description: The number of TieredCache reads that missed the process cache tier
+       during the request. Only reported once the process cache has been used.
+    .. custom_attribute_name: tiered_cache.process_cache.evictions
+    .. custom_attribute_description: The number of entries evicted from the process cache tier to stay
+       within its size limits during the request.
+    """
+    _accumulate_cache_attribute(f'tiered_cache.process_cache.{name}', value)
+
+
+# Singleton shared by all threads in the process
+_PROCESS_CACHE = _ProcessCache()
+
+
+class _TieredCacheEnvelope:
+    """
+    Wraps a value stored in the django cache with the metadata needed for
+    stampede protection and stale-while-revalidate.
+
+    Attributes:
+        value (object): The cached value.
+        delta (float): How long the value took to compute (in seconds).
+        expiry (float): When the value expires from the django cache, as a
+            unix timestamp, or None if it never expires.
+        soft_expiry (float): When the value becomes stale, as a unix
+            timestamp, or None if it is never considered stale.
+        process_cache_timeout (int): How long processes that read the value
+            should keep it in their process cache (in seconds), or None to
+            skip the process cache.
+    """
+    __slots__ = ('value', 'delta', 'expiry', 'soft_expiry', 'process_cache_timeout')
+
+    def __init__(self, value, delta, expiry, *, soft_expiry=None, process_cache_timeout=None):
+        self.value = value
+        self.delta = delta
+        self.expiry = expiry
+        self.soft_expiry = soft_expiry
+        self.process_cache_timeout = process_cache_timeout
+
+    def __getstate__(self):
+        return (self.value, self.delta, self.expiry, self.soft_expiry, self.process_cache_timeout)
+
+    def __setstate__(self, state):
+        # Pad state pickled by older versions, which had fewer fields.
+        state = tuple(state) + (None,) * (len(self.__slots__) - len(state))
+        self.value, self.delta, self.expiry, self.soft_expiry, self.process_cache_timeout = state
+
+    @property
+    def is_stale(self):
+        """
+        Returns True if the value is past its soft expiry.
+        """
+        return self.soft_expiry is not None and time.time() >= self.soft_expiry
+
+    def should_recompute_early(self, beta=1.0):
+        """
+        Returns True if this caller should recompute the value before it
+        expires, using the XFetch probabilistic early expiration algorithm.
+        """
+        if self.expiry is None:
+            return False
+        # 1 - random() is in (0, 1], which keeps log() defined.
+        return time.time() - self.delta * beta * math.log(1.0 - random.random()) >= self.expiry
+
+
+def _get_cached_response_for_django_cache_value(key, cached_value):
+    """
+    Returns a CachedResponse for a value read from the django cache,
+    unwrapping it if it is a _TieredCacheEnvelope.
+
+    Values that opted in to the process cache are also stored there.
+    """
+    if cached_value is _CACHE_MISS:
+        return _get_cache_miss_response(key)
+    if isinstance(cached_value, _TieredCacheEnvelope):
+        if cached_value.process_cache_timeout:
+            _PROCESS_CACHE.set(key, cached_value.value, cached_value.process_cache_timeout)
+        return CachedResponse(True, key, cached_value.value, is_stale=cached_value.is_stale)
+    return CachedResponse(True, key, cached_value)
+
+
+def _django_cache_get(key):
+    """
+    Returns the value for the provided key from the django cache, decoding it
+    if it was encoded by the codec, or _CACHE_MISS.
+    """
+    start = time.perf_counter()
+    value = django_cache.get(key, _CACHE_MISS)
+    if codec.is_encoded(value):
+        value = _django_cache_decode({key: value}).get(key, _CACHE_MISS)
+    _record_django_cache_reads([key], () if value is _CACHE_MISS else (key,), start)
+    return value
+
+
+async def _django_cache_aget(key):
+    """
+    Async version of ``_django_cache_get``.
+    """
+    start = time.perf_counter()
+    value = await django_cache.aget(key, _CACHE_MISS)
+    if codec.is_encoded(value):
+        value = (await _django_cache_adecode({key: value})).get(key, _CACHE_MISS)
+    _record_django_cache_reads([key], () if value is _CACHE_MISS else (key,), start)
+    return value
+
+
+def _django_cache_get_many(keys):
+    """
+    Returns a dict of the values found in the django cache for the provided
+    keys, decoding any that were encoded by the codec.
+    """
+    start = time.perf_counter()
+    values = _django_cache_decode(django_cache.get_many(keys))
+    _record_django_cache_reads(keys, values, start)
+    return values
+
+
+async def _django_cache_aget_many(keys):
+    """
+    Async version of ``_django_cache_get_many``.
+    """
+    start = time.perf_counter()
+    values = await _django_cache_adecode(await django_cache.aget_many(keys))
+    _record_django_cache_reads(keys, values, start)
+    return values
+
+
+def _django_cache_decode(stored_values):
+    """
+    Decodes the encoded values in a dict read from the django cache.
+
+    The chunks of all chunked values are read with a single ``get_many``.
+    Values with missing chunks are dropped, so that they are treated as misses.
+    """
+    chunk_keys = _get_chunk_keys(stored_values)
+    if chunk_keys is None:
+        return stored_values
+    return _decode_django_cache_values(stored_values, django_cache.get_many(chunk_keys) if chunk_keys else {})
+
+
+async def _django_cache_adecode(stored_values):
+    """
+    Async version of ``_django_cache_decode``.
+    """
+    chunk_keys = _get_chunk_keys(stored_values)
+    if chunk_keys is None:
+        return stored_values
+    return _decode_django_cache_values(stored_values, await django_cache.aget_many(chunk_keys) if chunk_keys else {})
+
+
+def _get_chunk_keys(stored_values):
+    """
+    Returns the chunk keys needed to decode the values read from the django
+    cache, or None if none of the values need to be decoded.
+    """
+    encoded_values = [stored_value for stored_value in stored_values.values() if codec.is_encoded(stored_value)]
+    if not encoded_values:
+        return None
+    return [chunk_key for stored_value in encoded_values for chunk_key in codec.get_chunk_keys(stored_value)]
+
+
+def _decode_django_cache_values(stored_values, chunks):
+    """
+    Returns a copy of the values read from the django cache with the encoded
+    values decoded, using the chunks read for them.
+    """
+    values = dict(stored_values)
+    for key, stored_value in stored_values.items():
+        if not codec.is_encoded(stored_value):
+            continue
+        is_decoded, value, stats = codec.decode(stored_value, chunks)
+        if is_decoded:
+            values[key] = value
+            _report_codec_stats('decode', stats)
+        else:
+            del values[key]
+    return values
+
+
+def _django_cache_set(key, value, timeout):
+    """
+    Caches the value for the provided key in the django cache, encoding it
+    first if the codec is enabled.
+    """
+    _discard_pending_writes([key])
+    start = time.perf_counter()
+    items, stored_size = _encode_django_cache_value(key, value)
+    if len(items) == 1:
+        django_cache.set(key, items[key], timeout)
+    else:
+        django_cache.set_many(items, timeout)
+    _record_django_cache_writes({key: stored_size}, start)
+
+
+async def _django_cache_aset(key, value, timeout):
+    """
+    Async version of ``_django_cache_set``.
+    """
+    _discard_pending_writes([key])
+    start = time.perf_counter()
+    items, stored_size = _encode_django_cache_value(key, value)
+    if len(items) == 1:
+        await django_cache.aset(key, items[key], timeout)
+    else:
+        await django_cache.aset_many(items, timeout)
+    _record_django_cache_writes({key: stored_size}, start)
+
+
+def _django_cache_set_many(mapping, timeout):
+    """
+    Caches the provided key/value pairs in the django cache with a single
+    ``set_many``, encoding them first if the codec is enabled.
+    """
+    _discard_pending_writes(mapping)
+    start = time.perf_counter()
+    items, stored_sizes = _encode_django_cache_values(mapping)
+    django_cache.set_many(items, timeout)
+    _record_django_cache_writes(stored_sizes, start)
+
+
+async def _django_cache_aset_many(mapping, timeout):
+    """
+    Async version of ``_django_cache_set_many``.
+    """
+    _discard_pending_writes(mapping)
+    start = time.perf_counter()
+    items, stored_sizes = _encode_django_cache_values(mapping)
+    await django_cache.aset_many(items, timeout)
+    _record_django_cache_writes(stored_sizes, start)
+
+
+def _discard_pending_writes(keys):
+    """
+    Discards any writes of the keys buffered with ``write_behind``, which
+    would otherwise overwrite a later write or delete when they are flushed.
+    """
+    pending_writes = _WRITE_BEHIND_REQUEST_CACHE.data
+    if pending_writes:
+        for key in keys:
+            pending_writes.pop(key, None)
+
+
+def _pop_pending_writes():
+    """
+    Returns the writes buffered with ``write_behind`` in the current request
+    and clears them, as a dict mapping each timeout to the key/value pairs to
+    write with it.
+    """
+    pending_writes = _WRITE_BEHIND_REQUEST_CACHE.data
+    batches = defaultdict(dict)
+    for key, (value, timeout) in pending_writes.items():
+        batches[timeout][key] = value
+    pending_writes.clear()
+    return batches
+
+
+def _encode_django_cache_value(key, value):
+    """
+    Returns a tuple of a dict of the keys and values to store in the django
+    cache for the provided key and value, and the encoded size of the value,
+    or 0 if it was not encoded. See ``codec.encode``.
+    """
+    items, stats = codec.encode(key, value)
+    if stats is None:
+        return items, 0
+    _report_codec_stats('encode', stats)
+    return items, stats.stored_size
+
+
+def _encode_django_cache_values(mapping):
+    """
+    Returns a tuple of a dict of the keys and values to store in the django
+    cache for the provided key/value pairs, and a dict of the encoded size of
+    each value. See ``_encode_django_cache_value``.
+    """
+    items = {}
+    stored_sizes = {}
+    for key, value in mapping.items():
+        key_items, stored_sizes[key] = _encode_django_cache_value(key, value)
+        items.update(key_items)
+    return items, stored_sizes
+
+
+def _report_codec_stats(operation, stats):
+    """
+    Reports the time taken by the codec, and the compression ratio of the
+    values encoded during the current request.
+
+    .. custom_attribute_name: tiered_cache.codec.encode_ms
+    .. custom_attribute_description: The total time spent compressing and serializing TieredCache values
+       during the request, in milliseconds. Only reported if TIERED_CACHE_CODEC is set.
+    .. custom_attribute_name: tiered_cache.codec.decode_ms
+    .. custom_attribute_description: The total time spent decompressing and deserializing TieredCache
+       values during the request, in milliseconds.
+    .. custom_attribute_name: tiered_cache.codec.serialized_bytes
+    .. custom_attribute_description: The total serialized size of the TieredCache values encoded during
+       the request, before compression.
+    .. custom_attribute_name: tiered_cache.codec.stored_bytes
+    .. custom_attribute_description: The total size of the TieredCache values encoded during the request,
+       after compression.
+    .. custom_attribute_name: tiered_cache.codec.compression_ratio
+    .. custom_attribute_description: The stored bytes divided by the serialized bytes of the TieredCache
+       values encoded during the request. Lower is better.
+    """
+    _accumulate_cache_attribute(f'tiered_cache.codec.{operation}_ms', stats.duration * 1000)
+    if operation == 'encode':
+        _accumulate_cache_attribute('tiered_cache.codec.serialized_bytes', stats.serialized_size)
+        _accumulate_cache_attribute('tiered_cache.codec.stored_bytes', stats.stored_size)
+
+
+def _get_stale_refresh_executor():
+    """
+    Returns the process-wide thread pool used for background refreshes,
+    creating it on first use.
+    """
+    global _STALE_REFRESH_EXECUTOR  # pylint: disable=global-statement
+    with _STALE_REFRESH_LOCK:
+        if _STALE_REFRESH_EXECUTOR is None:
+            _STALE_REFRESH_EXECUTOR = ThreadPoolExecutor(
+                max_workers=STALE_REFRESH_MAX_WORKERS,
+                thread_name_prefix='tiered_cache_refresh',
+            )
+        return _STALE_REFRESH_EXECUTOR
+
+
+class TieredCache:
+    """
+    A two tiered caching object with a request cache backed by a django cache.
+
+    Keys may also opt in to a process cache, which sits between the two tiers.
+    """
+
+    @classmethod
+    def get_cached_response(cls, key):
+        """
+        Retrieves a CachedResponse for the provided key.
 
         Args:
-            namespace (string): The namespace, or key, of the data dict.
+            key (string)
 
         Returns:
-            (dict)
+            A CachedResponse with is_found status and value.
 
         """
-        assert namespace
-
-        if namespace in self._data:
-            return self._data[namespace]
+        request_cached_response = DEFAULT_REQUEST_CACHE.get_cached_response(key)
+        if not request_cached_response.is_found:
+            process_cached_response = cls._get_cached_response_from_process_cache(key)
+            if process_cached_response.is_found:
+                DEFAULT_REQUEST_CACHE.set(key, process_cached_response.value)
+                _record_tiered_cache_hit(key)
+                return process_cached_response
+            django_cached_response = cls._get_cached_response_from_django_cache(key)
+            cls._set_request_cache_if_django_cache_hit(key, django_cached_response)
+            return django_cached_response
 
-        new_data = {}
-        self._data[namespace] = new_data
-        return new_data
+        _record_tiered_cache_hit(key)
+        return request_cached_response
 
+    @classmethod
+    def get_cached_responses(cls, keys):
+        """
+        Retrieves a CachedResponse for each of the provided keys.
 
-# Singleton with thread-local cache
-_REQUEST_CACHE = _RequestCache()
+        The request cache and process cache are checked first, and a single
+        django cache ``get_many`` is used for only the keys that were not found
+        there. Any hits are copied back into the request cache.
 
+        Args:
+            keys (iterable of string)
 
-class RequestCache:
-    """
-    A namespaced request cache for caching per-request data.
-    """
+        Returns:
+            A dict mapping each key to a CachedResponse with is_found status
+            and value.
 
-    def __init__(self, namespace=None):
         """
-        Creates a request cache with the provided namespace.
+        cached_responses, request_cache_misses = cls._get_cached_responses_from_local_tiers(keys)
+        if request_cache_misses:
+            django_cached_responses = cls._get_cached_responses_from_django_cache(request_cache_misses)
+            for key, django_cached_response in django_cached_responses.items():
+                cls._set_request_cache_if_django_cache_hit(key, django_cached_response)
+                cached_responses[key] = django_cached_response
 
-        Args:
-            namespace (string): (optional) uses 'default' if not provided.
-        """
-        assert namespace != DEFAULT_REQUEST_CACHE_NAMESPACE, \
-            f'Optional namespace can not be {DEFAULT_REQUEST_CACHE_NAMESPACE}.'
-        self.namespace = namespace or DEFAULT_REQUEST_CACHE_NAMESPACE
+        return cached_responses
 
     @classmethod
-    def clear_all_namespaces(cls):
+    async def aget_cached_response(cls, key):
         """
-        Clears the data for all namespaces.
+        Async version of ``get_cached_response``, which uses the django
+        cache's async API.
         """
-        _REQUEST_CACHE.clear()
+        request_cached_response = DEFAULT_REQUEST_CACHE.get_cached_response(key)
+        if request_cached_response.is_found:
+            _record_tiered_cache_hit(key)
+            return request_cached_response
+
+        process_cached_response = cls._get_cached_response_from_process_cache(key)
+        if process_cached_response.is_found:
+            DEFAULT_REQUEST_CACHE.set(key, process_cached_response.value)
+            _record_tiered_cache_hit(key)
+            return process_cached_response
+
+        if cls._should_force_django_cache_miss():
+            return _get_cache_miss_response(key)
+        django_cached_response = _get_cached_response_for_django_cache_value(key, await _django_cache_aget(key))
+        cls._set_request_cache_if_django_cache_hit(key, django_cached_response)
+        return django_cached_response
 
-    @property
-    def data(self):
+    @classmethod
+    async def aget_cached_responses(cls, keys):
         """
-        Returns the namespaced cached key/value pairs as a dict.
+        Async version of ``get_cached_responses``, which uses the django
+        cache's async API.
         """
-        return _REQUEST_CACHE.data(self.namespace)
+        cached_responses, request_cache_misses = cls._get_cached_responses_from_local_tiers(keys)
+        if request_cache_misses and not cls._should_force_django_cache_miss():
+            cached_values = await _django_cache_aget_many(request_cache_misses)
+            for key in request_cache_misses:
+                django_cached_response = _get_cached_response_for_django_cache_value(
+                    key, cached_values.get(key, _CACHE_MISS)
+                )
+                cls._set_request_cache_if_django_cache_hit(key, django_cached_response)
+                cached_responses[key] = django_cached_response
+
+        return cached_responses
 
-    def clear(self):
+    @classmethod
+    def get_or_set(cls, key, compute_fn, django_cache_timeout=DEFAULT_TIMEOUT, beta=1.0):
         """
-        Clears data for the namespaced request cache.
+        Returns the cached value for the provided key, computing and caching it
+        in all tiers if needed, with protection against cache stampedes.
+
+        Only one process recomputes an expired value at a time. The recompute
+        lock is a short-lived key added to the django cache with ``add()``.
+        Processes that fail to get the lock serve the previous value if there
+        is one, and otherwise poll the django cache until the value appears.
+
+        Values are also recomputed probabilistically shortly before they
+        expire (XFetch), so that popular keys are usually refreshed before
+        they would ever miss. Values cached by other methods, like
+        ``set_all_tiers`` or ``set_negative``, are served as they are, since
+        their expiry is unknown.
+
+        Args:
+            key (string)
+            compute_fn (callable): Called with no arguments to compute the value.
+            django_cache_timeout (int): (Optional) See ``set_all_tiers``.
+            beta (float): (Optional) Values greater than 1.0 favor earlier
+                recomputation, values less than 1.0 favor later recomputation.
+
+        Returns:
+            The cached or computed value.
+
         """
-        self.data.clear()
+        request_cached_response = DEFAULT_REQUEST_CACHE.get_cached_response(key)
+        if request_cached_response.is_found:
+            return request_cached_response.value
+
+        if django_cache_timeout == 0 or cls._should_force_django_cache_miss():
+            value = compute_fn()
+            cls.set_all_tiers(key, value, django_cache_timeout)
+            return value
+
+        process_cached_response = cls._get_cached_response_from_process_cache(key)
+        if process_cached_response.is_found:
+            DEFAULT_REQUEST_CACHE.set(key, process_cached_response.value)
+            return process_cached_response.value
+
+        envelope = _django_cache_get(key)
+        if envelope is _CACHE_MISS:
+            envelope = None
+        elif not isinstance(envelope, _TieredCacheEnvelope) or not envelope.should_recompute_early(beta):
+            return cls._get_value_and_set_request_cache(key, envelope)
+
+        lock_key = key + STAMPEDE_LOCK_KEY_SUFFIX
+        if django_cache.add(lock_key, True, STAMPEDE_LOCK_TIMEOUT):
+            try:
+                return cls._compute_and_set_all_tiers(key, compute_fn, django_cache_timeout)
+            finally:
+                django_cache.delete(lock_key)
+
+        if envelope is not None:
+            # Another process is recomputing; serve the value that is about to expire.
+            return cls._get_value_and_set_request_cache(key, envelope)
+
+        deadline = time.monotonic() + STAMPEDE_MAX_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(STAMPEDE_POLL_INTERVAL)
+            cached_value = _django_cache_get(key)
+            if cached_value is not _CACHE_MISS:
+                return cls._get_value_and_set_request_cache(key, cached_value)
+
+        # The process holding the lock is taking too long, so compute the value anyway.
+        return cls._compute_and_set_all_tiers(key, compute_fn, django_cache_timeout)
 
-    def get_cached_response(self, key):
+    @classmethod
+    def get_or_revalidate(cls, key, compute_fn, stale_after, django_cache_timeout=DEFAULT_TIMEOUT):
         """
-        Retrieves a CachedResponse for the provided key.
+        Returns a CachedResponse for the provided key, serving stale values
+        while they are refreshed in the background.
+
+        Once a value is older than ``stale_after``, it is still returned
+        immediately (with ``is_stale`` set), and a single refresh is scheduled
+        on a bounded background thread pool. Only a complete miss makes the
+        caller wait for ``compute_fn``.
 
         Args:
             key (string)
+            compute_fn (callable): Called with no arguments to compute the value.
+            stale_after (int): Number of seconds after which the value is stale.
+            django_cache_timeout (int): (Optional) See ``set_all_tiers``. This
+                is the hard expiry, and should be longer than ``stale_after``.
 
         Returns:
-            A CachedResponse with is_found status and value.
+            A CachedResponse, which is always found.
 
         """
-        cached_value = self.data.get(key, _CACHE_MISS)
-        is_found = cached_value is not _CACHE_MISS
-        return CachedResponse(is_found, key, cached_value)
+        cached_response = cls.get_cached_response(key)
+        if cached_response.is_found:
+            if cached_response.is_stale:
+                cls._schedule_stale_refresh(key, compute_fn, stale_after, django_cache_timeout)
+            return cached_response
 
-    def set(self, key, value):
+        value = compute_fn()
+        cls.set_all_tiers(key, value, django_cache_timeout, stale_after=stale_after)
+        return CachedResponse(True, key, value)
+
+    @staticmethod
+    def set_all_tiers(
+        key, value, django_cache_timeout=DEFAULT_TIMEOUT, *, stale_after=None, process_cache_timeout=None,
+        write_behind=False,
+    ):
         """
-        Caches the value for the provided key.
+        Caches the value for the provided key in both the request cache and the
+        django cache.
 
         Args:
             key (string)
             value (object)
+            django_cache_timeout (int): (Optional) Timeout used to determine
+                if and for how long to cache in the django cache. A timeout of
+                0 will skip the django cache. If timeout is provided, use that
+                timeout for the key; otherwise use the default cache timeout.
+                (in seconds)
+            stale_after (int): (Optional) Number of seconds after which a
+                value read from the django cache is reported as stale. See
+                ``get_or_revalidate``.
+            process_cache_timeout (int): (Optional) Opts the key in to the
+                process cache tier. Each process that sets or reads the value
+                keeps it in memory for this many seconds, avoiding the django
+                cache. Only use this for values that rarely change, since
+                other processes only see changes once they expire, unless a
+                TIERED_CACHE_INVALIDATION_BACKEND is configured.
+            write_behind (bool): (Optional) Buffers the write to the django
+                cache, so that all buffered writes are sent with a single
+                ``set_many`` per timeout by ``flush``, which the
+                TieredCacheMiddleware calls at the end of the request. Other
+                processes see the old value, if any, until then.
+
+        Large values are compressed, and split across several keys if needed,
+        when the TIERED_CACHE_CODEC setting is set.
 
         """
-        self.data[key] = value
+        DEFAULT_REQUEST_CACHE.set(key, value)
+        value_to_store = TieredCache._wrap_django_cache_value(value, stale_after, process_cache_timeout)
+        if write_behind:
+            _PROCESS_CACHE.update(key, value, process_cache_timeout)
+            # The invalidation is published on flush, so other processes don't reread the old value.
+            _WRITE_BEHIND_REQUEST_CACHE.set(key, (value_to_store, django_cache_timeout))
+            return
+
+        _django_cache_set(key, value_to_store, django_cache_timeout)
+        # Published after the django cache write, so other processes don't reread the old value.
+        TieredCache._publish_process_cache_invalidation(key)
+        _PROCESS_CACHE.update(key, value, process_cache_timeout)
 
-    def setdefault(self, key, value):
+    @staticmethod
+    async def aset_all_tiers(
+        key, value, django_cache_timeout=DEFAULT_TIMEOUT, *, stale_after=None, process_cache_timeout=None,
+        write_behind=False,
+    ):
         """
-        Sets the value for the provided key if it has not yet been set.
+        Async version of ``set_all_tiers``, which uses the django cache's
+        async API.
+        """
+        if write_behind:
+            TieredCache.set_all_tiers(
+                key, value, django_cache_timeout,
+                stale_after=stale_after, process_cache_timeout=process_cache_timeout, write_behind=True,
+            )
+            return
+
+        DEFAULT_REQUEST_CACHE.set(key, value)
+        await _django_cache_aset(
+            key, TieredCache._wrap_django_cache_value(value, stale_after, process_cache_timeout), django_cache_timeout,
+        )
+        await TieredCache._apublish_process_cache_invalidation(key)
+        _PROCESS_CACHE.update(key, value, process_cache_timeout)
+
+    @staticmethod
+    def set_negative(key, django_cache_timeout=DEFAULT_TIMEOUT):
+        """
+        Caches that nothing exists for the provided key, in both the request
+        cache and the django cache.
+
+        Later reads return a CachedResponse with ``is_found`` and
+        ``is_negative`` set, and a value of None, so that lookups of missing
+        objects do not hit the database on every request.
+
+        Example:
+            >>> cached_response = TieredCache.get_cached_response(key)
+            >>> if cached_response.is_found:
+            >>>     return cached_response.value  # None if is_negative
+            >>> config = SiteConfiguration.objects.filter(site=site).first()
+            >>> if config is None:
+            >>>     TieredCache.set_negative(key)
+            >>> else:
+            >>>     TieredCache.set_all_tiers(key, config, 60 * 60)
 
         Args:
             key (string)
-            value (object)
+            django_cache_timeout (int): (Optional) See ``set_all_tiers``.
+                Defaults to the TIERED_CACHE_NEGATIVE_TIMEOUT setting, which
+                should be shorter than the timeout used for found values, so
+                that newly created objects are seen soon.
 
         """
-        self.data.setdefault(key, value)
+        if django_cache_timeout is DEFAULT_TIMEOUT:
+            # .. setting_name: TIERED_CACHE_NEGATIVE_TIMEOUT
+            # .. setting_default: 60
+            # .. setting_description: Default django cache timeout, in seconds, for keys cached as not
+            #   existing with ``TieredCache.set_negative``.
+            django_cache_timeout = getattr(settings, 'TIERED_CACHE_NEGATIVE_TIMEOUT', NEGATIVE_CACHE_DEFAULT_TIMEOUT)
+
+        DEFAULT_REQUEST_CACHE.set(key, _NEGATIVE_CACHE_TOMBSTONE)
+        _PROCESS_CACHE.delete(key)
+        _django_cache_set(key, _NEGATIVE_CACHE_TOMBSTONE, django_cache_timeout)
+        TieredCache._publish_process_cache_invalidation(key)
 
-    def delete(self, key):
+    @staticmethod
+    def set_all_tiers_many(mapping, django_cache_timeout=DEFAULT_TIMEOUT):
         """
-        Deletes the cached value for the provided key.
+        Caches each of the provided key/value pairs in both the request cache
+        and the django cache, using a single django cache ``set_many``.
 
         Args:
-            key (string)
+            mapping (dict): The key/value pairs to cache.
+            django_cache_timeout (int): (Optional) See ``set_all_tiers``.
 
         """
-        if key in self.data:
-            del self.data[key]
+        if not mapping:
+            return
+        for key, value in mapping.items():
+            DEFAULT_REQUEST_CACHE.set(key, value)
+            _PROCESS_CACHE.delete(key)
+        _django_cache_set_many(mapping, django_cache_timeout)
+        for key in mapping:
+            TieredCache._publish_process_cache_invalidation(key)
 
+    @staticmethod
+    async def aset_all_tiers_many(mapping, django_cache_timeout=DEFAULT_TIMEOUT):
+        """
+        Async version of ``set_all_tiers_many``, which uses the django cache's
+        async API.
+        """
+        if not mapping:
+            return
+        for key, value in mapping.items():
+            DEFAULT_REQUEST_CACHE.set(key, value)
+            _PROCESS_CACHE.delete(key)
+        await _django_cache_aset_many(mapping, django_cache_timeout)
+        for key in mapping:
+            await TieredCache._apublish_process_cache_invalidation(key)
 
-DEFAULT_REQUEST_CACHE = RequestCache()
+    @staticmethod
+    def delete_all_tiers(key):
+        """
+        Deletes the cached value for the provided key in the request cache, the
+        process cache and the django cache.
 
+        Args:
+            key (string)
 
-class TieredCache:
-    """
-    A two tiered caching object with a request cache backed by a django cache.
-    """
+        """
+        DEFAULT_REQUEST_CACHE.delete(key)
+        _PROCESS_CACHE.delete(key)
+        _discard_pending_writes([key])
+        django_cache.delete(key)
+        TieredCache._publish_process_cache_invalidation(key)
+
+    @staticmethod
+    async def adelete_all_tiers(key):
+        """
+        Async version of ``delete_all_tiers``, which uses the django cache's
+        async API.
+        """
+        DEFAULT_REQUEST_CACHE.delete(key)
+        _PROCESS_CACHE.delete(key)
+        _discard_pending_writes([key])
+        await django_cache.adelete(key)
+        await TieredCache._apublish_process_cache_invalidation(key)
 
     @classmethod
-    def get_cached_response(cls, key):
+    def get_namespaced_key(cls, namespace, key):
         """
-        Retrieves a CachedResponse for the provided key.
+        Returns the key to use for the provided key within a namespace.
+
+        The key includes the namespace's current generation, so that all keys
+        in the namespace can be invalidated at once with
+        ``invalidate_namespace``. The generation is fetched from the django
+        cache at most once per request for each namespace.
+
+        Example:
+            >>> key = TieredCache.get_namespaced_key(str(course_key), 'outline')
+            >>> TieredCache.set_all_tiers(key, outline, 60 * 60)
 
         Args:
+            namespace (string)
             key (string)
 
         Returns:
-            A CachedResponse with is_found status and value.
+            (string) The namespaced key.
 
         """
-        request_cached_response = DEFAULT_REQUEST_CACHE.get_cached_response(key)
-        if not request_cached_response.is_found:
-            django_cached_response = cls._get_cached_response_from_django_cache(key)
-            cls._set_request_cache_if_django_cache_hit(key, django_cached_response)
-            return django_cached_response
-
-        return request_cached_response
+        return f'{namespace}:{cls._get_namespace_generation(namespace)}:{key}'
 
     @staticmethod
-    def set_all_tiers(key, value, django_cache_timeout=DEFAULT_TIMEOUT):
+    def invalidate_namespace(namespace):
         """
-        Caches the value for the provided key in both the request cache and the
-        django cache.
+        Invalidates all keys created with ``get_namespaced_key`` for the
+        namespace, with a single increment in the django cache.
+
+        The old values are not deleted, but are left to expire.
 
         Args:
-            key (string)
-            value (object)
-            django_cache_timeout (int): (Optional) Timeout used to determine
-                if and for how long to cache in the django cache. A timeout of
-                0 will skip the django cache. If timeout is provided, use that
-                timeout for the key; otherwise use the default cache timeout.
-                (in seconds)
+            namespace (string)
 
         """
-        DEFAULT_REQUEST_CACHE.set(key, value)
-        django_cache.set(key, value, django_cache_timeout)
+        try:
+            django_cache.incr(NAMESPACE_GENERATION_KEY_PREFIX + namespace)
+        except ValueError:
+            # No generation has been set, so there are no keys to invalidate.
+            pass
+        RequestCache(NAMESPACE_GENERATION_REQUEST_CACHE_NAMESPACE).delete(namespace)
 
     @staticmethod
-    def delete_all_tiers(key):
+    def _get_namespace_generation(namespace):
         """
-        Deletes the cached value for the provided key in both the request cache and the
-        django cache.
-
-        Args:
-            key (string)
+        Returns the current generation of the namespace, initializing it if
+        needed.
 
+        New generations start from the current time in milliseconds, rather
+        than from zero, so that a generation evicted from the django cache is
+        never reused for keys that may still be cached.
         """
-        DEFAULT_REQUEST_CACHE.delete(key)
-        django_cache.delete(key)
+        request_cache = RequestCache(NAMESPACE_GENERATION_REQUEST_CACHE_NAMESPACE)
+        cached_response = request_cache.get_cached_response(namespace)
+        if cached_response.is_found:
+            return cached_response.value
+
+        generation_key = NAMESPACE_GENERATION_KEY_PREFIX + namespace
+        generation = django_cache.get(generation_key)
+        if generation is None:
+            django_cache.add(generation_key, int(time.time() * 1000), None)
+            # Another process may have initialized it first.
+            generation = django_cache.get(generation_key)
+        request_cache.set(namespace, generation)
+        return generation
 
     @staticmethod
     def dangerous_clear_all_tiers():
         """
-        This clears both the default request cache and the entire django
-        backing cache.
+        This clears the default request cache, the process cache and the entire
+        django backing cache.
 
         Important: This should probably only be called for testing purposes.
 
@@ -239,8 +1657,88 @@ class TieredCache:
 
         """
         DEFAULT_REQUEST_CACHE.clear()
+        RequestCache(NAMESPACE_GENERATION_REQUEST_CACHE_NAMESPACE).clear()
+        _WRITE_BEHIND_REQUEST_CACHE.clear()
+        _PROCESS_CACHE.clear()
         django_cache.clear()
 
+    @staticmethod
+    def flush():
+        """
+        Writes the values buffered by ``set_all_tiers(..., write_behind=True)``
+        during the current request to the django cache, with a single
+        ``set_many`` per timeout.
+
+        This is called at the end of each request by the TieredCacheMiddleware,
+        and by ``RequestCache.scope``. Call it directly when other processes
+        must be able to read the values sooner.
+        """
+        for timeout, mapping in _pop_pending_writes().items():
+            _django_cache_set_many(mapping, timeout)
+            for key in mapping:
+                TieredCache._publish_process_cache_invalidation(key)
+
+    @staticmethod
+    async def aflush():
+        """
+        Async version of ``flush``, which uses the django cache's async API.
+        """
+        for timeout, mapping in _pop_pending_writes().items():
+            await _django_cache_aset_many(mapping, timeout)
+            for key in mapping:
+                await TieredCache._apublish_process_cache_invalidation(key)
+
+    @classmethod
+    def _get_cached_responses_from_local_tiers(cls, keys):
+        """
+        Retrieves a CachedResponse for each of the given keys from the request
+        cache and the process cache, copying process cache hits into the
+        request cache.
+
+        Returns:
+            A tuple of a dict mapping each key to a CachedResponse, and a list
+            of the keys that were not found.
+
+        """
+        cached_responses = {}
+        request_cache_misses = []
+        request_cache = DEFAULT_REQUEST_CACHE.bind()
+        for key in keys:
+            cached_response = request_cache.get_cached_response(key)
+            if not cached_response.is_found:
+                cached_response = cls._get_cached_response_from_process_cache(key)
+                if cached_response.is_found:
+                    request_cache.set(key, cached_response.value)
+                else:
+                    request_cache_misses.append(key)
+            if cached_response.is_found:
+                _record_tiered_cache_hit(key)
+            cached_responses[key] = cached_response
+        return cached_responses, request_cache_misses
+
+    @classmethod
+    def _get_cached_response_from_process_cache(cls, key):
+        """
+        Retrieves a CachedResponse for the given key from the process cache.
+
+        If the request was set to force cache misses, then this will always
+        return a cache miss response.
+
+        Args:
+            key (string)
+
+        Returns:
+            A CachedResponse with is_found status and value.
+
+        """
+        if cls._should_force_django_cache_miss():
+            return _get_cache_miss_response(key)
+
+        cached_value = _PROCESS_CACHE.get(key)
+        if cached_value is _CACHE_MISS:
+            return _get_cache_miss_response(key)
+        return CachedResponse(True, key, cached_value)
+
     @staticmethod
     def _get_cached_response_from_django_cache(key):
         """
@@ -257,11 +1755,123 @@ class TieredCache:
 
         """
         if TieredCache._should_force_django_cache_miss():
-            return CachedResponse(is_found=False, key=key, value=None)
+            return _get_cache_miss_response(key)
+
+        return _get_cached_response_for_django_cache_value(key, _django_cache_get(key))
+
+    @staticmethod
+    def _wrap_django_cache_value(value, stale_after, process_cache_timeout):
+        """
+        Returns the value to store in the django cache, wrapped in an envelope
+        if it has a soft expiry or opted in to the process cache.
+        """
+        if stale_after is None and not process_cache_timeout:
+            return value
+        soft_expiry = None if stale_after is None else time.time() + stale_after
+        return _TieredCacheEnvelope(
+            value, 0, None, soft_expiry=soft_expiry, process_cache_timeout=process_cache_timeout,
+        )
+
+    @classmethod
+    def _get_value_and_set_request_cache(cls, key, cached_value):
+        """
+        Returns the value for a hit read from the django cache, and caches it
+        in the request cache (and the process cache, if it opted in).
+        """
+        django_cached_response = _get_cached_response_for_django_cache_value(key, cached_value)
+        cls._set_request_cache_if_django_cache_hit(key, django_cached_response)
+        return django_cached_response.value
+
+    @staticmethod
+    def _compute_and_set_all_tiers(key, compute_fn, django_cache_timeout):
+        """
+        Computes the value for the provided key and caches it in all tiers,
+        wrapped in an envelope recording how long the computation took.
+
+        Returns:
+            The computed value.
+
+        """
+        start = time.perf_counter()
+        value = compute_fn()
+        delta = time.perf_counter() - start
+
+        if django_cache_timeout is DEFAULT_TIMEOUT:
+            django_cache_timeout = django_cache.default_timeout
+        expiry = None if django_cache_timeout is None else time.time() + django_cache_timeout
+
+        DEFAULT_REQUEST_CACHE.set(key, value)
+        _PROCESS_CACHE.delete(key)
+        _django_cache_set(key, _TieredCacheEnvelope(value, delta, expiry), django_cache_timeout)
+        TieredCache._publish_process_cache_invalidation(key)
+        return value
+
+    @staticmethod
+    def _schedule_stale_refresh(key, compute_fn, stale_after, django_cache_timeout):
+        """
+        Schedules a background refresh of a stale value, unless a refresh of
+        the key is already pending in any process or too many refreshes are
+        already pending in this process.
+
+        Returns:
+            True if a refresh was scheduled, and False otherwise.
+
+        """
+        with _STALE_REFRESH_LOCK:
+            if key in _STALE_REFRESH_PENDING_KEYS or len(_STALE_REFRESH_PENDING_KEYS) >= STALE_REFRESH_MAX_PENDING:
+                return False
+            _STALE_REFRESH_PENDING_KEYS.add(key)
+
+        lock_key = key + STAMPEDE_LOCK_KEY_SUFFIX
+        if not django_cache.add(lock_key, True, STAMPEDE_LOCK_TIMEOUT):
+            with _STALE_REFRESH_LOCK:
+                _STALE_REFRESH_PENDING_KEYS.discard(key)
+            return False
+
+        def _refresh():
+            try:
+                # Pool threads outlive requests, so their request cache is cleared around
+                # each refresh, so that compute_fn doesn't read inputs cached by earlier ones.
+                with RequestCache.scope():
+                    value = compute_fn()
+                    envelope = _TieredCacheEnvelope(value, 0, None, soft_expiry=time.time() + stale_after)
+                    _PROCESS_CACHE.delete(key)
+                    _django_cache_set(key, envelope, django_cache_timeout)
+                    TieredCache._publish_process_cache_invalidation(key)
+            except Exception:
+                log.exception('Failed to refresh stale TieredCache value for key %s.', key)
+            finally:
+                django_cache.delete(lock_key)
+                with _STALE_REFRESH_LOCK:
+                    _STALE_REFRESH_PENDING_KEYS.discard(key)
+
+        _get_stale_refresh_executor().submit(_refresh)
+        return True
+
+    @staticmethod
+    def _get_cached_responses_from_django_cache(keys):
+        """
+        Retrieves a CachedResponse for each of the given keys from the django
+        cache, using a single ``get_many``.
+
+        If the request was set to force cache misses, then this will always
+        return cache miss responses.
+
+        Args:
+            keys (list of string)
+
+        Returns:
+            A dict mapping each key to a CachedResponse.
+
+        """
+        if TieredCache._should_force_django_cache_miss():
+            return {key: _get_cache_miss_response(key) for key in keys}
 
-        cached_value = django_cache.get(key, _CACHE_MISS)
-        is_found = cached_value is not _CACHE_MISS
-        return CachedResponse(is_found, key, cached_value)
+        cached_values = _django_cache_get_many(keys)
+        return {
+            key: _get_cached_response_for_django_cache_value(key, cached_values.get(key, _CACHE_MISS))
+            for key in keys
+        }
 
     @staticmethod
     def _set_request_cache_if_django_cache_hit(key, django_cached_response):
@@ -273,9 +1883,59 @@ class TieredCache:
             django_cached_response (CachedResponse)
 
         """
-        if django_cached_response.is_found:
+        if django_cached_response.is_negative:
+            DEFAULT_REQUEST_CACHE.set(key, _NEGATIVE_CACHE_TOMBSTONE)
+        elif django_cached_response.is_found:
             DEFAULT_REQUEST_CACHE.set(key, django_cached_response.value)
 
+    @staticmethod
+    def _publish_process_cache_invalidation(key):
+        """
+        Tells other processes to evict the key from their process cache, if a
+        TIERED_CACHE_INVALIDATION_BACKEND is configured.
+        """
+        invalidation_backend = configured_invalidation_backend()
+        if invalidation_backend is not None:
+            invalidation_backend.publish(key)
+
+    @staticmethod
+    async def _apublish_process_cache_invalidation(key):
+        """
+        Async version of ``_publish_process_cache_invalidation``.
+
+        Publishing is done in a thread, since invalidation backends are sync.
+        """
+        if configured_invalidation_backend() is not None:
+            await sync_to_async(TieredCache._publish_process_cache_invalidation, thread_sensitive=False)(key)
+
+    @staticmethod
+    def _apply_process_cache_invalidations():
+        """
+        Evicts keys invalidated by any process from this process's cache, if a
+        TIERED_CACHE_INVALIDATION_BACKEND is configured.
+
+        This is called once per request by the TieredCacheMiddleware.
+        """
+        invalidation_backend = configured_invalidation_backend()
+        if invalidation_backend is None:
+            return
+
+        invalidated_keys = invalidation_backend.get_invalidations()
+        if invalidated_keys is None:
+            _PROCESS_CACHE.clear()
+            return
+        for key in invalidated_keys:
+            _PROCESS_CACHE.delete(key)
+
+    @staticmethod
+    async def _aapply_process_cache_invalidations():
+        """
+        Async version of ``_apply_process_cache_invalidations``, which skips
+        the thread hop when no invalidation backend is configured.
+        """
+        if configured_invalidation_backend() is not None:
+            await sync_to_async(TieredCache._apply_process_cache_invalidations, thread_sensitive=False)()
+
     @staticmethod
     def _get_and_set_force_cache_miss(request):
         """
@@ -288,12 +1948,32 @@ class TieredCache:
             http://clobert.com/api/v1/resource?force_cache_miss=true
 
         """
-        if not (request.user and request.user.is_active and request.user.is_staff):
+        DEFAULT_REQUEST_CACHE.set(SHOULD_FORCE_CACHE_MISS_KEY, TieredCache._get_force_cache_miss(request))
+
+    @staticmethod
+    async def _aget_and_set_force_cache_miss(request):
+        """
+        Async version of ``_get_and_set_force_cache_miss``.
+
+        ``request.user`` may need a database query, so it is only checked in a
+        thread when the query parameter was supplied.
+        """
+        if FORCE_CACHE_MISS_PARAM not in request.GET:
             force_cache_miss = False
         else:
-            force_cache_miss = request.GET.get(FORCE_CACHE_MISS_PARAM, 'false').lower() == 'true'
+            force_cache_miss = await sync_to_async(TieredCache._get_force_cache_miss)(request)
         DEFAULT_REQUEST_CACHE.set(SHOULD_FORCE_CACHE_MISS_KEY, force_cache_miss)
 
+    @staticmethod
+    def _get_force_cache_miss(request):
+        """
+        Returns True if the request is from staff and asks to force cache
+        misses with the FORCE_CACHE_MISS_PARAM query parameter.
+        """
+        if not (request.user and request.user.is_active and request.user.is_staff):
+            return False
+        return request.GET.get(FORCE_CACHE_MISS_PARAM, 'false').lower() == 'true'
+
     @classmethod
     def _should_force_django_cache_miss(cls):
         """
@@ -301,8 +1981,7 @@ class TieredCache:
         django cache, and False otherwise.
 
         """
-        cached_response = DEFAULT_REQUEST_CACHE.get_cached_response(SHOULD_FORCE_CACHE_MISS_KEY)
-        return False if not cached_response.is_found else cached_response.value
+        return DEFAULT_REQUEST_CACHE.get(SHOULD_FORCE_CACHE_MISS_KEY, False)
 
 
 class CachedResponseError(Exception):
@@ -319,7 +1998,9 @@ class CachedResponse:
     """
     Represents a cache response including is_found status and value.
     """
-    def __init__(self, is_found, key, value):
+    __slots__ = ('key', 'is_found', 'is_stale', 'is_negative', 'value')
+
+    def __init__(self, is_found, key, value, is_stale=False):
         """
         Creates a cached response object.
 
@@ -328,11 +2009,18 @@ class CachedResponse:
                 otherwise.
             key (string): The key originally used to retrieve the value.
             value (object)
+            is_stale (bool): (Optional) True if the value was found, but is past
+                the point where it should be refreshed.
+
+        A found value that was cached with ``TieredCache.set_negative`` is
+        reported with ``is_negative`` set, and a value of None.
         """
         self.key = key
         self.is_found = is_found
+        self.is_stale = is_stale
+        self.is_negative = is_found and value is _NEGATIVE_CACHE_TOMBSTONE
         if self.is_found:
-            self.value = value
+            self.value = None if self.is_negative else value
 
     def __repr__(self):
         # Important: Do not include the cached value to help avoid any security
@@ -368,3 +2056,28 @@ class CachedResponse:
     def __ne__(self, other):
         """Overrides the default implementation (unnecessary in Python 3)"""
         return not self.__eq__(other)
+
+
+class _CachedResponseMiss(CachedResponse):
+    """
+    An immutable cache miss, which can be shared. See ``_get_cache_miss_response``.
+    """
+    __slots__ = ()
+
+    def __init__(self, key):  # pylint: disable=super-init-not-called
+        object.__setattr__(self, 'key', key)
+        object.__setattr__(self, 'is_found', False)
+        object.__setattr__(self, 'is_stale', False)
+        object.__setattr__(self, 'is_negative', False)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'Cache miss responses can not be modified, but {name!r} was set.')
+
+
+@lru_cache(maxsize=1024)
+def _get_cache_miss_response(key):
+    """
+    Returns a shared CachedResponse for a miss of the provided key, which
+    saves creating a new one for keys that are repeatedly missed.
+    """
+    return _CachedResponseMiss(key)
@@ -4,13 +4,24 @@ Monitoring utilities public api
 Does not include signals.py, which is also part of the public api.
 See README.rst for additional details.
 """
-from .internal.backends import DatadogBackend, NewRelicBackend, OpenTelemetryBackend, TelemetryBackend
+from .internal.aggregated_metrics import AggregatedMetricsBackend, aggregated_metrics_view
+from .internal.backends import (
+    DatadogBackend,
+    InMemoryBackend,
+    JsonLinesFileBackend,
+    NewRelicBackend,
+    OpenTelemetryBackend,
+    RecordedTransaction,
+    TelemetryBackend
+)
+from .internal.celery_integration import connect_celery_task_handlers, report_celery_task_attributes
 from .internal.code_owner.middleware import CodeOwnerMonitoringMiddleware
 from .internal.code_owner.utils import (
     get_code_owner_from_module,
     set_code_owner_attribute,
     set_code_owner_attribute_from_module
 )
+from .internal.deferred import get_deferred_attributes_stats
 from .internal.middleware import (
     CachedCustomMonitoringMiddleware,
     CookieMonitoringMiddleware,
@@ -24,8 +35,10 @@ from .internal.utils import (
     accumulate,
     function_trace,
     increment,
+    record_distribution,
     record_exception,
     set_custom_attribute,
+    set_custom_attributes,
     set_custom_attributes_for_course_key,
     set_monitoring_transaction_name
 )
@@ -0,0 +1,138 @@
+"""
+Benchmark of the per-request overhead of monitoring, without any monitoring
+service, by replaying synthetic requests through the MonitoringSupportMiddleware.
+
+Sample usage::
+
+    python -m edx_django_utils.monitoring.bench --requests 10000
+
+Or for more details::
+
+    python -m edx_django_utils.monitoring.bench --help
+
+"""
+import os
+import time
+
+import click
+import django
+from django.conf import settings
+
+_DEFAULT_BACKENDS = ('edx_django_utils.monitoring.InMemoryBackend',)
+
+
+@click.command()
+@click.option('--requests', 'request_count', default=1000, show_default=True, help='The number of requests to replay.')
+@click.option(
+    '--attributes', 'attribute_count', default=10, show_default=True,
+    help='The number of custom attributes each request sets.',
+)
+@click.option(
+    '--backend', 'backends', multiple=True, default=_DEFAULT_BACKENDS, show_default=True,
+    help='The dotted path of a TelemetryBackend to configure in OPENEDX_TELEMETRY. May be repeated.',
+)
+@click.option(
+    '--max-overhead', type=float, default=None,
+    help='Fail if the overhead per request with the backends is more than this many microseconds.',
+)
+def main(request_count, attribute_count, backends, max_overhead):
+    """
+    Replays synthetic requests through the RequestCacheMiddleware and the
+    MonitoringSupportMiddleware, with no telemetry backends and then with the
+    given backends, and reports the overhead per request compared to requests
+    without monitoring.
+
+    Each synthetic request sets custom attributes, accumulates, increments and
+    records a distribution, and creates a span with ``function_trace``.
+    """
+    _setup_django()
+    # pylint: disable=import-outside-toplevel
+    from django.test import RequestFactory, override_settings
+
+    from edx_django_utils.cache.middleware import RequestCacheMiddleware
+    from edx_django_utils.monitoring import MonitoringSupportMiddleware
+
+    request = RequestFactory().get('/bench/')
+    baseline = _time_requests(RequestCacheMiddleware(_uninstrumented_view), request, request_count)
+    click.echo(
+        f'Replayed {request_count} synthetic requests, each setting {attribute_count} custom attributes.'
+    )
+    click.echo(f'No monitoring: {baseline * 1e6:.1f}µs per request.')
+
+    handler = RequestCacheMiddleware(MonitoringSupportMiddleware(_get_instrumented_view(attribute_count)))
+    overhead = None
+    for backends_setting in ([], list(backends)):
+        with override_settings(OPENEDX_TELEMETRY=backends_setting):
+            duration = _time_requests(handler, request, request_count)
+        overhead = duration - baseline
+        click.echo(
+            f'{", ".join(backends_setting) or "No backends"}: {duration * 1e6:.1f}µs per request '
+            f'({overhead * 1e6:+.1f}µs).'
+        )
+
+    if max_overhead is not None and overhead * 1e6 > max_overhead:
+        raise click.ClickException(
+            f'The overhead of {overhead * 1e6:.1f}µs per request is more than {max_overhead:.1f}µs.'
+        )
+
+
+def _setup_django():
+    """
+    Sets up Django with minimal settings, unless settings are already configured.
+    """
+    if not settings.configured and 'DJANGO_SETTINGS_MODULE' not in os.environ:
+        settings.configure(
+            INSTALLED_APPS=['django.contrib.auth', 'django.contrib.contenttypes', 'waffle'],
+            ALLOWED_HOSTS=['*'],
+        )
+    django.setup()
+
+
+def _time_requests(handler, request, request_count):
+    """
+    Returns the average duration in seconds of handling the request, after a warm-up.
+    """
+    for _ in range(min(request_count, 100)):
+        handler(request)
+    start = time.perf_counter()
+    for _ in range(request_count):
+        handler(request)
+    return (time.perf_counter() - start) / request_count
+
+
+def _uninstrumented_view(request):
+    return _RESPONSE
+
+
+def _get_instrumented_view(attribute_count):
+    """
+    Returns a view that uses the monitoring utilities.
+    """
+    # pylint: disable=import-outside-toplevel
+    from edx_django_utils.monitoring import (
+        accumulate,
+        function_trace,
+        increment,
+        record_distribution,
+        set_custom_attribute
+    )
+    attribute_names = [f'bench.attribute_{index}' for index in range(attribute_count)]
+
+    def instrumented_view(request):
+        for index, attribute_name in enumerate(attribute_names):
+            set_custom_attribute(attribute_name, index)
+        accumulate('bench.accumulated', 10)
+        increment('bench.incremented')
+        record_distribution('bench.distribution', 42)
+        with function_trace('bench.span'):
+            pass
+        return _RESPONSE
+    return instrumented_view
+
+
+# Any response works for the middleware, and reusing one keeps its cost out of the benchmark.
+_RESPONSE = object()
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,370 @@
+"""
+A telemetry backend that aggregates numeric custom attributes in the process,
+by name and code owner, rather than sending them with each transaction.
+
+The aggregated metrics can be scraped in the Prometheus text format with
+``aggregated_metrics_view``, or flushed periodically to StatsD over UDP.
+"""
+import logging
+import math
+import os
+import re
+import socket
+import threading
+import time
+import weakref
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from edx_django_utils.cache import RequestCache
+
+from .backends import TelemetryBackend, configured_backends
+
+log = logging.getLogger(__name__)
+
+# Aggregates are spread over this many locks, so that threads recording
+# different metrics rarely wait for each other.
+_STRIPE_COUNT = 16
+# Bucket i of a histogram counts the values above 2**(i-1) and up to 2**i, and
+# bucket 0 counts the values up to 1. The last bucket also counts all larger values.
+_BUCKET_COUNT = 64
+_INF_BUCKET_LABEL = 'le="+Inf"'
+# Keeps StatsD packets within the usual MTU.
+_STATSD_MAX_PACKET_SIZE = 1432
+# Only exact ints and floats are aggregated, which also excludes bools.
+_NUMBER_TYPES = (int, float)
+
+_CODE_OWNER_ATTRIBUTE = 'code_owner'
+_TRANSACTIONS_COUNTER_NAME = 'code_owner.transactions'
+_CODE_OWNER_REQUEST_CACHE = RequestCache(namespace='edx_django_utils.monitoring.aggregated_metrics')
+
+_PROMETHEUS_NAME_REGEX = re.compile(r'[^a-zA-Z0-9_]')
+_STATSD_NAME_REGEX = re.compile(r'[:|@#\s]')
+_STATSD_TAG_REGEX = re.compile(r'[,|#\s]')
+
+
+class _Histogram:
+    """
+    The count, sum and power-of-two histogram of the values of a numeric
+    custom attribute, and the count and sum already flushed to StatsD.
+    """
+    __slots__ = ('count', 'sum', 'bucket_counts', 'flushed_count', 'flushed_sum')
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0
+        self.bucket_counts = [0] * _BUCKET_COUNT
+        self.flushed_count = 0
+        self.flushed_sum = 0
+
+    def record(self, value):
+        """
+        Records a value.
+        """
+        if value <= 1:
+            bucket = 0
+        else:
+            mantissa, exponent = math.frexp(value)
+            # Powers of two are the inclusive upper bound of their bucket.
+            bucket = min(exponent - 1 if mantissa == 0.5 else exponent, _BUCKET_COUNT - 1)
+        self.bucket_counts[bucket] += 1
+        self.count += 1
+        self.sum += value
+
+    def copy(self):
+        """
+        Returns a copy, for rendering without holding the lock.
+        """
+        histogram = _Histogram()
+        histogram.count = self.count
+        histogram.sum = self.sum
+        histogram.bucket_counts = list(self.bucket_counts)
+        return histogram
+
+    def get_prometheus_lines(self, name, labels):
+        """
+        Returns the lines of the histogram in the Prometheus text format.
+        """
+        lines = []
+        last_bucket = max(
+            (bucket for bucket, bucket_count in enumerate(self.bucket_counts[:-1]) if bucket_count), default=0
+        )
+        cumulative_count = 0
+        for bucket in range(last_bucket + 1):
+            cumulative_count += self.bucket_counts[bucket]
+            bucket_labels = _format_labels(*labels, f'le="{2 ** bucket}"')
+            lines.append(f'{name}_bucket{bucket_labels} {cumulative_count}')
+        lines.append(f'{name}_bucket{_format_labels(*labels, _INF_BUCKET_LABEL)} {self.count}')
+        lines.append(f'{name}_sum{_format_labels(*labels)} {self.sum!r}')
+        lines.append(f'{name}_count{_format_labels(*labels)} {self.count}')
+        return lines
+
+    def get_statsd_lines(self, name, tags):
+        """
+        Returns the StatsD lines of the count and sum recorded since the last
+        flush, and marks them as flushed.
+        """
+        count = self.count - self.flushed_count
+        if not count:
+            return []
+        total = self.sum - self.flushed_sum
+        self.flushed_count = self.count
+        self.flushed_sum = self.sum
+        return [f'{name}.count:{count}|c{tags}', f'{name}.sum:{total!r}|c{tags}']
+
+
+class _Counter:
+    """
+    The total of a counter, and the total already flushed to StatsD.
+    """
+    __slots__ = ('total', 'flushed_total')
+
+    def __init__(self):
+        self.total = 0
+        self.flushed_total = 0
+
+    def record(self, value):
+        """
+        Adds the value to the total.
+        """
+        self.total += value
+
+    def copy(self):
+        """
+        Returns a copy, for rendering without holding the lock.
+        """
+        counter = _Counter()
+        counter.total = self.total
+        return counter
+
+    def get_prometheus_lines(self, name, labels):
+        """
+        Returns the line of the counter in the Prometheus text format.
+        """
+        return [f'{name}{_format_labels(*labels)} {self.total!r}']
+
+    def get_statsd_lines(self, name, tags):
+        """
+        Returns the StatsD line of the total recorded since the last flush,
+        and marks it as flushed.
+        """
+        total = self.total - self.flushed_total
+        if not total:
+            return []
+        self.flushed_total = self.total
+        return [f'{name}:{total!r}|c{tags}']
+
+
+class _Stripe:
+    """
+    The aggregates keyed by (name, code owner) that are guarded by the same lock.
+    """
+    __slots__ = ('lock', 'aggregates')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.aggregates = {}
+
+
+class AggregatedMetricsBackend(TelemetryBackend):
+    """
+    Aggregate numeric custom attributes in the process, such as the ones
+    reported by ``accumulate`` and ``increment``, by name and code owner.
+
+    Each numeric custom attribute is recorded in a histogram, labeled with
+    the ``code_owner`` custom attribute set earlier in the same transaction,
+    if any. The ``code_owner.transactions`` counter also counts the
+    transactions of each code owner. Other custom attributes and telemetry
+    are ignored.
+
+    The metrics can be scraped with ``aggregated_metrics_view``, and are also
+    flushed to StatsD if the ``OPENEDX_TELEMETRY_STATSD_ADDRESS`` setting is set.
+    """
+    def __init__(self):
+        # .. setting_name: OPENEDX_TELEMETRY_STATSD_ADDRESS
+        # .. setting_default: None
+        # .. setting_description: The "host:port" address of a StatsD server that the
+        #   ``edx_django_utils.monitoring.AggregatedMetricsBackend`` telemetry backend flushes its
+        #   metrics to, as counters with DogStatsD-style ``code_owner`` tags. Metrics are not
+        #   flushed if this is not set.
+        statsd_address = getattr(settings, 'OPENEDX_TELEMETRY_STATSD_ADDRESS', None)
+        self._statsd_address = None
+        if statsd_address:
+            host, _, port = statsd_address.rpartition(':')
+            if not host or not port.isdigit():
+                raise ValueError('OPENEDX_TELEMETRY_STATSD_ADDRESS must be a "host:port" address.')
+            self._statsd_address = (host, int(port))
+        # .. setting_name: OPENEDX_TELEMETRY_STATSD_FLUSH_INTERVAL
+        # .. setting_default: 10
+        # .. setting_description: The number of seconds between flushes of the metrics of the
+        #   ``edx_django_utils.monitoring.AggregatedMetricsBackend`` telemetry backend to the
+        #   OPENEDX_TELEMETRY_STATSD_ADDRESS StatsD server.
+        self._flush_interval = getattr(settings, 'OPENEDX_TELEMETRY_STATSD_FLUSH_INTERVAL', 10)
+        self._stripes = tuple(_Stripe() for _ in range(_STRIPE_COUNT))
+        self._flusher_lock = threading.Lock()
+        self._flusher_pid = None
+
+    def set_attribute(self, key, value):
+        if key == _CODE_OWNER_ATTRIBUTE:
+            self._set_code_owner(value)
+        elif type(value) in _NUMBER_TYPES and math.isfinite(value):
+            self._record(key, value, _Histogram)
+
+    def set_attributes(self, attributes):
+        # The code owner labels the other attributes of the same batch.
+        code_owner = attributes.get(_CODE_OWNER_ATTRIBUTE)
+        if code_owner is not None:
+            self._set_code_owner(code_owner)
+        for key, value in attributes.items():
+            if type(value) in _NUMBER_TYPES and math.isfinite(value):
+                self._record(key, value, _Histogram)
+
+    def record_exception(self):
+        pass
+
+    def create_span(self, name):
+        return nullcontext()
+
+    def tag_root_span_with_error(self, exception):
+        pass
+
+    def set_local_root_span_name(self, name, group=None, priority=None):
+        pass
+
+    def _set_code_owner(self, code_owner):
+        """
+        Sets the code owner that labels the rest of the transaction, and
+        counts the transaction the first time its code owner is set.
+        """
+        previous_code_owner = _CODE_OWNER_REQUEST_CACHE.get(_CODE_OWNER_ATTRIBUTE)
+        _CODE_OWNER_REQUEST_CACHE.set(_CODE_OWNER_ATTRIBUTE, code_owner)
+        if previous_code_owner is None:
+            self._record(_TRANSACTIONS_COUNTER_NAME, 1, _Counter)
+
+    def _record(self, name, value, aggregate_class):
+        """
+        Records the value in the aggregate of the name and the current code owner.
+        """
+        if self._statsd_address is not None and self._flusher_pid != os.getpid():
+            self._start_flusher()
+        key = (name, _CODE_OWNER_REQUEST_CACHE.get(_CODE_OWNER_ATTRIBUTE))
+        stripe = self._stripes[hash(key) % _STRIPE_COUNT]
+        with stripe.lock:
+            aggregate = stripe.aggregates.get(key)
+            if aggregate is None:
+                aggregate = stripe.aggregates[key] = aggregate_class()
+            aggregate.record(value)
+
+    def get_prometheus_text(self):
+        """
+        Returns the metrics in the Prometheus text exposition format.
+        """
+        metrics = {}
+        for stripe in self._stripes:
+            with stripe.lock:
+                aggregates = [(key, aggregate.copy()) for key, aggregate in stripe.aggregates.items()]
+            for (name, code_owner), aggregate in aggregates:
+                metric_name = _PROMETHEUS_NAME_REGEX.sub('_', name)
+                if metric_name[:1].isdigit():
+                    metric_name = f'_{metric_name}'
+                if isinstance(aggregate, _Counter):
+                    metric_name = f'{metric_name}_total'
+                metrics.setdefault(metric_name, []).append((code_owner or '', aggregate))
+
+        lines = []
+        for metric_name, series in sorted(metrics.items()):
+            metric_type = 'counter' if isinstance(series[0][1], _Counter) else 'histogram'
+            lines.append(f'# TYPE {metric_name} {metric_type}')
+            for code_owner, aggregate in sorted(series, key=lambda item: item[0]):
+                labels = [f'code_owner="{_escape_label_value(code_owner)}"'] if code_owner else []
+                lines.extend(aggregate.get_prometheus_lines(metric_name, labels))
+        return ''.join(f'{line}\n' for line in lines)
+
+    def flush_statsd(self):
+        """
+        Sends the counts and sums recorded since the last flush to the
+        OPENEDX_TELEMETRY_STATSD_ADDRESS StatsD server.
+        """
+        if self._statsd_address is None:
+            return
+        lines = []
+        for stripe in self._stripes:
+            with stripe.lock:
+                for (name, code_owner), aggregate in stripe.aggregates.items():
+                    tags = f'|#code_owner:{_STATSD_TAG_REGEX.sub("_", code_owner)}' if code_owner else ''
+                    lines.extend(aggregate.get_statsd_lines(_STATSD_NAME_REGEX.sub('_', name), tags))
+        if not lines:
+            return
+
+        family, _, _, _, address = socket.getaddrinfo(*self._statsd_address, type=socket.SOCK_DGRAM)[0]
+        with socket.socket(family, socket.SOCK_DGRAM) as statsd_socket:
+            packet_lines = []
+            packet_size = 0
+            for line in lines:
+                if packet_lines and packet_size + len(line) > _STATSD_MAX_PACKET_SIZE:
+                    statsd_socket.sendto('\n'.join(packet_lines).encode('utf-8'), address)
+                    packet_lines = []
+                    packet_size = 0
+                packet_lines.append(line)
+                packet_size += len(line) + 1
+            statsd_socket.sendto('\n'.join(packet_lines).encode('utf-8'), address)
+
+    def _start_flusher(self):
+        """
+        Starts the thread that flushes to StatsD, the first time a value is
+        recorded in this process, since threads do not survive a fork.
+        """
+        with self._flusher_lock:
+            pid = os.getpid()
+            if self._flusher_pid == pid:
+                return
+            if self._flusher_pid is not None:
+                # The aggregates were copied from the parent process, which flushes them itself.
+                for stripe in self._stripes:
+                    stripe.aggregates = {}
+            self._flusher_pid = pid
+            threading.Thread(
+                target=self._run_flusher, args=(weakref.ref(self), self._flush_interval),
+                name='edx-django-utils-statsd-flush', daemon=True,
+            ).start()
+
+    @staticmethod
+    def _run_flusher(backend_ref, flush_interval):
+        """
+        Flushes to StatsD every flush interval, until the backend is no longer
+        referenced, such as after the settings change in tests.
+        """
+        while True:
+            time.sleep(flush_interval)
+            backend = backend_ref()
+            if backend is None:
+                return
+            try:
+                backend.flush_statsd()
+            except Exception:
+                log.exception('Unable to flush aggregated metrics to StatsD.')
+            del backend
+
+
+def _escape_label_value(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format_labels(*labels):
+    return f'{{{",".join(labels)}}}' if labels else ''
+
+
+def aggregated_metrics_view(request):
+    """
+    Django view that returns the metrics of the AggregatedMetricsBackend
+    configured in OPENEDX_TELEMETRY, in the Prometheus text exposition format.
+
+    The metrics are those of the process that handles the request, so with
+    multiple server processes, flushing to StatsD is a better fit.
+    """
+    for backend in configured_backends():
+        if isinstance(backend, AggregatedMetricsBackend):
+            return HttpResponse(backend.get_prometheus_text(), content_type='text/plain; version=0.0.4; charset=utf-8')
+    raise Http404('The AggregatedMetricsBackend is not configured in OPENEDX_TELEMETRY.')
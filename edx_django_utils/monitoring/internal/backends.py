@@ -5,16 +5,23 @@ Only a certain subset of the monitoring functions have been made
 configurable via this module.
 """
 
+import json
 import logging
 import sys
+import threading
+import time
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from functools import lru_cache
+from uuid import uuid4
 
 from django.conf import settings
 from django.dispatch import receiver
 from django.test.signals import setting_changed
 from django.utils.module_loading import import_string
 
+from edx_django_utils.cache import RequestCache
+
 log = logging.getLogger(__name__)
 
 # The newrelic package used to not be part of the requirements files
@@ -36,6 +43,12 @@ class TelemetryBackend(ABC):
     """
     Base class for telemetry sinks.
     """
+    # Whether the backend can report attributes without needing the active
+    # span or transaction, like a log-based sink, so that
+    # ``set_deferred_attributes`` can be called from a background thread. See
+    # MONITORING_DEFERRED_ATTRIBUTES_ENABLED.
+    supports_deferred_attributes = False
+
     @abstractmethod
     def set_attribute(self, key, value):
         """
@@ -44,6 +57,37 @@ class TelemetryBackend(ABC):
         the backend.
         """
 
+    def set_attributes(self, attributes):
+        """
+        Set several key-value attributes, given as a dict, in the same way as
+        ``set_attribute``.
+
+        Backends should override this with their agent's batch API, if it has
+        one, so that a batch costs one agent call rather than one per attribute.
+        """
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def get_deferred_attributes_context(self):
+        """
+        Returns whatever identifies the current transaction, like its id or
+        its trace and span ids, for ``set_deferred_attributes``.
+
+        This is called by the request thread, when a batch of attributes is
+        deferred, since the background thread has no current transaction.
+        """
+        return None
+
+    def set_deferred_attributes(self, attributes, context):  # pylint: disable=unused-argument
+        """
+        Set several key-value attributes, given as a dict, on the transaction
+        identified by ``context``, from ``get_deferred_attributes_context``.
+
+        This is called from a background thread, for backends that set
+        ``supports_deferred_attributes``.
+        """
+        self.set_attributes(attributes)
+
     @abstractmethod
     def record_exception(self):
         """
@@ -95,6 +139,9 @@ class NewRelicBackend(TelemetryBackend):
         # through a new, more specific TelemetryBackend method.
         newrelic.agent.add_custom_attribute(key, value)
 
+    def set_attributes(self, attributes):
+        newrelic.agent.add_custom_attributes(attributes.items())
+
     def record_exception(self):
         newrelic.agent.notice_error()
 
@@ -130,6 +177,9 @@ class OpenTelemetryBackend(TelemetryBackend):
         # span in the process.
         self.otel_trace.get_current_span().set_attribute(key, value)
 
+    def set_attributes(self, attributes):
+        self.otel_trace.get_current_span().set_attributes(attributes)
+
     def record_exception(self):
         self.otel_trace.get_current_span().record_exception(sys.exc_info()[1])
 
@@ -162,6 +212,10 @@ class DatadogBackend(TelemetryBackend):
         if root_span := self.dd_tracer.current_root_span():
             root_span.set_tag(key, value)
 
+    def set_attributes(self, attributes):
+        if root_span := self.dd_tracer.current_root_span():
+            root_span.set_tags(attributes)
+
     def record_exception(self):
         if span := self.dd_tracer.current_span():
             span.set_traceback()
@@ -179,6 +233,174 @@ class DatadogBackend(TelemetryBackend):
         local_root_span.resource = name
 
 
+_LOCAL_TRANSACTION_REQUEST_CACHE = RequestCache(namespace='edx_django_utils.monitoring.local_transaction')
+_LOCAL_TRANSACTION_ID_KEY = 'transaction_id'
+
+
+def _get_local_transaction_id():
+    """
+    Returns the id of the current transaction for the local backends. A
+    transaction lasts until the request cache is cleared, which the
+    RequestCacheMiddleware does for each request.
+    """
+    transaction_id = _LOCAL_TRANSACTION_REQUEST_CACHE.get(_LOCAL_TRANSACTION_ID_KEY)
+    if transaction_id is None:
+        transaction_id = uuid4().hex
+        _LOCAL_TRANSACTION_REQUEST_CACHE.set(_LOCAL_TRANSACTION_ID_KEY, transaction_id)
+    return transaction_id
+
+
+class RecordedTransaction:
+    """
+    The telemetry recorded by the ``InMemoryBackend`` for a transaction.
+
+    Attributes:
+        transaction_id (str): The id of the transaction.
+        name (str): The name set with ``set_monitoring_transaction_name``, or None.
+        attributes (dict): The custom attributes.
+        spans (list): A (name, duration in seconds) tuple for each span
+            created with ``function_trace``, in the order they ended.
+        exceptions (list): The exceptions recorded with ``record_exception``.
+        error (Exception): The exception the root span was tagged with, or None.
+
+    """
+    __slots__ = ('transaction_id', 'name', 'attributes', 'spans', 'exceptions', 'error')
+
+    def __init__(self, transaction_id):
+        self.transaction_id = transaction_id
+        self.name = None
+        self.attributes = {}
+        self.spans = []
+        self.exceptions = []
+        self.error = None
+
+
+class InMemoryBackend(TelemetryBackend):
+    """
+    Record telemetry in memory, by transaction, for tests and benchmarks.
+
+    Transactions are kept until ``clear`` is called, so this backend should
+    not be used by long-running processes.
+    """
+    def __init__(self):
+        self._transactions = {}
+
+    @property
+    def transactions(self):
+        """
+        The list of RecordedTransactions, in the order they started.
+        """
+        return list(self._transactions.values())
+
+    @property
+    def current_transaction(self):
+        """
+        The RecordedTransaction of the current transaction.
+        """
+        transaction_id = _get_local_transaction_id()
+        transaction = self._transactions.get(transaction_id)
+        if transaction is None:
+            transaction = self._transactions.setdefault(transaction_id, RecordedTransaction(transaction_id))
+        return transaction
+
+    def clear(self):
+        """
+        Forgets all recorded transactions.
+        """
+        self._transactions.clear()
+
+    def set_attribute(self, key, value):
+        self.current_transaction.attributes[key] = value
+
+    def set_attributes(self, attributes):
+        self.current_transaction.attributes.update(attributes)
+
+    def record_exception(self):
+        self.current_transaction.exceptions.append(sys.exc_info()[1])
+
+    @contextmanager
+    def create_span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.current_transaction.spans.append((name, time.perf_counter() - start))
+
+    def tag_root_span_with_error(self, exception):
+        self.current_transaction.error = exception
+
+    def set_local_root_span_name(self, name, group=None, priority=None):
+        self.current_transaction.name = name
+
+
+class JsonLinesFileBackend(TelemetryBackend):
+    """
+    Write telemetry to a file as JSON lines, one per event, for benchmarks and
+    local debugging without a monitoring service.
+
+    Each line has the ``transaction`` id and the ``type`` of the event, which is
+    one of ``attributes``, ``exception``, ``span``, ``error`` or ``name``.
+
+    Attributes can be written from a background thread, with
+    MONITORING_DEFERRED_ATTRIBUTES_ENABLED.
+    """
+    supports_deferred_attributes = True
+
+    def __init__(self):
+        # .. setting_name: OPENEDX_TELEMETRY_JSON_LINES_FILE
+        # .. setting_default: None
+        # .. setting_description: The path of the file that the
+        #   ``edx_django_utils.monitoring.JsonLinesFileBackend`` telemetry backend appends to.
+        #   The backend can't be used unless this is set.
+        path = getattr(settings, 'OPENEDX_TELEMETRY_JSON_LINES_FILE', None)
+        if not path:
+            raise Exception(
+                "Could not load JSON lines file monitoring backend; OPENEDX_TELEMETRY_JSON_LINES_FILE not set."
+            )
+        self._file = open(path, 'a', encoding='utf-8')  # pylint: disable=consider-using-with
+        self._lock = threading.Lock()
+
+    def _write(self, event_type, transaction_id=None, **event):
+        """
+        Writes an event for the transaction, which defaults to the current one.
+        """
+        line = json.dumps(
+            {'transaction': transaction_id or _get_local_transaction_id(), 'type': event_type, **event}, default=repr,
+        )
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def set_attribute(self, key, value):
+        self._write('attributes', attributes={key: value})
+
+    def set_attributes(self, attributes):
+        self._write('attributes', attributes=dict(attributes))
+
+    def get_deferred_attributes_context(self):
+        return _get_local_transaction_id()
+
+    def set_deferred_attributes(self, attributes, context):
+        self._write('attributes', transaction_id=context, attributes=dict(attributes))
+
+    def record_exception(self):
+        self._write('exception', exception=repr(sys.exc_info()[1]))
+
+    @contextmanager
+    def create_span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._write('span', name=name, duration=time.perf_counter() - start)
+
+    def tag_root_span_with_error(self, exception):
+        self._write('error', exception=repr(exception))
+
+    def set_local_root_span_name(self, name, group=None, priority=None):
+        self._write('name', name=name)
+
+
 # We're using an lru_cache instead of assigning the result to a variable on
 # module load. With the default settings (pointing to a TelemetryBackend
 # in this very module), this function can't be successfully called until
@@ -223,7 +445,60 @@ def configured_backends():
     return backends
 
 
+@lru_cache
+def configured_backend_methods(method_name):
+    """
+    Returns a tuple of the bound ``method_name`` methods of the configured
+    backends, so that callers don't look up the method on each backend for
+    every call.
+    """
+    return tuple(getattr(backend, method_name) for backend in configured_backends())
+
+
+def _ignore_attribute(key, value):  # pylint: disable=unused-argument
+    """
+    Sets an attribute when no backends are configured.
+    """
+
+
+@lru_cache
+def configured_set_attribute():
+    """
+    Returns a function that sets an attribute on all configured backends.
+
+    The function is built once from ``configured_backends``. With no backends,
+    it does nothing, and with a single backend, it is that backend's
+    ``set_attribute``. Up to the three built-in backends, the calls are
+    unrolled, so that setting an attribute doesn't loop over the backends.
+    """
+    set_attribute_methods = configured_backend_methods('set_attribute')
+    if not set_attribute_methods:
+        return _ignore_attribute
+    if len(set_attribute_methods) == 1:
+        return set_attribute_methods[0]
+    if len(set_attribute_methods) == 2:
+        first, second = set_attribute_methods
+
+        def set_attribute(key, value):
+            first(key, value)
+            second(key, value)
+    elif len(set_attribute_methods) == 3:
+        first, second, third = set_attribute_methods
+
+        def set_attribute(key, value):
+            first(key, value)
+            second(key, value)
+            third(key, value)
+    else:
+        def set_attribute(key, value):
+            for set_attribute_method in set_attribute_methods:
+                set_attribute_method(key, value)
+    return set_attribute
+
+
 @receiver(setting_changed)
 def _reset_state(sender, **kwargs):  # pylint: disable=unused-argument
     """Reset caches when settings change during unit tests."""
     configured_backends.cache_clear()
+    configured_backend_methods.cache_clear()
+    configured_set_attribute.cache_clear()
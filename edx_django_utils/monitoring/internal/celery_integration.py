@@ -0,0 +1,117 @@
+"""
+Celery task-boundary integration for the RequestCache and custom attributes.
+
+Celery tasks do not run middleware, so without these handlers the request
+cache is shared by all tasks run on a worker thread, and attributes collected
+with ``accumulate`` and ``increment`` are never reported.
+"""
+from functools import wraps
+
+from edx_django_utils.cache import RequestCache, TieredCache
+
+from .middleware import MonitoringSupportMiddleware
+
+try:
+    from celery import current_task as celery_current_task
+    from celery import signals as celery_signals
+except ImportError:  # pragma: no cover
+    celery_current_task = None
+    celery_signals = None
+
+_DISPATCH_UID_PREFIX = 'edx_django_utils.monitoring.celery_integration'
+
+
+def connect_celery_task_handlers():
+    """
+    Connects Celery signal handlers that clear the request cache before each
+    task, and report any accumulated custom attributes and clear the request
+    cache again after each task, like the RequestCacheMiddleware and the
+    MonitoringSupportMiddleware do for requests.
+
+    Call this once when the Celery app is configured, for example in the
+    module that defines it. Connecting more than once has no further effect.
+
+    Tasks that run eagerly, like with ``apply()`` or ``CELERY_ALWAYS_EAGER``,
+    run within the caller, such as a request, so they are not handled, and
+    share the caller's request cache and custom attributes.
+
+    Backends like the NewRelicBackend end the task's transaction before
+    ``task_postrun`` is sent, so also decorate tasks with
+    ``report_celery_task_attributes`` to report their attributes in time.
+    """
+    if celery_signals is None:
+        raise Exception("Could not connect Celery task handlers; package not present.")
+
+    celery_signals.task_prerun.connect(
+        _handle_task_prerun, weak=False, dispatch_uid=f'{_DISPATCH_UID_PREFIX}.task_prerun'
+    )
+    celery_signals.task_postrun.connect(
+        _handle_task_postrun, weak=False, dispatch_uid=f'{_DISPATCH_UID_PREFIX}.task_postrun'
+    )
+
+
+def report_celery_task_attributes(wrapped_function):
+    """
+    Decorator to report the custom attributes accumulated by a Celery task
+    when it ends, within the task's transaction.
+
+    New Relic instruments the task function itself, so its transaction has
+    already ended when ``task_postrun`` is sent (see
+    docs/decisions/0003-code-owner-for-celery-tasks.rst). The attributes are
+    only reported once, so ``task_postrun`` then only clears the request
+    cache. This must be used with ``connect_celery_task_handlers``.
+
+    Usage::
+
+        @task()
+        @report_celery_task_attributes
+        def example_task():
+            ...
+
+    """
+    @wraps(wrapped_function)
+    def new_function(*args, **kwargs):
+        # A proxy of no task is falsy.
+        if _is_eager_task(celery_current_task or None):
+            return wrapped_function(*args, **kwargs)
+        try:
+            return wrapped_function(*args, **kwargs)
+        finally:
+            TieredCache.flush()
+            MonitoringSupportMiddleware._batch_report()  # pylint: disable=protected-access
+    return new_function
+
+
+def _is_eager_task(task):
+    """
+    Returns whether the task runs eagerly, within its caller.
+    """
+    return task is not None and bool(task.request.is_eager)
+
+
+def _handle_task_prerun(task=None, **kwargs):
+    """
+    Flushes any buffered TieredCache writes, and clears the request cache
+    before a task runs.
+    """
+    if _is_eager_task(task):
+        return
+    try:
+        TieredCache.flush()
+    finally:
+        RequestCache.clear_all_namespaces()
+
+
+def _handle_task_postrun(task=None, **kwargs):
+    """
+    Flushes TieredCache writes buffered by a task, reports the custom
+    attributes it accumulated, whether or not it succeeded, and clears the
+    request cache.
+    """
+    if _is_eager_task(task):
+        return
+    try:
+        TieredCache.flush()
+        MonitoringSupportMiddleware._batch_report()  # pylint: disable=protected-access
+    finally:
+        RequestCache.clear_all_namespaces()
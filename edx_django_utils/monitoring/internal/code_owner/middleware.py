@@ -6,12 +6,12 @@ import logging
 from django.urls import resolve
 from django.urls.exceptions import Resolver404
 
-from ..utils import set_custom_attribute
+from ..utils import set_custom_attribute, set_custom_attributes
 from .utils import (
     _get_catch_all_code_owner,
+    _get_code_owner_custom_attributes,
     get_code_owner_from_module,
-    is_code_owner_mappings_configured,
-    set_code_owner_custom_attributes
+    is_code_owner_mappings_configured
 )
 
 try:
@@ -86,24 +86,30 @@ class CodeOwnerMonitoringMiddleware:
     def _set_code_owner_attribute(self, request):
         """
         Sets the code_owner custom attribute for the request.
+
+        The custom attributes are collected and set together.
         """
+        attributes = {}
         code_owner = None
-        module = self._get_module_from_request(request)
+        module = self._get_module_from_request(request, attributes)
         if module:
             code_owner = get_code_owner_from_module(module)
         if not code_owner:
             code_owner = _get_catch_all_code_owner()
 
         if code_owner:
-            set_code_owner_custom_attributes(code_owner)
+            attributes.update(_get_code_owner_custom_attributes(code_owner))
+        if attributes:
+            set_custom_attributes(attributes)
 
-    def _get_module_from_request(self, request):
+    def _get_module_from_request(self, request, attributes):
         """
         Get the module from the request path or the current transaction.
 
         Side-effects:
-            Sets code_owner_module custom attribute, used to determine code_owner.
-            If module was not found, may set code_owner_path_error and/or
+            Adds the code_owner_module custom attribute to attributes, used to
+                determine code_owner.
+            If module was not found, may add code_owner_path_error and/or
                 code_owner_transaction_error custom attributes if applicable.
 
         Returns:
@@ -115,19 +121,19 @@ class CodeOwnerMonitoringMiddleware:
 
         module, path_error = self._get_module_from_request_path(request)
         if module:
-            set_custom_attribute('code_owner_module', module)
+            attributes['code_owner_module'] = module
             return module
 
-        module, transaction_error = self._get_module_from_current_transaction()
+        module, transaction_error = self._get_module_from_current_transaction(attributes)
         if module:
-            set_custom_attribute('code_owner_module', module)
+            attributes['code_owner_module'] = module
             return module
 
         # monitor errors if module was not found
         if path_error:
-            set_custom_attribute('code_owner_path_error', path_error)
+            attributes['code_owner_path_error'] = path_error
         if transaction_error:
-            set_custom_attribute('code_owner_transaction_error', transaction_error)
+            attributes['code_owner_transaction_error'] = transaction_error
         return None
 
     def _get_module_from_request_path(self, request):
@@ -150,12 +156,12 @@ class CodeOwnerMonitoringMiddleware:
             set_custom_attribute('deprecated_broad_except__get_module_from_request_path', e.__class__)
             return None, str(e)
 
-    def _get_module_from_current_transaction(self):
+    def _get_module_from_current_transaction(self, attributes):
         """
         Uses the current transaction to get the module.
 
         Side-effects:
-            Sets code_owner_transaction_name custom attribute, used to determine code_owner
+            Adds the code_owner_transaction_name custom attribute to attributes, used to determine code_owner
 
         Returns:
             (str, str): (module, error_message), where at least one of these should be None
@@ -167,7 +173,7 @@ class CodeOwnerMonitoringMiddleware:
             if not transaction_name:
                 return None, 'No current transaction name found.'
             module = transaction_name.split(':')[0]
-            set_custom_attribute('code_owner_transaction_name', transaction_name)
+            attributes['code_owner_transaction_name'] = transaction_name
             return module, None
         except Exception as e:
             # will remove broad exceptions after ensuring all proper cases are covered
@@ -7,7 +7,7 @@ from functools import wraps
 
 from django.conf import settings
 
-from ..utils import set_custom_attribute
+from ..utils import set_custom_attribute, set_custom_attributes
 
 log = logging.getLogger(__name__)
 
@@ -144,13 +144,14 @@ def set_code_owner_attribute_from_module(module):
         set_code_owner_attribute_from_module(__name__)
 
     """
-    set_custom_attribute('code_owner_module', module)
+    attributes = {'code_owner_module': module}
     code_owner = get_code_owner_from_module(module)
     if not code_owner:
         code_owner = _get_catch_all_code_owner()
 
     if code_owner:
-        set_code_owner_custom_attributes(code_owner)
+        attributes.update(_get_code_owner_custom_attributes(code_owner))
+    set_custom_attributes(attributes)
 
 
 def set_code_owner_custom_attributes(code_owner):
@@ -159,13 +160,22 @@ def set_code_owner_custom_attributes(code_owner):
     """
     if not code_owner:  # pragma: no cover
         return
-    set_custom_attribute('code_owner', code_owner)
+    set_custom_attributes(_get_code_owner_custom_attributes(code_owner))
+
+
+def _get_code_owner_custom_attributes(code_owner):
+    """
+    Returns a dict of the code_owner, code_owner_theme, and code_owner_squad
+    custom attributes for the code_owner, for setting with other attributes.
+    """
+    attributes = {'code_owner': code_owner}
     theme = _get_theme_from_code_owner(code_owner)
     if theme:
-        set_custom_attribute('code_owner_theme', theme)
+        attributes['code_owner_theme'] = theme
     squad = _get_squad_from_code_owner(code_owner)
     if squad:
-        set_custom_attribute('code_owner_squad', squad)
+        attributes['code_owner_squad'] = squad
+    return attributes
 
 
 def set_code_owner_attribute(wrapped_function):
@@ -0,0 +1,163 @@
+"""
+Deferred reporting of the custom attributes batch reported at the end of each
+request, from a background thread rather than the request thread.
+
+Only backends that report attributes detached from the active span, like a
+log-based sink or an exporter of events, can be deferred. All other backends
+are still sent the batch inline, by the request thread.
+"""
+import logging
+import os
+import queue
+import threading
+from functools import lru_cache
+from types import MappingProxyType
+
+from django.conf import settings
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+
+from .backends import configured_backends
+
+log = logging.getLogger(__name__)
+
+
+class _DeferredAttributesReporter:
+    """
+    Reports batches of custom attributes from a bounded queue on a background
+    thread. When the queue is full, batches are dropped and counted, rather
+    than slowing down the request thread.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue = None
+        self._pid = None
+        self._dropped_count = 0
+
+    def submit(self, backends, attributes):
+        """
+        Queues an immutable snapshot of the attributes for the backends, with
+        the context of the current transaction for each backend, or drops it
+        if the queue is full.
+        """
+        batch_queue = self._queue
+        if batch_queue is None or self._pid != os.getpid():
+            batch_queue = self._start()
+        # The context is captured now, since the worker thread has no current transaction.
+        contexts = tuple((backend, backend.get_deferred_attributes_context()) for backend in backends)
+        try:
+            batch_queue.put_nowait((contexts, MappingProxyType(dict(attributes))))
+        except queue.Full:
+            with self._lock:
+                self._dropped_count += 1
+
+    def get_stats(self):
+        """
+        Returns a dict of the number of batches waiting to be reported, and
+        the number of batches dropped because the queue was full.
+        """
+        return {
+            'backlog': self._queue.qsize() if self._queue is not None else 0,
+            'dropped': self._dropped_count,
+        }
+
+    def join(self):
+        """
+        Waits until all queued batches have been reported.
+        """
+        if self._queue is not None:
+            self._queue.join()
+
+    def _start(self):
+        """
+        Starts the worker thread, the first time a batch is submitted in this
+        process, since threads do not survive a fork.
+        """
+        with self._lock:
+            if self._queue is None or self._pid != os.getpid():
+                # .. setting_name: MONITORING_DEFERRED_ATTRIBUTES_MAX_BACKLOG
+                # .. setting_default: 1000
+                # .. setting_description: The maximum number of batches of custom attributes waiting to be
+                #   reported by the background thread, when MONITORING_DEFERRED_ATTRIBUTES_ENABLED is enabled.
+                #   Further batches are dropped, and counted by ``get_deferred_attributes_stats``.
+                max_backlog = getattr(settings, 'MONITORING_DEFERRED_ATTRIBUTES_MAX_BACKLOG', 1000)
+                batch_queue = queue.Queue(maxsize=max_backlog)
+                threading.Thread(
+                    target=self._run, args=(batch_queue,), name='edx-django-utils-deferred-telemetry', daemon=True
+                ).start()
+                self._queue = batch_queue
+                self._pid = os.getpid()
+            return self._queue
+
+    @staticmethod
+    def _run(batch_queue):
+        """
+        Reports the queued batches, forever.
+        """
+        while True:
+            contexts, attributes = batch_queue.get()
+            for backend, context in contexts:
+                try:
+                    backend.set_deferred_attributes(attributes, context)
+                except Exception:
+                    log.exception('Unable to report deferred custom attributes.')
+            batch_queue.task_done()
+
+
+_DEFERRED_ATTRIBUTES_REPORTER = _DeferredAttributesReporter()
+
+
+@lru_cache
+def configured_set_attributes_methods():
+    """
+    Returns a tuple of the ``set_attributes`` methods of the configured
+    backends that must be called inline, by the request thread, and a tuple
+    of the backends that are deferred to the background thread.
+    """
+    # .. toggle_name: MONITORING_DEFERRED_ATTRIBUTES_ENABLED
+    # .. toggle_implementation: DjangoSetting
+    # .. toggle_default: False
+    # .. toggle_description: Enables reporting the custom attributes collected during a request, at the end of
+    #   the request, from a background thread, for the OPENEDX_TELEMETRY backends that support it (see
+    #   ``TelemetryBackend.supports_deferred_attributes``). Other backends are still sent the attributes by the
+    #   request thread.
+    # .. toggle_use_cases: opt_in
+    # .. toggle_creation_date: 2026-10-16
+    is_deferred_enabled = getattr(settings, 'MONITORING_DEFERRED_ATTRIBUTES_ENABLED', False)
+    inline_methods = []
+    deferred_backends = []
+    for backend in configured_backends():
+        if is_deferred_enabled and backend.supports_deferred_attributes:
+            deferred_backends.append(backend)
+        else:
+            inline_methods.append(backend.set_attributes)
+    return tuple(inline_methods), tuple(deferred_backends)
+
+
+def report_attributes(attributes):
+    """
+    Sends the attributes to the backends that must be sent them inline, and
+    queues them for the backends that support deferred attributes.
+    """
+    if not attributes:
+        return
+    inline_methods, deferred_backends = configured_set_attributes_methods()
+    for set_attributes_method in inline_methods:
+        set_attributes_method(attributes)
+    if deferred_backends:
+        _DEFERRED_ATTRIBUTES_REPORTER.submit(deferred_backends, attributes)
+
+
+def get_deferred_attributes_stats():
+    """
+    Returns a dict of the number of batches of custom attributes waiting to be
+    reported by the background thread (``backlog``), and the number of batches
+    dropped since the process started because too many were waiting (``dropped``).
+    """
+    return _DEFERRED_ATTRIBUTES_REPORTER.get_stats()
+
+
+@receiver(setting_changed)
+def _reset_state(sender, **kwargs):  # pylint: disable=unused-argument
+    """Reset caches when settings change during unit tests."""
+    configured_set_attributes_methods.cache_clear()
@@ -19,7 +19,7 @@ from django.conf import settings
 from django.core.exceptions import MiddlewareNotUsed
 from django.utils.deprecation import MiddlewareMixin
 
-from edx_django_utils.cache import RequestCache
+from edx_django_utils.cache import RequestCache, get_cache_custom_attributes
 from edx_django_utils.logging import encrypt_for_log
 from edx_django_utils.monitoring.signals import (
     monitoring_support_process_exception,
@@ -27,13 +27,24 @@ from edx_django_utils.monitoring.signals import (
     monitoring_support_process_response
 )
 
-from .backends import configured_backends
+from .backends import configured_backend_methods, configured_backends
+from .deferred import report_attributes
+from .sampling import configured_sampled_set_attribute, sample_custom_attributes
 
 log = logging.getLogger(__name__)
 
 
 _DEFAULT_NAMESPACE = 'edx_django_utils.monitoring'
 _REQUEST_CACHE_NAMESPACE = f'{_DEFAULT_NAMESPACE}.custom_attributes'
+_ATTRIBUTES_REQUEST_CACHE = RequestCache(namespace=_REQUEST_CACHE_NAMESPACE)
+# Records whether the custom attributes were already reported for the request.
+_BATCH_REPORT_REQUEST_CACHE = RequestCache(namespace=f'{_DEFAULT_NAMESPACE}.batch_report')
+_BATCH_REPORTED_KEY = 'reported'
+
+# Distributions count their values in buckets with power-of-two upper bounds,
+# from 1 up to 2**(_DISTRIBUTION_BUCKET_COUNT - 1).
+_DISTRIBUTION_BUCKET_COUNT = 64
+_DISTRIBUTION_PERCENTILES = (50, 95, 99)
 
 _HTML_HEAD_REGEX = br"<\/head\s*>"
 _HTML_BODY_REGEX = br"<body\b[^>]*>"
@@ -75,6 +86,104 @@ class DeploymentMonitoringMiddleware:
         _set_custom_attribute('python_version', platform.python_version())
 
 
+class _Distribution:
+    """
+    The count, sum, min, max and histogram of the values of a distribution
+    custom attribute, recorded during a request.
+
+    Recording a value only updates the preallocated bucket counts of the
+    histogram, so that values can be recorded in hot code.
+    """
+    __slots__ = ('count', 'sum', 'min', 'max', 'bucket_counts')
+
+    def __init__(self, value):
+        self.count = 0
+        self.sum = 0
+        self.min = value
+        self.max = value
+        self.bucket_counts = [0] * _DISTRIBUTION_BUCKET_COUNT
+        self.record(value)
+
+    def record(self, value):
+        """
+        Records a value. Raises TypeError for non-numbers, before changing anything.
+        """
+        if value < self.min:
+            self.min = value
+        elif value > self.max:
+            self.max = value
+        # For values of at least 1, frexp returns the exponent e, where 2**(e-1) <= value < 2**e.
+        bucket = math.frexp(value)[1] if value >= 1 else 0
+        if bucket >= _DISTRIBUTION_BUCKET_COUNT:
+            bucket = _DISTRIBUTION_BUCKET_COUNT - 1
+        self.bucket_counts[bucket] += 1
+        self.count += 1
+        self.sum += value
+
+    def get_percentile(self, percentile):
+        """
+        Returns an estimate of the percentile, which is the upper bound of the
+        bucket that contains it, limited to the min and max.
+        """
+        rank = math.ceil(self.count * percentile / 100)
+        cumulative_count = 0
+        for bucket, bucket_count in enumerate(self.bucket_counts):
+            cumulative_count += bucket_count
+            if cumulative_count >= rank:
+                return max(self.min, min(2 ** bucket, self.max))
+        return self.max  # pragma: no cover
+
+    def get_custom_attributes(self, name):
+        """
+        Returns the custom attributes to report for the distribution with the given name.
+        """
+        attributes = {
+            f'{name}.count': self.count,
+            f'{name}.sum': self.sum,
+            f'{name}.min': self.min,
+            f'{name}.max': self.max,
+        }
+        for percentile in _DISTRIBUTION_PERCENTILES:
+            attributes[f'{name}.p{percentile}'] = self.get_percentile(percentile)
+        return attributes
+
+
+class _FunctionTimings:
+    """
+    The number of calls and total duration of a chunk of code wrapped by
+    ``function_trace`` with sampling, recorded during a request, and the number
+    of calls that took at least the minimum duration, if one was given.
+    """
+    __slots__ = ('calls', 'duration_ns', 'min_duration_ns', 'slow_calls')
+
+    def __init__(self, min_duration_ms):
+        self.calls = 0
+        self.duration_ns = 0
+        self.min_duration_ns = None if min_duration_ms is None else min_duration_ms * 1_000_000
+        self.slow_calls = 0
+
+    def record(self, duration_ns):
+        """
+        Records the duration of a call, in nanoseconds.
+        """
+        self.calls += 1
+        self.duration_ns += duration_ns
+        if self.min_duration_ns is not None and duration_ns >= self.min_duration_ns:
+            self.slow_calls += 1
+
+    def get_custom_attributes(self, name):
+        """
+        Returns the custom attributes to report for the timings with the given name.
+        """
+        attributes = {
+            f'{name}.calls': self.calls,
+            f'{name}.duration_ms': self.duration_ns / 1_000_000,
+        }
+        if self.min_duration_ns is not None:
+            attributes[f'{name}.slow_calls'] = self.slow_calls
+        return attributes
+
+
 class MonitoringSupportMiddleware(MiddlewareMixin):
     """
     Middleware to support monitoring.
@@ -96,7 +205,7 @@ class MonitoringSupportMiddleware(MiddlewareMixin):
         """
         Get a request cache specifically for custom attributes.
         """
-        return RequestCache(namespace=_REQUEST_CACHE_NAMESPACE)
+        return _ATTRIBUTES_REQUEST_CACHE
 
     @classmethod
     def accumulate_attribute(cls, name, value):
@@ -120,6 +229,42 @@ class MonitoringSupportMiddleware(MiddlewareMixin):
             accumulated_value = value
         attributes_cache.set(name, accumulated_value)
 
+    @classmethod
+    def record_distribution_attribute(cls, name, value):
+        """
+        Record a value of a distribution custom attribute in the attributes cache.
+        """
+        attributes_cache = cls._get_attributes_cache()
+        distribution = attributes_cache.get(name)
+        try:
+            if distribution is None:
+                attributes_cache.set(name, _Distribution(value))
+            else:
+                distribution.record(value)
+        except (AttributeError, TypeError):
+            _set_custom_attribute(
+                'error_recording_distribution',
+                f'name={name}, new_value={value!r}, cached_value={distribution!r}'
+            )
+
+    @classmethod
+    def record_function_timing(cls, name, duration_ns, min_duration_ms=None):
+        """
+        Record the duration of a call of a function trace in the attributes cache.
+        """
+        attributes_cache = cls._get_attributes_cache()
+        timings = attributes_cache.get(name)
+        if timings is None:
+            timings = _FunctionTimings(min_duration_ms)
+            attributes_cache.set(name, timings)
+        try:
+            timings.record(duration_ns)
+        except AttributeError:
+            _set_custom_attribute(
+                'error_recording_function_timing',
+                f'name={name}, cached_value={timings!r}'
+            )
+
     @classmethod
     def accumulate_metric(cls, name, value):  # pragma: no cover
         """
@@ -133,20 +278,37 @@ class MonitoringSupportMiddleware(MiddlewareMixin):
     @classmethod
     def _batch_report(cls):
         """
-        Report the collected custom attributes.
+        Report the collected custom attributes, including any cache
+        instrumentation. Distributions and function timings are reported as
+        several attributes.
+
+        Backends that support deferred attributes may be sent the attributes
+        from a background thread. See MONITORING_DEFERRED_ATTRIBUTES_ENABLED.
+
+        The attributes are only reported once per request, since both
+        ``process_exception`` and ``process_response`` run for a request that
+        raises, and some backends sum the values they receive.
         """
         if not configured_backends():  # pragma: no cover
             return
-        attributes_cache = cls._get_attributes_cache()
-        for key, value in attributes_cache.data.items():
-            _set_custom_attribute(key, value)
+        if _BATCH_REPORT_REQUEST_CACHE.get(_BATCH_REPORTED_KEY, False):
+            return
+        _BATCH_REPORT_REQUEST_CACHE.set(_BATCH_REPORTED_KEY, True)
+        attributes = {}
+        for name, value in cls._get_attributes_cache().data.items():
+            if isinstance(value, (_Distribution, _FunctionTimings)):
+                attributes.update(value.get_custom_attributes(name))
+            else:
+                attributes[name] = value
+        attributes.update(get_cache_custom_attributes())
+        report_attributes(sample_custom_attributes(attributes))
 
     def _tag_root_span_with_error(self, exception):
         """
         Tags the root span with the exception information for all configured backends.
         """
-        for backend in configured_backends():
-            backend.tag_root_span_with_error(exception)
+        for tag_root_span_with_error_method in configured_backend_methods('tag_root_span_with_error'):
+            tag_root_span_with_error_method(exception)
 
     # Whether or not there was an exception, report any custom attributes that
     # may have been collected.
@@ -155,6 +317,7 @@ class MonitoringSupportMiddleware(MiddlewareMixin):
         """
         Django middleware handler to process a request
         """
+        _BATCH_REPORT_REQUEST_CACHE.clear()
         monitoring_support_process_request.send_robust(
             sender=self.__class__, request=request
         )
@@ -195,8 +358,20 @@ def _set_custom_attribute(key, value):
 
     Note: Can't use public method in ``utils.py`` due to circular reference.
     """
-    for backend in configured_backends():
-        backend.set_attribute(key, value)
+    configured_sampled_set_attribute()(key, value)
+
+
+def _set_custom_attributes(attributes):
+    """
+    Sets several monitoring custom attributes, given as a dict.
+
+    Note: Can't use public method in ``utils.py`` due to circular reference.
+    """
+    attributes = sample_custom_attributes(attributes)
+    if not attributes:
+        return
+    for set_attributes_method in configured_backend_methods('set_attributes'):
+        set_attributes_method(attributes)
 
 
 class MonitoringMemoryMiddleware(MiddlewareMixin):
@@ -386,10 +561,7 @@ class CookieMonitoringMiddleware:
         cookie_header_size = len(raw_header_cookie.encode('utf-8'))
         # .. custom_attribute_name: cookies.header.size
         # .. custom_attribute_description: The total size in bytes of the cookie header.
-        _set_custom_attribute('cookies.header.size', cookie_header_size)
-
-        if cookie_header_size == 0:
-            return None
+        attributes = {'cookies.header.size': cookie_header_size}
 
         if corrupt_cookie_count := raw_header_cookie.count('Cookie: '):
             # .. custom_attribute_name: cookies.header.corrupt_count
@@ -398,17 +570,22 @@ class CookieMonitoringMiddleware:
             #   requests where other mysterious cookie problems are occurring, this may help troubleshoot.
             #   See https://openedx.atlassian.net/browse/CR-4614 for more details.
             #   Also see cookies.header.corrupt_key_count
-            _set_custom_attribute('cookies.header.corrupt_count', corrupt_cookie_count)
+            attributes['cookies.header.corrupt_count'] = corrupt_cookie_count
             # .. custom_attribute_name: cookies.header.corrupt_key_count
             # .. custom_attribute_description: The attribute will only appear for potentially corrupt cookie headers,
             #   where "Cookie: " is found in some of the cookie keys. If this custom attribute is seen on the same
             #   requests where other mysterious cookie problems are occurring, this may help troubleshoot.
             #   See https://openedx.atlassian.net/browse/CR-4614 for more details.
             #   Also see cookies.header.corrupt_count.
-            _set_custom_attribute(
-                'cookies.header.corrupt_key_count',
-                sum(1 for key in request.COOKIES.keys() if 'Cookie: ' in key)
+            attributes['cookies.header.corrupt_key_count'] = sum(
+                1 for key in request.COOKIES.keys() if 'Cookie: ' in key
             )
+        _set_custom_attributes(attributes)
+
+        if cookie_header_size == 0:
+            return None
+
+        if corrupt_cookie_count:
             # If we have indication of corruption, just log all the headers for later diagnosis.
             # (Not part of other cookie logging because we need as much space as possible for
             # this log message, which can be quite large, and may need to chunk it across
@@ -0,0 +1,153 @@
+"""
+Sampling and dropping of custom attributes, to reduce the cost of reporting
+high-cardinality custom attributes on every transaction.
+
+The configured sample rates are compiled once, so that deciding whether to
+report a custom attribute costs a single dict lookup for attributes that are
+always or never reported.
+"""
+import random
+from functools import lru_cache
+
+from django.conf import settings
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+
+from edx_django_utils.cache import RequestCache
+
+from .backends import configured_set_attribute
+
+_SAMPLE_VALUE_KEY = 'sample_value'
+_SAMPLE_VALUE_REQUEST_CACHE = RequestCache(namespace='edx_django_utils.monitoring.custom_attribute_sampling')
+
+
+class _CustomAttributeSampler:
+    """
+    Decides whether to report custom attributes, given the configured sample
+    rates by name and by name prefix.
+    """
+    __slots__ = ('_sample_rates', '_prefix_sample_rates')
+
+    def __init__(self, sample_rates, prefix_sample_rates):
+        # Also memoizes the sample rates found by prefix, keyed by name.
+        self._sample_rates = dict(sample_rates)
+        # The longest prefixes come first, so that the most specific prefix matches.
+        self._prefix_sample_rates = sorted(prefix_sample_rates.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def is_sampled(self, key):
+        """
+        Returns whether to report the custom attribute with the given name in
+        the current transaction.
+        """
+        sample_rate = self._sample_rates.get(key)
+        if sample_rate is None:
+            sample_rate = self._sample_rates[key] = self._get_prefix_sample_rate(key)
+        if sample_rate >= 1:
+            return True
+        if sample_rate <= 0:
+            return False
+        return _get_transaction_sample_value() < sample_rate
+
+    def sample(self, attributes):
+        """
+        Returns a dict of the custom attributes to report in the current transaction.
+        """
+        is_sampled = self.is_sampled
+        return {key: value for key, value in attributes.items() if is_sampled(key)}
+
+    def _get_prefix_sample_rate(self, key):
+        for prefix, sample_rate in self._prefix_sample_rates:
+            if key.startswith(prefix):
+                return sample_rate
+        return 1
+
+
+def _get_transaction_sample_value():
+    """
+    Returns a random value between 0 and 1 that is the same for the whole
+    transaction, so that custom attributes with the same sample rate are
+    reported together, and attributes with lower rates are only reported with
+    the attributes with higher rates.
+    """
+    sample_value = _SAMPLE_VALUE_REQUEST_CACHE.get(_SAMPLE_VALUE_KEY)
+    if sample_value is None:
+        sample_value = random.random()
+        _SAMPLE_VALUE_REQUEST_CACHE.set(_SAMPLE_VALUE_KEY, sample_value)
+    return sample_value
+
+
+@lru_cache
+def configured_custom_attribute_sampler():
+    """
+    Returns the custom attribute sampler compiled from Django settings, or
+    None if all custom attributes are reported.
+    """
+    # .. setting_name: CUSTOM_ATTRIBUTE_SAMPLE_RATES
+    # .. setting_default: {}
+    # .. setting_description: A dict of custom attribute names to the fraction of transactions, from 0 to 1,
+    #   that should report them. A name ending with '*' is a prefix that applies to all custom attributes
+    #   starting with it, and the most specific name or prefix applies. Custom attributes without a sample
+    #   rate are always reported, unless there is a '*' entry, which can be set to 0 to report only the
+    #   listed custom attributes. Each transaction is sampled once, so custom attributes with the same
+    #   sample rate are reported together.
+    sample_rates_setting = getattr(settings, 'CUSTOM_ATTRIBUTE_SAMPLE_RATES', None) or {}
+    # .. setting_name: CUSTOM_ATTRIBUTE_DROP_LIST
+    # .. setting_default: []
+    # .. setting_description: A list of custom attribute names that are never reported. A name ending
+    #   with '*' is a prefix that applies to all custom attributes starting with it. This is the same as
+    #   a sample rate of 0 in CUSTOM_ATTRIBUTE_SAMPLE_RATES.
+    drop_list_setting = getattr(settings, 'CUSTOM_ATTRIBUTE_DROP_LIST', None) or []
+    if isinstance(drop_list_setting, str):
+        # Prevent a certain kind of easy mistake.
+        raise ValueError('CUSTOM_ATTRIBUTE_DROP_LIST must be a list, not a string.')
+
+    sample_rates = {}
+    prefix_sample_rates = {}
+    for name, sample_rate in [*sample_rates_setting.items(), *((name, 0) for name in drop_list_setting)]:
+        if not isinstance(sample_rate, (int, float)) or not 0 <= sample_rate <= 1:
+            raise ValueError(f'The sample rate of custom attribute {name!r} must be between 0 and 1.')
+        if name.endswith('*'):
+            prefix_sample_rates[name[:-1]] = sample_rate
+        else:
+            sample_rates[name] = sample_rate
+
+    if not sample_rates and not prefix_sample_rates:
+        return None
+    return _CustomAttributeSampler(sample_rates, prefix_sample_rates)
+
+
+@lru_cache
+def configured_sampled_set_attribute():
+    """
+    Returns a function that sets a custom attribute on all configured
+    backends, if it is sampled, or ``configured_set_attribute()`` itself if
+    sampling is not configured.
+    """
+    set_attribute = configured_set_attribute()
+    sampler = configured_custom_attribute_sampler()
+    if sampler is None:
+        return set_attribute
+    is_sampled = sampler.is_sampled
+
+    def sampled_set_attribute(key, value):
+        if is_sampled(key):
+            set_attribute(key, value)
+    return sampled_set_attribute
+
+
+def sample_custom_attributes(attributes):
+    """
+    Returns a dict of the custom attributes that are sampled for the current
+    transaction, which is ``attributes`` itself if sampling is not configured.
+    """
+    sampler = configured_custom_attribute_sampler()
+    if sampler is None:
+        return attributes
+    return sampler.sample(attributes)
+
+
+@receiver(setting_changed)
+def _reset_state(sender, **kwargs):  # pylint: disable=unused-argument
+    """Reset caches when settings change during unit tests."""
+    configured_custom_attribute_sampler.cache_clear()
+    configured_sampled_set_attribute.cache_clear()
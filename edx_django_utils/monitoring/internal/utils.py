@@ -17,10 +17,13 @@ https://openedx.atlassian.net/wiki/spaces/PERF/pages/54362736/Custom+Attributes+
 At this time, the custom monitoring will only be reported to New Relic.
 
 """
+import random
+import time
 from contextlib import ExitStack, contextmanager
 
-from .backends import configured_backends
+from .backends import configured_backend_methods
 from .middleware import CachedCustomMonitoringMiddleware
+from .sampling import configured_sampled_set_attribute, sample_custom_attributes
 
 try:
     import newrelic.agent
@@ -61,6 +64,28 @@ def increment(name):
     accumulate(name, 1)
 
 
+def record_distribution(name, value):
+    """
+    Record a value of a distribution monitoring custom attribute for the current request.
+
+    Unlike ``accumulate``, which reports only the sum, the distribution of all
+    values recorded for the name during the request is reported at the end of
+    the request, as the custom attributes ``<name>.count``, ``<name>.sum``,
+    ``<name>.min``, ``<name>.max``, ``<name>.p50``, ``<name>.p95`` and
+    ``<name>.p99``.
+
+    The percentiles are estimated from a histogram with power-of-two buckets,
+    limited to the min and max, so they may be up to twice the actual value.
+
+    Arguments:
+        name (str): The attribute name prefix.  For example:
+            'xb_user_state.get_many.num_items'.
+        value (number):  The value to record.
+
+    """
+    CachedCustomMonitoringMiddleware.record_distribution_attribute(name, value)
+
+
 def set_custom_attributes_for_course_key(course_key):
     """
     Set monitoring custom attributes related to a course key.
@@ -68,18 +93,32 @@ def set_custom_attributes_for_course_key(course_key):
     This is not cached.
 
     """
-    set_custom_attribute('course_id', str(course_key))
-    set_custom_attribute('org', str(course_key.org))
+    set_custom_attributes({'course_id': str(course_key), 'org': str(course_key.org)})
 
 
 def set_custom_attribute(key, value):
     """
     Set monitoring custom attribute.
 
-    This is not cached.
+    This is not cached. The custom attribute may not be reported, depending
+    on the ``CUSTOM_ATTRIBUTE_SAMPLE_RATES`` and ``CUSTOM_ATTRIBUTE_DROP_LIST``
+    settings.
+    """
+    configured_sampled_set_attribute()(key, value)
+
+
+def set_custom_attributes(attributes):
+    """
+    Set several monitoring custom attributes at once, given as a dict.
+
+    This is like calling ``set_custom_attribute`` for each key and value, but
+    each backend is sent the whole batch with a single call to its agent.
     """
-    for backend in configured_backends():
-        backend.set_attribute(key, value)
+    attributes = sample_custom_attributes(attributes)
+    if not attributes:
+        return
+    for set_attributes_method in configured_backend_methods('set_attributes'):
+        set_attributes_method(attributes)
 
 
 def record_exception():
@@ -90,23 +129,62 @@ def record_exception():
     can be called to record exceptions as monitored errors, even if you handle
     the exception gracefully from a user perspective.
     """
-    for backend in configured_backends():
-        backend.record_exception()
+    for record_exception_method in configured_backend_methods('record_exception'):
+        record_exception_method()
 
 
 @contextmanager
-def function_trace(function_name):
+def function_trace(function_name, sample_rate=1, min_duration_ms=None):
     """
     Wraps a chunk of code that we want to appear as a separate, explicit,
     segment in our monitoring tools.
+
+    For hot code that is called many times per request, a span for every call
+    costs too much. With a ``sample_rate`` below 1, only that fraction of calls
+    creates a span. All calls are then timed, and at the end of the request,
+    the number of calls and their total duration are reported as the custom
+    attributes ``<function_name>.calls`` and ``<function_name>.duration_ms``.
+
+    Arguments:
+        function_name (str): The name of the span, and the prefix of the
+            custom attributes.
+        sample_rate (float): The fraction of calls, from 0 to 1, that create a span.
+        min_duration_ms (number): (Optional) If given, calls are also timed,
+            even with a ``sample_rate`` of 1, and the number of calls that took
+            at least this many milliseconds is reported as the custom attribute
+            ``<function_name>.slow_calls``.
+
+    """
+    create_span_methods = configured_backend_methods('create_span')
+    if sample_rate >= 1 and min_duration_ms is None:
+        yield from _create_spans(create_span_methods, function_name)
+        return
+    if sample_rate <= 0 or not create_span_methods or (sample_rate < 1 and random.random() >= sample_rate):
+        create_span_methods = ()
+    start = time.perf_counter_ns()
+    try:
+        yield from _create_spans(create_span_methods, function_name)
+    finally:
+        CachedCustomMonitoringMiddleware.record_function_timing(
+            function_name, time.perf_counter_ns() - start, min_duration_ms
+        )
+
+
+def _create_spans(create_span_methods, function_name):
+    """
+    Generator for ``function_trace`` that yields once in a span created by
+    each of the create_span methods.
     """
     # Not covering this because if we mock it, we're not really testing anything
     # anyway. If something did break, it should show up in tests for apps that
     # use this code with whatever uses it.
     # ExitStack handles the underlying context managers.
+    if not create_span_methods:
+        yield
+        return
     with ExitStack() as stack:
-        for backend in configured_backends():
-            context = backend.create_span(function_name)
+        for create_span_method in create_span_methods:
+            context = create_span_method(function_name)
             if context is not None:
                 stack.enter_context(context)
         yield
@@ -121,8 +199,8 @@ def set_monitoring_transaction_name(name, group=None, priority=None):
 
     Group and priority may not be supported by all backends.
     """
-    for backend in configured_backends():
-        backend.set_local_root_span_name(name, group=group, priority=priority)
+    for set_local_root_span_name_method in configured_backend_methods('set_local_root_span_name'):
+        set_local_root_span_name_method(name, group=group, priority=priority)
 
 
 def background_task(*args, **kwargs):
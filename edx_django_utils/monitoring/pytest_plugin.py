@@ -0,0 +1,27 @@
+"""
+Pytest fixtures for testing monitoring without a monitoring service.
+
+To use them, add the following to the root ``conftest.py``::
+
+    pytest_plugins = ['edx_django_utils.monitoring.pytest_plugin']
+
+"""
+import pytest
+from django.test import override_settings
+
+from edx_django_utils.cache import RequestCache
+
+from .internal.backends import configured_backends
+
+
+@pytest.fixture
+def in_memory_telemetry():
+    """
+    Configures an ``InMemoryBackend`` as the only telemetry backend, and
+    returns it, so that tests can assert on the telemetry recorded in
+    ``in_memory_telemetry.current_transaction`` or ``in_memory_telemetry.transactions``.
+    """
+    RequestCache.clear_all_namespaces()
+    with override_settings(OPENEDX_TELEMETRY=['edx_django_utils.monitoring.InMemoryBackend']):
+        yield configured_backends()[0]
+    RequestCache.clear_all_namespaces()
@@ -2,7 +2,7 @@
 Tests for the code_owner monitoring middleware
 """
 from unittest import TestCase
-from unittest.mock import ANY, MagicMock, Mock, call, patch
+from unittest.mock import ANY, MagicMock, Mock, patch
 
 import ddt
 from django.test import RequestFactory, override_settings
@@ -66,11 +66,11 @@ class CodeOwnerMetricMiddlewareTests(TestCase):
         ROOT_URLCONF=__name__,
     )
     @patch(
-        'edx_django_utils.monitoring.internal.code_owner.utils.set_custom_attribute',
+        'edx_django_utils.monitoring.internal.code_owner.utils.set_custom_attributes',
         new_callable=get_set_custom_attribute_mock
     )
     @patch(
-        'edx_django_utils.monitoring.internal.code_owner.middleware.set_custom_attribute',
+        'edx_django_utils.monitoring.internal.code_owner.middleware.set_custom_attributes',
         new_callable=get_set_custom_attribute_mock
     )
     @ddt.data(
@@ -104,11 +104,11 @@ class CodeOwnerMetricMiddlewareTests(TestCase):
         ROOT_URLCONF=__name__,
     )
     @patch(
-        'edx_django_utils.monitoring.internal.code_owner.utils.set_custom_attribute',
+        'edx_django_utils.monitoring.internal.code_owner.utils.set_custom_attributes',
         new_callable=get_set_custom_attribute_mock
     )
     @patch(
-        'edx_django_utils.monitoring.internal.code_owner.middleware.set_custom_attribute',
+        'edx_django_utils.monitoring.internal.code_owner.middleware.set_custom_attributes',
         new_callable=get_set_custom_attribute_mock
     )
     @ddt.data(
@@ -131,11 +131,11 @@ class CodeOwnerMetricMiddlewareTests(TestCase):
         ROOT_URLCONF=__name__,
     )
     @patch(
-        'edx_django_utils.monitoring.internal.code_owner.utils.set_custom_attribute',
+        'edx_django_utils.monitoring.internal.code_owner.utils.set_custom_attributes',
         new_callable=get_set_custom_attribute_mock
     )
     @patch(
-        'edx_django_utils.monitoring.internal.code_owner.middleware.set_custom_attribute',
+        'edx_django_utils.monitoring.internal.code_owner.middleware.set_custom_attributes',
         new_callable=get_set_custom_attribute_mock
     )
     @patch('newrelic.agent')
@@ -178,11 +178,11 @@ class CodeOwnerMetricMiddlewareTests(TestCase):
         ROOT_URLCONF=__name__,
     )
     @patch(
-        'edx_django_utils.monitoring.internal.code_owner.utils.set_custom_attribute',
+        'edx_django_utils.monitoring.internal.code_owner.utils.set_custom_attributes',
         new_callable=get_set_custom_attribute_mock
     )
     @patch(
-        'edx_django_utils.monitoring.internal.code_owner.middleware.set_custom_attribute',
+        'edx_django_utils.monitoring.internal.code_owner.middleware.set_custom_attributes',
         new_callable=get_set_custom_attribute_mock
     )
     @patch('newrelic.agent')
@@ -215,11 +215,11 @@ class CodeOwnerMetricMiddlewareTests(TestCase):
         ROOT_URLCONF=__name__,
     )
     @patch(
-        'edx_django_utils.monitoring.internal.code_owner.utils.set_custom_attribute',
+        'edx_django_utils.monitoring.internal.code_owner.utils.set_custom_attributes',
         new_callable=get_set_custom_attribute_mock
     )
     @patch(
-        'edx_django_utils.monitoring.internal.code_owner.middleware.set_custom_attribute',
+        'edx_django_utils.monitoring.internal.code_owner.middleware.set_custom_attributes',
         new_callable=get_set_custom_attribute_mock
     )
     @patch('newrelic.agent')
@@ -231,13 +231,13 @@ class CodeOwnerMetricMiddlewareTests(TestCase):
             mock_set_custom_attribute, has_path_error=True, has_transaction_error=True
         )
 
-    @patch('edx_django_utils.monitoring.internal.code_owner.middleware.set_custom_attribute')
+    @patch('edx_django_utils.monitoring.internal.code_owner.middleware.set_custom_attributes')
     def test_code_owner_no_mappings(self, mock_set_custom_attribute):
         request = RequestFactory().get('/test/')
         self.middleware(request)
         mock_set_custom_attribute.assert_not_called()
 
-    @patch('edx_django_utils.monitoring.internal.code_owner.middleware.set_custom_attribute')
+    @patch('edx_django_utils.monitoring.internal.code_owner.middleware.set_custom_attributes')
     def test_code_owner_transaction_no_mappings(self, mock_set_custom_attribute):
         request = RequestFactory().get('/bad/path/')
         self.middleware(request)
@@ -247,11 +247,11 @@ class CodeOwnerMetricMiddlewareTests(TestCase):
         CODE_OWNER_MAPPINGS={'team-red': ['lms.djangoapps.monitoring.tests.mock_views']},
     )
     @patch(
-        'edx_django_utils.monitoring.internal.code_owner.utils.set_custom_attribute',
+        'edx_django_utils.monitoring.internal.code_owner.utils.set_custom_attributes',
         new_callable=get_set_custom_attribute_mock
     )
     @patch(
-        'edx_django_utils.monitoring.internal.code_owner.middleware.set_custom_attribute',
+        'edx_django_utils.monitoring.internal.code_owner.middleware.set_custom_attributes',
         new_callable=get_set_custom_attribute_mock
     )
     def test_no_resolver_for_path_and_no_transaction(self, mock_set_custom_attribute, _):
@@ -265,11 +265,11 @@ class CodeOwnerMetricMiddlewareTests(TestCase):
         CODE_OWNER_MAPPINGS={'team-red': ['*']},
     )
     @patch(
-        'edx_django_utils.monitoring.internal.code_owner.utils.set_custom_attribute',
+        'edx_django_utils.monitoring.internal.code_owner.utils.set_custom_attributes',
         new_callable=get_set_custom_attribute_mock
     )
     @patch(
-        'edx_django_utils.monitoring.internal.code_owner.middleware.set_custom_attribute',
+        'edx_django_utils.monitoring.internal.code_owner.middleware.set_custom_attributes',
         new_callable=get_set_custom_attribute_mock
     )
     def test_catch_all_with_errors(self, mock_set_custom_attribute, _):
@@ -294,28 +294,19 @@ class CodeOwnerMetricMiddlewareTests(TestCase):
             transaction_name=None, has_transaction_error=False,
             check_theme_and_squad=False):
         """ Performs a set of assertions around having set the proper custom attributes. """
-        call_list = []
+        expected_attributes = {}
         if expected_code_owner:
-            call_list.append(call('code_owner', expected_code_owner))
+            expected_attributes['code_owner'] = expected_code_owner
             if check_theme_and_squad:
-                call_list.append(call('code_owner_theme', expected_code_owner.split('-')[0]))
-                call_list.append(call('code_owner_squad', expected_code_owner.split('-')[1]))
+                expected_attributes['code_owner_theme'] = expected_code_owner.split('-')[0]
+                expected_attributes['code_owner_squad'] = expected_code_owner.split('-')[1]
         if path_module:
-            call_list.append(call('code_owner_module', path_module))
+            expected_attributes['code_owner_module'] = path_module
         if has_path_error:
-            call_list.append(call('code_owner_path_error', ANY))
+            expected_attributes['code_owner_path_error'] = ANY
         if transaction_name:
-            call_list.append(call('code_owner_transaction_name', transaction_name))
+            expected_attributes['code_owner_transaction_name'] = transaction_name
         if has_transaction_error:
-            call_list.append(call('code_owner_transaction_error', ANY))
-        # TODO: Remove this list filtering once the ``deprecated_broad_except_XXX`` custom attributes have been removed.
-        actual_filtered_call_list = [
-            mock_call
-            for mock_call in mock_set_custom_attribute.call_args_list
-            if not mock_call[0][0].startswith('deprecated_')
-        ]
-        mock_set_custom_attribute.assert_has_calls(call_list, any_order=True)
-        self.assertEqual(
-            len(actual_filtered_call_list), len(call_list),
-            f'Expected calls {call_list} vs actual calls {actual_filtered_call_list}'
-        )
+            expected_attributes['code_owner_transaction_error'] = ANY
+        # The custom attributes are all set together.
+        mock_set_custom_attribute.assert_called_once_with(expected_attributes)
@@ -3,7 +3,7 @@ Tests for the code_owner monitoring middleware
 """
 import timeit
 from unittest import TestCase
-from unittest.mock import call, patch
+from unittest.mock import patch
 
 import ddt
 from django.test import override_settings
@@ -96,7 +96,7 @@ class MonitoringUtilsTests(TestCase):
         CODE_OWNER_MAPPINGS={'team-red': ['edx_django_utils.monitoring.tests.code_owner.test_utils']},
         CODE_OWNER_THEMES={'team': ['team-red']},
     )
-    @patch('edx_django_utils.monitoring.internal.code_owner.utils.set_custom_attribute')
+    @patch('edx_django_utils.monitoring.internal.code_owner.utils.set_custom_attributes')
     def test_set_code_owner_attribute_success(self, mock_set_custom_attribute):
         self.assertEqual(decorated_function('test'), 'test')
         self._assert_set_custom_attribute(
@@ -114,12 +114,12 @@ class MonitoringUtilsTests(TestCase):
     @override_settings(CODE_OWNER_MAPPINGS={
         'team-red': ['*']
     })
-    @patch('edx_django_utils.monitoring.internal.code_owner.utils.set_custom_attribute')
+    @patch('edx_django_utils.monitoring.internal.code_owner.utils.set_custom_attributes')
     def test_set_code_owner_attribute_catch_all(self, mock_set_custom_attribute):
         self.assertEqual(decorated_function('test'), 'test')
         self._assert_set_custom_attribute(mock_set_custom_attribute, code_owner='team-red', module=__name__)
 
-    @patch('edx_django_utils.monitoring.internal.code_owner.utils.set_custom_attribute')
+    @patch('edx_django_utils.monitoring.internal.code_owner.utils.set_custom_attributes')
     def test_set_code_owner_attribute_no_mappings(self, mock_set_custom_attribute):
         self.assertEqual(decorated_function('test'), 'test')
         self._assert_set_custom_attribute(mock_set_custom_attribute, code_owner=None, module=__name__)
@@ -127,20 +127,20 @@ class MonitoringUtilsTests(TestCase):
     @override_settings(CODE_OWNER_MAPPINGS={
         'team-red': ['edx_django_utils.monitoring.tests.code_owner.test_utils']
     })
-    @patch('edx_django_utils.monitoring.internal.code_owner.utils.set_custom_attribute')
+    @patch('edx_django_utils.monitoring.internal.code_owner.utils.set_custom_attributes')
     def test_set_code_owner_attribute_from_module_success(self, mock_set_custom_attribute):
         set_code_owner_attribute_from_module(__name__)
         self._assert_set_custom_attribute(mock_set_custom_attribute, code_owner='team-red', module=__name__)
 
     def _assert_set_custom_attribute(self, mock_set_custom_attribute, code_owner, module, check_theme_and_squad=False):
         """
-        Helper to assert that the proper set_custom_metric calls were made.
+        Helper to assert that the proper custom attributes were set together.
         """
-        call_list = []
+        expected_attributes = {}
         if code_owner:
-            call_list.append(call('code_owner', code_owner))
+            expected_attributes['code_owner'] = code_owner
             if check_theme_and_squad:
-                call_list.append(call('code_owner_theme', code_owner.split('-')[0]))
-                call_list.append(call('code_owner_squad', code_owner.split('-')[1]))
-        call_list.append(call('code_owner_module', module))
-        mock_set_custom_attribute.assert_has_calls(call_list, any_order=True)
+                expected_attributes['code_owner_theme'] = code_owner.split('-')[0]
+                expected_attributes['code_owner_squad'] = code_owner.split('-')[1]
+        expected_attributes['code_owner_module'] = module
+        mock_set_custom_attribute.assert_called_once_with(expected_attributes)
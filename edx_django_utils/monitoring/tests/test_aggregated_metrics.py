@@ -0,0 +1,179 @@
+"""
+Tests for the aggregated metrics backend.
+"""
+import socket
+
+import ddt
+from django.http import Http404
+from django.test import RequestFactory, TestCase, override_settings
+
+from edx_django_utils.cache import RequestCache
+from edx_django_utils.cache.middleware import RequestCacheMiddleware
+from edx_django_utils.monitoring import (
+    AggregatedMetricsBackend,
+    MonitoringSupportMiddleware,
+    accumulate,
+    aggregated_metrics_view,
+    set_custom_attribute,
+    set_custom_attributes
+)
+from edx_django_utils.monitoring.internal.backends import configured_backends
+
+
+@ddt.ddt
+class TestAggregatedMetricsBackend(TestCase):
+    """
+    Test the aggregated metrics backend.
+    """
+    def setUp(self):
+        super().setUp()
+        RequestCache.clear_all_namespaces()
+        # Each test starts with a new backend, without any metrics.
+        telemetry_settings = override_settings(
+            OPENEDX_TELEMETRY=['edx_django_utils.monitoring.AggregatedMetricsBackend']
+        )
+        telemetry_settings.enable()
+        self.addCleanup(telemetry_settings.disable)
+
+    def _handle_request(self, code_owner, value):
+        """
+        Handles a request that sets the code owner, if any, and accumulates the value.
+        """
+        def view(request):
+            if code_owner:
+                set_custom_attribute('code_owner', code_owner)
+            accumulate('hello', value)
+        RequestCacheMiddleware(MonitoringSupportMiddleware(view))('fake request')
+
+    def _get_metrics(self):
+        response = aggregated_metrics_view(RequestFactory().get('/metrics'))
+        assert response['Content-Type'] == 'text/plain; version=0.0.4; charset=utf-8'
+        return response.content.decode('utf-8')
+
+    def test_aggregated_metrics_view(self):
+        self._handle_request('team-red', 3)
+        self._handle_request('team-red', 5)
+        self._handle_request(None, 1)
+
+        assert self._get_metrics() == (
+            '# TYPE code_owner_transactions_total counter\n'
+            'code_owner_transactions_total{code_owner="team-red"} 2\n'
+            '# TYPE hello histogram\n'
+            'hello_bucket{le="1"} 1\n'
+            'hello_bucket{le="+Inf"} 1\n'
+            'hello_sum 1\n'
+            'hello_count 1\n'
+            'hello_bucket{code_owner="team-red",le="1"} 0\n'
+            'hello_bucket{code_owner="team-red",le="2"} 0\n'
+            'hello_bucket{code_owner="team-red",le="4"} 1\n'
+            'hello_bucket{code_owner="team-red",le="8"} 2\n'
+            'hello_bucket{code_owner="team-red",le="+Inf"} 2\n'
+            'hello_sum{code_owner="team-red"} 8\n'
+            'hello_count{code_owner="team-red"} 2\n'
+        )
+
+    def test_exception_counted_once(self):
+        middleware = MonitoringSupportMiddleware(lambda request: None)
+        middleware.process_request('fake request')
+        accumulate('hello', 5)
+        # Django calls both process_exception and process_response for a request that raises.
+        middleware.process_exception('fake request', ValueError())
+        middleware.process_response('fake request', 'fake response')
+
+        assert self._get_metrics().splitlines()[-2:] == ['hello_sum 5', 'hello_count 1']
+
+    def test_histogram_buckets(self):
+        for value in (-1, 0.5, 1, 2, 3, 4, 2 ** 70):
+            set_custom_attribute('some.value', value)
+        assert self._get_metrics().splitlines()[1:6] == [
+            'some_value_bucket{le="1"} 3',
+            'some_value_bucket{le="2"} 4',
+            'some_value_bucket{le="4"} 6',
+            'some_value_bucket{le="+Inf"} 7',
+            f'some_value_sum {2 ** 70 + 9.5!r}',
+        ]
+
+    def test_ignored_attributes(self):
+        set_custom_attributes({
+            'string': '1', 'bool': True, 'none': None, 'nan': float('nan'), 'infinity': float('inf'),
+        })
+        set_custom_attribute('bool', False)
+        assert self._get_metrics() == ''
+
+    def test_code_owner_counted_once(self):
+        set_custom_attributes({'code_owner': 'team-red', 'hello': 1})
+        set_custom_attribute('code_owner', 'team-red')
+        assert self._get_metrics().splitlines()[:2] == [
+            '# TYPE code_owner_transactions_total counter',
+            'code_owner_transactions_total{code_owner="team-red"} 1',
+        ]
+        assert 'hello_count{code_owner="team-red"} 1' in self._get_metrics()
+
+    def test_label_escaping(self):
+        set_custom_attributes({'code_owner': 'team "red"\\', '1st': 1})
+        assert '_1st_count{code_owner="team \\"red\\"\\\\"} 1' in self._get_metrics()
+
+    @override_settings(OPENEDX_TELEMETRY=[])
+    def test_aggregated_metrics_view_not_configured(self):
+        with self.assertRaises(Http404):
+            aggregated_metrics_view(RequestFactory().get('/metrics'))
+
+    def test_flush_statsd(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as statsd_socket:
+            statsd_socket.bind(('127.0.0.1', 0))
+            statsd_socket.settimeout(5)
+            port = statsd_socket.getsockname()[1]
+            with override_settings(OPENEDX_TELEMETRY_STATSD_ADDRESS=f'127.0.0.1:{port}'):
+                backend = configured_backends()[0]
+                self._handle_request('team-red', 3)
+                self._handle_request(None, 0.5)
+                backend.flush_statsd()
+                assert sorted(statsd_socket.recv(65535).decode('utf-8').splitlines()) == [
+                    'code_owner.transactions:1|c|#code_owner:team-red',
+                    'hello.count:1|c',
+                    'hello.count:1|c|#code_owner:team-red',
+                    'hello.sum:0.5|c',
+                    'hello.sum:3|c|#code_owner:team-red',
+                ]
+
+                # Only the values recorded since the last flush are sent.
+                self._handle_request('team-red', 2)
+                backend.flush_statsd()
+                assert sorted(statsd_socket.recv(65535).decode('utf-8').splitlines()) == [
+                    'code_owner.transactions:1|c|#code_owner:team-red',
+                    'hello.count:1|c|#code_owner:team-red',
+                    'hello.sum:2|c|#code_owner:team-red',
+                ]
+
+    def test_flush_statsd_packets(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as statsd_socket:
+            statsd_socket.bind(('127.0.0.1', 0))
+            statsd_socket.settimeout(5)
+            port = statsd_socket.getsockname()[1]
+            with override_settings(OPENEDX_TELEMETRY_STATSD_ADDRESS=f'localhost:{port}'):
+                set_custom_attributes({f'attribute_{index}': index for index in range(100)})
+                configured_backends()[0].flush_statsd()
+                lines = []
+                while len(lines) < 200:
+                    packet = statsd_socket.recv(65535)
+                    assert len(packet) <= 1432
+                    lines.extend(packet.decode('utf-8').splitlines())
+        assert len(lines) == 200
+        assert 'attribute_99.sum:99|c' in lines
+
+    def test_statsd_flush_thread(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as statsd_socket:
+            statsd_socket.bind(('127.0.0.1', 0))
+            statsd_socket.settimeout(5)
+            port = statsd_socket.getsockname()[1]
+            with override_settings(
+                OPENEDX_TELEMETRY_STATSD_ADDRESS=f'127.0.0.1:{port}', OPENEDX_TELEMETRY_STATSD_FLUSH_INTERVAL=0.01,
+            ):
+                set_custom_attribute('hello', 1)
+                assert statsd_socket.recv(65535).decode('utf-8').splitlines() == ['hello.count:1|c', 'hello.sum:1|c']
+
+    @ddt.data('localhost', 'localhost:', ':8125', 'localhost:port')
+    def test_invalid_statsd_address(self, statsd_address):
+        with override_settings(OPENEDX_TELEMETRY_STATSD_ADDRESS=statsd_address):
+            with self.assertRaises(ValueError):
+                AggregatedMetricsBackend()
@@ -1,16 +1,38 @@
 """
 Tests for TelemetryBackend and implementations.
 """
-from unittest.mock import patch
+import timeit
+from unittest.mock import call, patch
 
 import ddt
 import pytest
 from django.test import TestCase, override_settings
 
-from edx_django_utils.monitoring import record_exception, set_custom_attribute
+from edx_django_utils.monitoring import TelemetryBackend, record_exception, set_custom_attribute, set_custom_attributes
 from edx_django_utils.monitoring.internal.backends import configured_backends
 
 
+class NoOpBackend(TelemetryBackend):
+    """
+    A backend that does nothing, for measuring the overhead of the dispatch to backends.
+    """
+
+    def set_attribute(self, key, value):
+        pass
+
+    def record_exception(self):
+        pass
+
+    def create_span(self, name):
+        pass
+
+    def tag_root_span_with_error(self, exception):
+        pass
+
+    def set_local_root_span_name(self, name, group=None, priority=None):
+        pass
+
+
 @ddt.ddt
 class TestBackendsConfig(TestCase):
     """
@@ -134,6 +156,32 @@ class TestBackendsFanOut(TestCase):
         mock_otel_set_attribute.assert_called_once()
         mock_dd_root_span.assert_called_once()
 
+    @patch('newrelic.agent.add_custom_attributes')
+    @patch('opentelemetry.trace.span.NonRecordingSpan.set_attributes')
+    @patch('ddtrace._trace.tracer.Tracer.current_root_span')
+    def test_set_custom_attributes(
+            self, mock_dd_root_span,
+            mock_otel_set_attributes, mock_nr_add_custom_attributes,
+    ):
+        attributes = {'some_key': 'some_value', 'other_key': 'other_value'}
+        with override_settings(OPENEDX_TELEMETRY=[
+                'edx_django_utils.monitoring.NewRelicBackend',
+                'edx_django_utils.monitoring.OpenTelemetryBackend',
+                'edx_django_utils.monitoring.DatadogBackend',
+        ]):
+            set_custom_attributes(attributes)
+        # Each backend gets the whole batch with a single call.
+        mock_nr_add_custom_attributes.assert_called_once()
+        assert dict(mock_nr_add_custom_attributes.call_args[0][0]) == attributes
+        mock_otel_set_attributes.assert_called_once_with(attributes)
+        mock_dd_root_span.return_value.set_tags.assert_called_once_with(attributes)
+
+    @patch.object(NoOpBackend, 'set_attribute')
+    def test_set_custom_attributes_default(self, mock_set_attribute):
+        with override_settings(OPENEDX_TELEMETRY=['edx_django_utils.monitoring.tests.test_backends.NoOpBackend']):
+            set_custom_attributes({'some_key': 'some_value', 'other_key': 'other_value'})
+        assert mock_set_attribute.call_args_list == [call('some_key', 'some_value'), call('other_key', 'other_value')]
+
     @patch('newrelic.agent.notice_error')
     @patch('opentelemetry.trace.span.NonRecordingSpan.record_exception')
     # Record exception on current span, not root span.
@@ -151,3 +199,24 @@ class TestBackendsFanOut(TestCase):
         mock_nr_notice_error.assert_called_once()
         mock_otel_record_exception.assert_called_once()
         mock_dd_span.assert_called_once()
+
+
+@ddt.ddt
+class TestBackendsDispatchPerformance(TestCase):
+    """
+    Benchmark the overhead of setting an attribute on the configured backends.
+    """
+
+    @ddt.data(0, 1, 3)
+    def test_set_custom_attribute_performance(self, backend_count):
+        with override_settings(
+            OPENEDX_TELEMETRY=['edx_django_utils.monitoring.tests.test_backends.NoOpBackend'] * backend_count
+        ):
+            assert len(configured_backends()) == backend_count
+            call_iterations = 10000
+            time = timeit.timeit(lambda: set_custom_attribute('some_key', 'some_value'), number=call_iterations)
+            average_time = time / call_iterations
+            self.assertLess(
+                average_time, 0.00005,
+                f'Setting an attribute with {backend_count} backends takes {average_time}s which is too slow.'
+            )
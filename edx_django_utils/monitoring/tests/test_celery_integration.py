@@ -0,0 +1,124 @@
+"""
+Tests for the Celery task-boundary integration.
+"""
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache as django_cache
+from django.test import TestCase
+
+from edx_django_utils.cache import RequestCache, TieredCache
+from edx_django_utils.monitoring import accumulate, connect_celery_task_handlers, report_celery_task_attributes
+from edx_django_utils.monitoring.internal.celery_integration import _handle_task_postrun, _handle_task_prerun
+
+
+class TestCeleryIntegration(TestCase):  # pylint: disable=missing-class-docstring
+    def setUp(self):
+        super().setUp()
+        RequestCache.clear_all_namespaces()
+        TieredCache.dangerous_clear_all_tiers()
+        self.task = Mock(**{'request.is_eager': False})
+
+    @patch('edx_django_utils.monitoring.internal.celery_integration.celery_signals')
+    def test_connect_celery_task_handlers(self, mock_celery_signals):
+        connect_celery_task_handlers()
+        mock_celery_signals.task_prerun.connect.assert_called_once_with(
+            _handle_task_prerun, weak=False, dispatch_uid='edx_django_utils.monitoring.celery_integration.task_prerun'
+        )
+        mock_celery_signals.task_postrun.connect.assert_called_once_with(
+            _handle_task_postrun, weak=False, dispatch_uid='edx_django_utils.monitoring.celery_integration.task_postrun'
+        )
+
+    @patch('edx_django_utils.monitoring.internal.celery_integration.celery_signals', None)
+    def test_celery_not_installed(self):
+        with self.assertRaises(Exception):
+            connect_celery_task_handlers()
+
+    def test_task_prerun(self):
+        RequestCache('test_namespace').set('key', 'value')
+        _handle_task_prerun(sender=Mock(), task_id='task-id', task=self.task, args=(), kwargs={})
+        self.assertFalse(RequestCache('test_namespace').get_cached_response('key').is_found)
+
+    @patch('newrelic.agent')
+    def test_task_postrun(self, mock_newrelic_agent):
+        accumulate('hello', 10)
+        accumulate('hello', 10)
+        RequestCache('test_namespace').set('key', 'value')
+        _handle_task_postrun(sender=Mock(), task_id='task-id', task=self.task, args=(), kwargs={}, state='SUCCESS')
+
+        mock_newrelic_agent.add_custom_attributes.assert_called_once()
+        self.assertEqual(dict(mock_newrelic_agent.add_custom_attributes.call_args[0][0]), {'hello': 20})
+        self.assertFalse(RequestCache('test_namespace').get_cached_response('key').is_found)
+
+    @patch('newrelic.agent')
+    def test_eager_task(self, mock_newrelic_agent):
+        """
+        Test an eager task run within a request leaves the request's cache and attributes alone.
+        """
+        eager_task = Mock(**{'request.is_eager': True})
+        accumulate('hello', 10)
+        RequestCache('test_namespace').set('key', 'value')
+        _handle_task_prerun(sender=Mock(), task_id='task-id', task=eager_task, args=(), kwargs={})
+        _handle_task_postrun(sender=Mock(), task_id='task-id', task=eager_task, args=(), kwargs={}, state='SUCCESS')
+
+        mock_newrelic_agent.add_custom_attributes.assert_not_called()
+        self.assertTrue(RequestCache('test_namespace').get_cached_response('key').is_found)
+
+    def test_task_prerun_flushes_write_behind(self):
+        TieredCache.set_all_tiers('key', 'value', write_behind=True)
+        _handle_task_prerun(sender=Mock(), task_id='task-id', task=self.task, args=(), kwargs={})
+        self.assertEqual(django_cache.get('key'), 'value')
+
+    def test_task_postrun_flushes_write_behind(self):
+        TieredCache.set_all_tiers('key', 'value', write_behind=True)
+        _handle_task_postrun()
+        self.assertEqual(django_cache.get('key'), 'value')
+
+    @patch('newrelic.agent')
+    def test_report_celery_task_attributes(self, mock_newrelic_agent):
+        """
+        Test the decorator reports attributes before the task function's transaction ends, and only once.
+        """
+        @report_celery_task_attributes
+        def example_task(value):
+            accumulate('hello', value)
+            mock_newrelic_agent.add_custom_attributes.assert_not_called()
+            return value
+
+        with patch('edx_django_utils.monitoring.internal.celery_integration.celery_current_task', self.task):
+            _handle_task_prerun(sender=Mock(), task_id='task-id', task=self.task, args=(), kwargs={})
+            self.assertEqual(example_task(10), 10)
+            mock_newrelic_agent.add_custom_attributes.assert_called_once()
+            self.assertEqual(dict(mock_newrelic_agent.add_custom_attributes.call_args[0][0]), {'hello': 10})
+            _handle_task_postrun(sender=Mock(), task_id='task-id', task=self.task, args=(), kwargs={}, state='SUCCESS')
+        mock_newrelic_agent.add_custom_attributes.assert_called_once()
+
+    @patch('newrelic.agent')
+    def test_report_celery_task_attributes_on_error(self, mock_newrelic_agent):
+        @report_celery_task_attributes
+        def example_task():
+            accumulate('hello', 10)
+            raise ValueError()
+
+        with patch('edx_django_utils.monitoring.internal.celery_integration.celery_current_task', self.task):
+            with self.assertRaises(ValueError):
+                example_task()
+        self.assertEqual(dict(mock_newrelic_agent.add_custom_attributes.call_args[0][0]), {'hello': 10})
+
+    @patch('newrelic.agent')
+    def test_report_celery_task_attributes_eager(self, mock_newrelic_agent):
+        @report_celery_task_attributes
+        def example_task():
+            accumulate('hello', 10)
+
+        eager_task = Mock(**{'request.is_eager': True})
+        with patch('edx_django_utils.monitoring.internal.celery_integration.celery_current_task', eager_task):
+            example_task()
+        mock_newrelic_agent.add_custom_attributes.assert_not_called()
+
+    @patch('edx_django_utils.monitoring.internal.celery_integration.MonitoringSupportMiddleware._batch_report')
+    def test_task_postrun_clears_after_report_error(self, mock_batch_report):
+        mock_batch_report.side_effect = ValueError()
+        RequestCache('test_namespace').set('key', 'value')
+        with self.assertRaises(ValueError):
+            _handle_task_postrun()
+        self.assertFalse(RequestCache('test_namespace').get_cached_response('key').is_found)
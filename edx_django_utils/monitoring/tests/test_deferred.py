@@ -0,0 +1,177 @@
+"""
+Tests for deferred reporting of custom attributes.
+"""
+import json
+import tempfile
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from edx_django_utils.cache import RequestCache
+from edx_django_utils.cache.middleware import RequestCacheMiddleware
+from edx_django_utils.monitoring import (
+    JsonLinesFileBackend,
+    MonitoringSupportMiddleware,
+    accumulate,
+    get_deferred_attributes_stats,
+    set_monitoring_transaction_name
+)
+from edx_django_utils.monitoring.internal import deferred
+from edx_django_utils.monitoring.internal.backends import configured_backends
+from edx_django_utils.monitoring.tests.test_backends import NoOpBackend
+
+
+class RecordingBackend(NoOpBackend):
+    """
+    A backend that records the batches of attributes it is sent, and the threads that sent them.
+    """
+    batches = []
+
+    def set_attributes(self, attributes):
+        self.batches.append((threading.current_thread(), attributes))
+
+
+class DeferredRecordingBackend(RecordingBackend):
+    """
+    A recording backend that supports deferred attributes.
+    """
+    supports_deferred_attributes = True
+
+
+class BlockingBackend(NoOpBackend):
+    """
+    A backend that supports deferred attributes, and blocks until it is released.
+    """
+    supports_deferred_attributes = True
+    release = threading.Event()
+
+    def set_attributes(self, attributes):
+        self.release.wait()
+
+
+class FailingBackend(NoOpBackend):
+    """
+    A backend that supports deferred attributes, and fails to set them.
+    """
+    supports_deferred_attributes = True
+
+    def set_attributes(self, attributes):
+        raise ValueError('forced failure')
+
+
+_RECORDING_BACKENDS = [
+    'edx_django_utils.monitoring.tests.test_deferred.RecordingBackend',
+    'edx_django_utils.monitoring.tests.test_deferred.DeferredRecordingBackend',
+]
+
+
+class TestDeferredAttributes(TestCase):
+    """
+    Test deferred reporting of the custom attributes batch.
+    """
+    def setUp(self):
+        super().setUp()
+        RequestCache.clear_all_namespaces()
+        RecordingBackend.batches = []
+        DeferredRecordingBackend.batches = []
+        # Each test gets its own queue and worker thread.
+        reporter = deferred._DeferredAttributesReporter()  # pylint: disable=protected-access
+        reporter_patcher = patch.object(deferred, '_DEFERRED_ATTRIBUTES_REPORTER', reporter)
+        self.reporter = reporter_patcher.start()
+        self.addCleanup(reporter_patcher.stop)
+
+    def _batch_report(self):
+        # Attributes are only reported once per request.
+        RequestCache.clear_all_namespaces()
+        accumulate('hello', 10)
+        MonitoringSupportMiddleware(lambda request: None).process_response('fake request', 'fake response')
+
+    @override_settings(OPENEDX_TELEMETRY=_RECORDING_BACKENDS)
+    def test_disabled(self):
+        self._batch_report()
+        assert RecordingBackend.batches == [(threading.current_thread(), {'hello': 10})]
+        assert DeferredRecordingBackend.batches == [(threading.current_thread(), {'hello': 10})]
+
+    @override_settings(OPENEDX_TELEMETRY=_RECORDING_BACKENDS, MONITORING_DEFERRED_ATTRIBUTES_ENABLED=True)
+    def test_enabled(self):
+        self._batch_report()
+        self.reporter.join()
+        # Backends that need the active span are still sent the attributes inline.
+        assert RecordingBackend.batches == [(threading.current_thread(), {'hello': 10})]
+        assert len(DeferredRecordingBackend.batches) == 1
+        thread, attributes = DeferredRecordingBackend.batches[0]
+        assert thread is not threading.current_thread()
+        assert attributes == {'hello': 10}
+        # The batch is an immutable snapshot.
+        with self.assertRaises(TypeError):
+            attributes['hello'] = 20
+        assert get_deferred_attributes_stats() == {'backlog': 0, 'dropped': 0}
+
+    @override_settings(
+        OPENEDX_TELEMETRY=['edx_django_utils.monitoring.tests.test_deferred.BlockingBackend'],
+        MONITORING_DEFERRED_ATTRIBUTES_ENABLED=True,
+        MONITORING_DEFERRED_ATTRIBUTES_MAX_BACKLOG=1,
+    )
+    def test_full_queue_drops_batches(self):
+        BlockingBackend.release.clear()
+        try:
+            for _ in range(4):
+                self._batch_report()
+            stats = get_deferred_attributes_stats()
+            # The worker may or may not have taken the first batch off the queue yet.
+            assert stats['backlog'] == 1
+            assert stats['dropped'] in (2, 3)
+        finally:
+            BlockingBackend.release.set()
+        self.reporter.join()
+        assert get_deferred_attributes_stats()['backlog'] == 0
+
+    @override_settings(
+        OPENEDX_TELEMETRY=[
+            'edx_django_utils.monitoring.tests.test_deferred.FailingBackend',
+            'edx_django_utils.monitoring.tests.test_deferred.DeferredRecordingBackend',
+        ],
+        MONITORING_DEFERRED_ATTRIBUTES_ENABLED=True,
+    )
+    @patch('edx_django_utils.monitoring.internal.deferred.log')
+    def test_backend_failure(self, mock_log):
+        self._batch_report()
+        self._batch_report()
+        self.reporter.join()
+        assert mock_log.exception.call_count == 2
+        assert len(DeferredRecordingBackend.batches) == 2
+
+    def test_no_attributes(self):
+        RequestCache.clear_all_namespaces()
+        MonitoringSupportMiddleware(lambda request: None).process_response('fake request', 'fake response')
+        assert get_deferred_attributes_stats() == {'backlog': 0, 'dropped': 0}
+
+    def test_json_lines_file_backend(self):
+        def view(request):
+            set_monitoring_transaction_name(request)
+            accumulate('hello', 10)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'telemetry.jsonl'
+            with override_settings(
+                OPENEDX_TELEMETRY=['edx_django_utils.monitoring.JsonLinesFileBackend'],
+                OPENEDX_TELEMETRY_JSON_LINES_FILE=str(path),
+                MONITORING_DEFERRED_ATTRIBUTES_ENABLED=True,
+            ), patch.object(JsonLinesFileBackend, 'set_attributes') as mock_set_attributes:
+                handler = RequestCacheMiddleware(MonitoringSupportMiddleware(view))
+                handler('first')
+                handler('second')
+                mock_set_attributes.assert_not_called()
+                self.reporter.join()
+                configured_backends()[0]._file.close()  # pylint: disable=protected-access
+            events = [json.loads(line) for line in path.read_text().splitlines()]
+
+        # The deferred attributes are written with the transaction of the request they were collected in.
+        transaction_names = {event['transaction']: event['name'] for event in events if event['type'] == 'name'}
+        assert len(transaction_names) == 2
+        assert sorted(
+            (transaction_names[event['transaction']], event['attributes'])
+            for event in events if event['type'] == 'attributes'
+        ) == [('first', {'hello': 10}), ('second', {'hello': 10})]
@@ -0,0 +1,126 @@
+"""
+Tests for the telemetry backends that don't need a monitoring service, their
+pytest fixture, and the monitoring benchmark.
+"""
+import json
+
+import pytest
+from click.testing import CliRunner
+from django.test import override_settings
+
+from edx_django_utils.cache import RequestCache
+from edx_django_utils.cache.middleware import RequestCacheMiddleware
+from edx_django_utils.monitoring import (
+    InMemoryBackend,
+    JsonLinesFileBackend,
+    MonitoringSupportMiddleware,
+    accumulate,
+    function_trace,
+    record_exception,
+    set_custom_attribute,
+    set_monitoring_transaction_name
+)
+from edx_django_utils.monitoring.bench import main as bench_main
+from edx_django_utils.monitoring.internal.backends import configured_backends
+# pylint: disable=unused-import
+from edx_django_utils.monitoring.pytest_plugin import in_memory_telemetry
+
+# pylint: disable=redefined-outer-name
+
+
+def _handle_request(view):
+    """
+    Handles a request with the view, through the request cache and monitoring middleware.
+    """
+    RequestCacheMiddleware(MonitoringSupportMiddleware(view))('fake request')
+
+
+def _instrumented_view(request):
+    """
+    A view that uses each of the monitoring utilities.
+    """
+    set_monitoring_transaction_name('instrumented_view')
+    set_custom_attribute('hello', 'world')
+    accumulate('accumulated', 2)
+    accumulate('accumulated', 3)
+    with function_trace('some_span'):
+        pass
+    try:
+        raise ValueError('recorded')
+    except ValueError:
+        record_exception()
+    return 'fake response'
+
+
+def test_in_memory_backend(in_memory_telemetry):
+    assert isinstance(in_memory_telemetry, InMemoryBackend)
+    _handle_request(_instrumented_view)
+    _handle_request(lambda request: set_custom_attribute('second', True))
+
+    first_transaction, second_transaction = in_memory_telemetry.transactions
+    assert first_transaction.transaction_id != second_transaction.transaction_id
+    assert first_transaction.name == 'instrumented_view'
+    assert first_transaction.attributes == {'hello': 'world', 'accumulated': 5}
+    assert [name for name, _ in first_transaction.spans] == ['some_span']
+    assert first_transaction.spans[0][1] >= 0
+    assert [str(exception) for exception in first_transaction.exceptions] == ['recorded']
+    assert first_transaction.error is None
+    assert second_transaction.attributes == {'second': True}
+
+    in_memory_telemetry.clear()
+    assert not in_memory_telemetry.transactions
+
+
+def test_in_memory_backend_error(in_memory_telemetry):
+    exception = ValueError('unhandled')
+    MonitoringSupportMiddleware(lambda request: None).process_exception('fake request', exception)
+    assert in_memory_telemetry.current_transaction.error is exception
+
+
+def test_in_memory_telemetry_fixture_resets(in_memory_telemetry):
+    # The transaction of a previous test is not the current transaction.
+    assert not in_memory_telemetry.transactions
+    set_custom_attribute('hello', 'world')
+    assert in_memory_telemetry.current_transaction.attributes == {'hello': 'world'}
+
+
+def test_json_lines_file_backend(tmp_path):
+    path = tmp_path / 'telemetry.jsonl'
+    RequestCache.clear_all_namespaces()
+    with override_settings(
+        OPENEDX_TELEMETRY=['edx_django_utils.monitoring.JsonLinesFileBackend'],
+        OPENEDX_TELEMETRY_JSON_LINES_FILE=str(path),
+    ):
+        _handle_request(_instrumented_view)
+        configured_backends()[0]._file.close()  # pylint: disable=protected-access
+
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len({event.pop('transaction') for event in events}) == 1
+    spans = [event for event in events if event['type'] == 'span']
+    assert len(spans) == 1
+    assert spans[0]['name'] == 'some_span'
+    assert [event for event in events if event['type'] != 'span'] == [
+        {'type': 'name', 'name': 'instrumented_view'},
+        {'type': 'attributes', 'attributes': {'hello': 'world'}},
+        {'type': 'exception', 'exception': "ValueError('recorded')"},
+        {'type': 'attributes', 'attributes': {'accumulated': 5}},
+    ]
+
+
+def test_json_lines_file_backend_not_configured():
+    with override_settings(OPENEDX_TELEMETRY_JSON_LINES_FILE=None):
+        with pytest.raises(Exception, match='OPENEDX_TELEMETRY_JSON_LINES_FILE not set'):
+            JsonLinesFileBackend()
+
+
+def test_bench():
+    result = CliRunner().invoke(bench_main, ['--requests', '10', '--attributes', '2'])
+    assert result.exit_code == 0, result.output
+    assert 'Replayed 10 synthetic requests, each setting 2 custom attributes.' in result.output
+    assert 'edx_django_utils.monitoring.InMemoryBackend: ' in result.output
+
+
+def test_bench_max_overhead():
+    result = CliRunner().invoke(bench_main, ['--requests', '10', '--max-overhead', '0'])
+    assert result.exit_code == 1
+    assert 'per request is more than 0.0µs' in result.output
@@ -94,7 +94,7 @@ class CookieMonitoringMiddlewareTestCase(TestCase):
         self.mock_response = Mock()
 
     @patch('edx_django_utils.monitoring.internal.middleware.log', autospec=True)
-    @patch("edx_django_utils.monitoring.internal.middleware._set_custom_attribute")
+    @patch("edx_django_utils.monitoring.internal.middleware._set_custom_attributes")
     @ddt.data(
         (None, None),  # logging threshold not defined
         (5, None),  # logging threshold too high
@@ -102,7 +102,7 @@ class CookieMonitoringMiddlewareTestCase(TestCase):
     )
     @ddt.unpack
     def test_cookie_monitoring_with_no_logging(
-        self, logging_threshold, sampling_request_count, mock_set_custom_attribute, mock_logger
+        self, logging_threshold, sampling_request_count, mock_set_custom_attributes, mock_logger
     ):
         expected_response = self.mock_response
         middleware = CookieMonitoringMiddleware(lambda request: expected_response)
@@ -114,14 +114,14 @@ class CookieMonitoringMiddlewareTestCase(TestCase):
 
         assert actual_response == expected_response
         # expect monitoring of header size for all requests
-        mock_set_custom_attribute.assert_called_once_with('cookies.header.size', 3)
+        mock_set_custom_attributes.assert_called_once_with({'cookies.header.size': 3})
         # cookie logging was not enabled, so nothing should be logged
         mock_logger.info.assert_not_called()
         mock_logger.exception.assert_not_called()
 
     @override_settings(COOKIE_HEADER_SIZE_LOGGING_THRESHOLD=None)
     @override_settings(COOKIE_SAMPLING_REQUEST_COUNT=None)
-    @patch("edx_django_utils.monitoring.internal.middleware._set_custom_attribute")
+    @patch("edx_django_utils.monitoring.internal.middleware._set_custom_attributes")
     @ddt.data(
         # A corrupt cookie header contains "Cookie: ".
         ('corruptCookie: normal-cookie=value', 1, 1),
@@ -130,7 +130,7 @@ class CookieMonitoringMiddlewareTestCase(TestCase):
     )
     @ddt.unpack
     def test_cookie_header_corrupt_monitoring(
-        self, corrupt_cookie_header, expected_corrupt_count, expected_corrupt_key_count, mock_set_custom_attribute
+        self, corrupt_cookie_header, expected_corrupt_count, expected_corrupt_key_count, mock_set_custom_attributes
     ):
         middleware = CookieMonitoringMiddleware(self.mock_response)
         request = RequestFactory().request()
@@ -138,16 +138,17 @@ class CookieMonitoringMiddlewareTestCase(TestCase):
 
         middleware(request)
 
-        mock_set_custom_attribute.assert_has_calls([
-            call('cookies.header.size', len(request.headers['cookie'])),
-            call('cookies.header.corrupt_count', expected_corrupt_count),
-            call('cookies.header.corrupt_key_count', expected_corrupt_key_count),
-        ])
+        mock_set_custom_attributes.assert_called_once_with({
+            'cookies.header.size': len(request.headers['cookie']),
+            'cookies.header.corrupt_count': expected_corrupt_count,
+            'cookies.header.corrupt_key_count': expected_corrupt_key_count,
+        })
 
     @override_settings(COOKIE_HEADER_SIZE_LOGGING_THRESHOLD=1)
     @patch('edx_django_utils.monitoring.internal.middleware.log', autospec=True)
     @patch("edx_django_utils.monitoring.internal.middleware._set_custom_attribute")
-    def test_log_cookie_with_threshold_met(self, mock_set_custom_attribute, mock_logger):
+    @patch("edx_django_utils.monitoring.internal.middleware._set_custom_attributes")
+    def test_log_cookie_with_threshold_met(self, mock_set_custom_attributes, mock_set_custom_attribute, mock_logger):
         middleware = CookieMonitoringMiddleware(self.mock_response)
         cookies_dict = {
             "a": "yy",
@@ -157,10 +158,8 @@ class CookieMonitoringMiddlewareTestCase(TestCase):
 
         middleware(self.get_mock_request(cookies_dict))
 
-        mock_set_custom_attribute.assert_has_calls([
-            call('cookies.header.size', 16),
-            call('cookies.header.size.computed', 16)
-        ])
+        mock_set_custom_attributes.assert_called_once_with({'cookies.header.size': 16})
+        mock_set_custom_attribute.assert_called_once_with('cookies.header.size.computed', 16)
         mock_logger.info.assert_called_once_with(
             "Large (>= 1) cookie header detected. BEGIN-COOKIE-SIZES(total=16) b: 3, a: 2, c: 1 END-COOKIE-SIZES"
         )
@@ -239,7 +238,8 @@ class CookieMonitoringMiddlewareTestCase(TestCase):
     @override_settings(COOKIE_SAMPLING_REQUEST_COUNT=1)
     @patch('edx_django_utils.monitoring.internal.middleware.log', autospec=True)
     @patch("edx_django_utils.monitoring.internal.middleware._set_custom_attribute")
-    def test_log_cookie_with_sampling(self, mock_set_custom_attribute, mock_logger):
+    @patch("edx_django_utils.monitoring.internal.middleware._set_custom_attributes")
+    def test_log_cookie_with_sampling(self, mock_set_custom_attributes, mock_set_custom_attribute, mock_logger):
         middleware = CookieMonitoringMiddleware(self.mock_response)
         cookies_dict = {
             "a": "yy",
@@ -249,10 +249,8 @@ class CookieMonitoringMiddlewareTestCase(TestCase):
 
         middleware(self.get_mock_request(cookies_dict))
 
-        mock_set_custom_attribute.assert_has_calls([
-            call('cookies.header.size', 16),
-            call('cookies.header.size.computed', 16)
-        ])
+        mock_set_custom_attributes.assert_called_once_with({'cookies.header.size': 16})
+        mock_set_custom_attribute.assert_called_once_with('cookies.header.size.computed', 16)
         mock_logger.info.assert_called_once_with(
             "Sampled small (< 9999) cookie header. BEGIN-COOKIE-SIZES(total=16) b: 3, a: 2, c: 1 END-COOKIE-SIZES"
         )
@@ -261,16 +259,14 @@ class CookieMonitoringMiddlewareTestCase(TestCase):
     @override_settings(COOKIE_HEADER_SIZE_LOGGING_THRESHOLD=9999)
     @override_settings(COOKIE_SAMPLING_REQUEST_COUNT=1)
     @patch('edx_django_utils.monitoring.internal.middleware.log', autospec=True)
-    @patch("edx_django_utils.monitoring.internal.middleware._set_custom_attribute")
-    def test_empty_cookie_header_skips_sampling(self, mock_set_custom_attribute, mock_logger):
+    @patch("edx_django_utils.monitoring.internal.middleware._set_custom_attributes")
+    def test_empty_cookie_header_skips_sampling(self, mock_set_custom_attributes, mock_logger):
         middleware = CookieMonitoringMiddleware(self.mock_response)
         cookies_dict = {}
 
         middleware(self.get_mock_request(cookies_dict))
 
-        mock_set_custom_attribute.assert_has_calls([
-            call('cookies.header.size', 0),
-        ])
+        mock_set_custom_attributes.assert_called_once_with({'cookies.header.size': 0})
         mock_logger.info.assert_not_called()
         mock_logger.exception.assert_not_called()
 
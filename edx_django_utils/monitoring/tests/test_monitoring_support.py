@@ -3,18 +3,21 @@ Tests for MonitoringSupportMiddleware and associated utilities.
 
 Note: See test_middleware.py for the rest of the middleware tests.
 """
+import timeit
 from contextlib import contextmanager
-from unittest.mock import ANY, Mock, call, patch
+from unittest.mock import ANY, Mock, patch
 
 import ddt
 from django.test import TestCase, override_settings
 
-from edx_django_utils.cache import RequestCache
+from edx_django_utils.cache import RequestCache, TieredCache
 from edx_django_utils.monitoring import (
     CachedCustomMonitoringMiddleware,
     MonitoringSupportMiddleware,
     accumulate,
-    increment
+    function_trace,
+    increment,
+    record_distribution
 )
 from edx_django_utils.monitoring.signals import (
     monitoring_support_process_exception,
@@ -57,12 +60,12 @@ class TestMonitoringSupportMiddleware(TestCase):
         increment('foo')
         increment('foo')
 
-        # based on the attribute data above, we expect the following calls to newrelic:
-        nr_agent_calls_expected = [
-            call('hello', 10),
-            call('world', 20),
-            call('foo', 2),
-        ]
+        # based on the attribute data above, we expect the following attributes in newrelic:
+        nr_agent_attributes_expected = {
+            'hello': 10,
+            'world': 20,
+            'foo': 2,
+        }
 
         # fake a response to trigger attributes reporting
         middleware_method = getattr(cached_monitoring_middleware_class(self.mock_get_response), middleware_method_name)
@@ -71,16 +74,11 @@ class TestMonitoringSupportMiddleware(TestCase):
             'fake response',
         )
 
-        # Assert call counts to newrelic.agent.add_custom_attribute()
-        expected_call_count = len(nr_agent_calls_expected)
-        if is_deprecated:
-            expected_call_count += 1
-        measured_call_count = mock_newrelic_agent.add_custom_attribute.call_count
-        self.assertEqual(expected_call_count, measured_call_count)
-
-        # Assert call args to newrelic.agent.add_custom_attribute().  Due to
-        # the nature of python dicts, call order is undefined.
-        mock_newrelic_agent.add_custom_attribute.assert_has_calls(nr_agent_calls_expected, any_order=True)
+        # Assert the attributes are reported with a single call to newrelic.agent.add_custom_attributes()
+        expected_call_count = 1 if is_deprecated else 0
+        self.assertEqual(expected_call_count, mock_newrelic_agent.add_custom_attribute.call_count)
+        mock_newrelic_agent.add_custom_attributes.assert_called_once()
+        self.assertEqual(self._get_nr_agent_attributes(mock_newrelic_agent), nr_agent_attributes_expected)
 
     @patch('newrelic.agent')
     @ddt.data(
@@ -97,11 +95,11 @@ class TestMonitoringSupportMiddleware(TestCase):
         accumulate('hello', None)
         accumulate('hello', 10)
 
-        # based on the metric data above, we expect the following calls to newrelic:
-        nr_agent_calls_expected = [
-            call('hello', None),
-            call('error_adding_accumulated_metric', 'name=hello, new_value=10, cached_value=None'),
-        ]
+        # based on the metric data above, we expect the error to be reported immediately,
+        # and the following attributes in newrelic:
+        nr_agent_attributes_expected = {
+            'hello': None,
+        }
 
         self.mock_get_response = Mock()
         # fake a response to trigger metrics reporting
@@ -110,15 +108,157 @@ class TestMonitoringSupportMiddleware(TestCase):
             'fake response',
         )
 
-        # Assert call counts to newrelic.agent.add_custom_attribute()
-        expected_call_count = len(nr_agent_calls_expected)
-        if is_deprecated:
-            expected_call_count += 1
-        measured_call_count = mock_newrelic_agent.add_custom_attribute.call_count
-        self.assertEqual(expected_call_count, measured_call_count)
+        # Assert the attributes are reported with a single call to newrelic.agent.add_custom_attributes()
+        expected_call_count = 2 if is_deprecated else 1
+        self.assertEqual(expected_call_count, mock_newrelic_agent.add_custom_attribute.call_count)
+        mock_newrelic_agent.add_custom_attribute.assert_any_call(
+            'error_adding_accumulated_metric', 'name=hello, new_value=10, cached_value=None'
+        )
+        mock_newrelic_agent.add_custom_attributes.assert_called_once()
+        self.assertEqual(self._get_nr_agent_attributes(mock_newrelic_agent), nr_agent_attributes_expected)
+
+    @patch('newrelic.agent')
+    @override_settings(CACHE_INSTRUMENTATION_ENABLED=True)
+    def test_cache_instrumentation_reported(self, mock_newrelic_agent):
+        """
+        Test cache instrumentation is reported with the accumulated custom attributes.
+        """
+        TieredCache.get_cached_response('course:outline')
+        MonitoringSupportMiddleware(self.mock_get_response).process_response('fake request', 'fake response')
+
+        nr_agent_attributes = self._get_nr_agent_attributes(mock_newrelic_agent)
+        assert nr_agent_attributes['tiered_cache.prefix.course.hits'] == 0
+        assert nr_agent_attributes['tiered_cache.prefix.course.misses'] == 1
+
+    @patch('newrelic.agent')
+    def test_record_distribution(self, mock_newrelic_agent):
+        """
+        Test a distribution is reported as its count, sum, min, max and percentiles.
+        """
+        for value in range(1, 101):
+            record_distribution('query.size', value)
+        record_distribution('query.size', 0.5)
+        record_distribution('other.size', 3)
+
+        MonitoringSupportMiddleware(self.mock_get_response).process_response('fake request', 'fake response')
+
+        mock_newrelic_agent.add_custom_attributes.assert_called_once()
+        assert self._get_nr_agent_attributes(mock_newrelic_agent) == {
+            'query.size.count': 101,
+            'query.size.sum': 5050.5,
+            'query.size.min': 0.5,
+            'query.size.max': 100,
+            # Percentiles are the upper bounds of power-of-two buckets, limited to the max.
+            'query.size.p50': 64,
+            'query.size.p95': 100,
+            'query.size.p99': 100,
+            'other.size.count': 1,
+            'other.size.sum': 3,
+            'other.size.min': 3,
+            'other.size.max': 3,
+            'other.size.p50': 3,
+            'other.size.p95': 3,
+            'other.size.p99': 3,
+        }
+
+    @patch('newrelic.agent')
+    def test_record_distribution_with_illegal_value(self, mock_newrelic_agent):
+        """
+        Test a distribution ignores values that aren't numbers, and names used with accumulate.
+        """
+        record_distribution('query.size', 10)
+        record_distribution('query.size', 'large')
+        accumulate('hello', 10)
+        record_distribution('hello', 10)
+
+        MonitoringSupportMiddleware(self.mock_get_response).process_response('fake request', 'fake response')
+
+        mock_newrelic_agent.add_custom_attribute.assert_any_call('error_recording_distribution', ANY)
+        self.assertEqual(mock_newrelic_agent.add_custom_attribute.call_count, 2)
+        nr_agent_attributes = self._get_nr_agent_attributes(mock_newrelic_agent)
+        assert nr_agent_attributes['query.size.count'] == 1
+        assert nr_agent_attributes['hello'] == 10
+
+    def test_record_distribution_performance(self):
+        call_iterations = 10000
+        time = timeit.timeit(lambda: record_distribution('query.size', 42), number=call_iterations)
+        average_time = time / call_iterations
+        self.assertLess(average_time, 0.00005, f'Recording a value takes {average_time}s which is too slow.')
+
+    @patch('newrelic.agent')
+    @patch('edx_django_utils.monitoring.internal.utils.time.perf_counter_ns')
+    @patch('edx_django_utils.monitoring.internal.utils.random.random')
+    def test_function_trace_sampling(self, mock_random, mock_perf_counter_ns, mock_newrelic_agent):
+        """
+        Test only sampled calls create a span, and all calls are timed and reported together.
+        """
+        mock_random.side_effect = [0.1, 0.9, 0.9]
+        # Calls that take 2ms, 0.5ms and 1ms.
+        mock_perf_counter_ns.side_effect = [0, 2_000_000, 2_000_000, 2_500_000, 3_000_000, 4_000_000]
+        for _ in range(3):
+            with function_trace('hot.function', sample_rate=0.5, min_duration_ms=1):
+                pass
+
+        MonitoringSupportMiddleware(self.mock_get_response).process_response('fake request', 'fake response')
+
+        mock_newrelic_agent.FunctionTrace.assert_called_once_with('hot.function')
+        assert self._get_nr_agent_attributes(mock_newrelic_agent) == {
+            'hot.function.calls': 3,
+            'hot.function.duration_ms': 3.5,
+            'hot.function.slow_calls': 2,
+        }
+
+    @patch('newrelic.agent')
+    @patch('edx_django_utils.monitoring.internal.utils.random.random')
+    def test_function_trace_not_sampled(self, mock_random, mock_newrelic_agent):
+        with self.assertRaises(ValueError):
+            with function_trace('hot.function', sample_rate=0):
+                raise ValueError('The call is still timed.')
+
+        MonitoringSupportMiddleware(self.mock_get_response).process_response('fake request', 'fake response')
+
+        mock_random.assert_not_called()
+        mock_newrelic_agent.FunctionTrace.assert_not_called()
+        nr_agent_attributes = self._get_nr_agent_attributes(mock_newrelic_agent)
+        assert nr_agent_attributes['hot.function.calls'] == 1
+        assert nr_agent_attributes['hot.function.duration_ms'] >= 0
+        assert 'hot.function.slow_calls' not in nr_agent_attributes
+
+    @patch('newrelic.agent')
+    def test_function_trace_without_sampling(self, mock_newrelic_agent):
+        """
+        Test calls without a sample rate or minimum duration are not timed.
+        """
+        with function_trace('hot.function'):
+            pass
 
-        # Assert call args to newrelic.agent.add_custom_attribute().
-        mock_newrelic_agent.add_custom_attribute.assert_has_calls(nr_agent_calls_expected, any_order=True)
+        MonitoringSupportMiddleware(self.mock_get_response).process_response('fake request', 'fake response')
+
+        mock_newrelic_agent.FunctionTrace.assert_called_once_with('hot.function')
+        mock_newrelic_agent.add_custom_attributes.assert_not_called()
+
+    @patch('newrelic.agent')
+    def test_function_trace_with_illegal_name(self, mock_newrelic_agent):
+        """
+        Test timings ignore names used with accumulate.
+        """
+        accumulate('hello', 10)
+        with function_trace('hello', sample_rate=0):
+            pass
+
+        MonitoringSupportMiddleware(self.mock_get_response).process_response('fake request', 'fake response')
+
+        mock_newrelic_agent.add_custom_attribute.assert_called_once_with('error_recording_function_timing', ANY)
+        assert self._get_nr_agent_attributes(mock_newrelic_agent) == {'hello': 10}
+
+    def _get_nr_agent_attributes(self, mock_newrelic_agent):
+        """
+        Returns the attributes reported with newrelic.agent.add_custom_attributes().
+        """
+        attributes = {}
+        for mock_call in mock_newrelic_agent.add_custom_attributes.call_args_list:
+            attributes.update(mock_call[0][0])
+        return attributes
 
     @contextmanager
     def catch_signal(self, signal):
@@ -0,0 +1,113 @@
+"""
+Tests for sampling and dropping of custom attributes.
+"""
+from unittest.mock import call, patch
+
+import ddt
+from django.test import TestCase, override_settings
+
+from edx_django_utils.cache import RequestCache
+from edx_django_utils.monitoring import (
+    MonitoringSupportMiddleware,
+    accumulate,
+    set_custom_attribute,
+    set_custom_attributes
+)
+from edx_django_utils.monitoring.internal.sampling import configured_custom_attribute_sampler
+
+
+@ddt.ddt
+@patch('newrelic.agent')
+class TestCustomAttributeSampling(TestCase):
+    """
+    Test sampling and dropping of custom attributes.
+    """
+    def setUp(self):
+        super().setUp()
+        RequestCache.clear_all_namespaces()
+
+    def test_no_sampling(self, mock_newrelic_agent):
+        assert configured_custom_attribute_sampler() is None
+        set_custom_attribute('code_owner', 'team-red')
+        mock_newrelic_agent.add_custom_attribute.assert_called_once_with('code_owner', 'team-red')
+
+    @override_settings(CUSTOM_ATTRIBUTE_DROP_LIST=['code_owner_module', 'cookies.*'])
+    @ddt.data(
+        ('code_owner_module', False),
+        ('code_owner_module_other', True),
+        ('cookies.header.size', False),
+        ('cookies', True),
+        ('code_owner', True),
+    )
+    @ddt.unpack
+    def test_drop_list(self, name, is_reported, mock_newrelic_agent):
+        set_custom_attribute(name, 1)
+        assert mock_newrelic_agent.add_custom_attribute.called == is_reported
+
+    @override_settings(CUSTOM_ATTRIBUTE_SAMPLE_RATES={
+        'cookies.*': 0.5,
+        'cookies.header.*': 0,
+        'cookies.header.size': 1,
+        'code_owner_transaction_name': 0.25,
+    })
+    @ddt.data(
+        # (name, sample value, is_reported)
+        ('cookies.other', 0.4, True),
+        ('cookies.other', 0.6, False),
+        ('cookies.header.corrupt_count', 0.1, False),
+        ('cookies.header.size', 0.9, True),
+        ('code_owner_transaction_name', 0.2, True),
+        ('code_owner_transaction_name', 0.3, False),
+    )
+    @ddt.unpack
+    def test_sample_rates(self, name, sample_value, is_reported, mock_newrelic_agent):
+        with patch('edx_django_utils.monitoring.internal.sampling.random.random', return_value=sample_value):
+            set_custom_attribute(name, 1)
+        assert mock_newrelic_agent.add_custom_attribute.called == is_reported
+
+    @override_settings(CUSTOM_ATTRIBUTE_SAMPLE_RATES={'*': 0, 'code_owner': 1})
+    def test_allow_list(self, mock_newrelic_agent):
+        set_custom_attributes({'code_owner': 'team-red', 'code_owner_module': 'some.module'})
+        mock_newrelic_agent.add_custom_attributes.assert_called_once()
+        assert dict(mock_newrelic_agent.add_custom_attributes.call_args[0][0]) == {'code_owner': 'team-red'}
+
+    @override_settings(CUSTOM_ATTRIBUTE_SAMPLE_RATES={'temp_*': 0.5})
+    def test_transaction_sampling(self, mock_newrelic_agent):
+        """
+        Test the attributes of a transaction are sampled together, and each transaction is sampled separately.
+        """
+        with patch(
+            'edx_django_utils.monitoring.internal.sampling.random.random', side_effect=[0.1, 0.9]
+        ) as mock_random:
+            set_custom_attribute('temp_first', 1)
+            set_custom_attribute('temp_second', 2)
+            RequestCache.clear_all_namespaces()
+            set_custom_attribute('temp_third', 3)
+        assert mock_random.call_count == 2
+        assert mock_newrelic_agent.add_custom_attribute.call_args_list == [
+            call('temp_first', 1), call('temp_second', 2),
+        ]
+
+    @override_settings(CUSTOM_ATTRIBUTE_DROP_LIST=['hello'])
+    def test_batch_report(self, mock_newrelic_agent):
+        accumulate('hello', 10)
+        accumulate('world', 10)
+        MonitoringSupportMiddleware(lambda request: None).process_response('fake request', 'fake response')
+        mock_newrelic_agent.add_custom_attributes.assert_called_once()
+        assert dict(mock_newrelic_agent.add_custom_attributes.call_args[0][0]) == {'world': 10}
+
+    @override_settings(CUSTOM_ATTRIBUTE_DROP_LIST=['hello'])
+    def test_batch_report_all_dropped(self, mock_newrelic_agent):
+        accumulate('hello', 10)
+        MonitoringSupportMiddleware(lambda request: None).process_response('fake request', 'fake response')
+        mock_newrelic_agent.add_custom_attributes.assert_not_called()
+
+    @ddt.data(
+        {'CUSTOM_ATTRIBUTE_SAMPLE_RATES': {'code_owner': 2}},
+        {'CUSTOM_ATTRIBUTE_SAMPLE_RATES': {'code_owner': '0.5'}},
+        {'CUSTOM_ATTRIBUTE_DROP_LIST': 'code_owner'},
+    )
+    def test_invalid_settings(self, invalid_settings, mock_newrelic_agent):  # pylint: disable=unused-argument
+        with override_settings(**invalid_settings):
+            with self.assertRaises(ValueError):
+                configured_custom_attribute_sampler()
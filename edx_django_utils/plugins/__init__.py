@@ -4,9 +4,10 @@ Plugins infrastructure
 See README.rst for details.
 """
 
-from .constants import PluginContexts, PluginSettings, PluginSignals, PluginURLs
+from .constants import PluginCacheWarmers, PluginContexts, PluginSettings, PluginSignals, PluginURLs
 from .pluggable_override import pluggable_override
 from .plugin_apps import get_plugin_apps
+from .plugin_cache_warmers import get_plugin_cache_warmers
 from .plugin_contexts import get_plugins_view_context
 from .plugin_manager import PluginError, PluginManager
 from .plugin_settings import add_plugins
@@ -67,3 +67,18 @@ class PluginContexts():
     """
 
     CONFIG = "view_context_config"
+
+
+class PluginCacheWarmers():
+    """
+    The PluginCacheWarmers enum defines dictionary field names (and defaults)
+    that can be specified by a Plugin App in order to configure the cache
+    warmers run by the ``warm_tiered_cache`` management command.
+    """
+
+    CONFIG = "cache_warmers_config"
+
+    WARMERS = "warmers"
+
+    RELATIVE_PATH = "relative_path"
+    DEFAULT_RELATIVE_PATH = "cache_warmers"
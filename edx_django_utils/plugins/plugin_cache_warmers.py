@@ -0,0 +1,49 @@
+"""
+Allows plugins to register TieredCache warmers
+
+Please remember to expose any new public methods in the `__init__.py` file.
+"""
+from logging import getLogger
+
+from . import constants, registry, utils
+
+log = getLogger(__name__)
+
+
+def get_plugin_cache_warmers(project_type):
+    """
+    Returns a dict of the cache warmers of all plugin apps for the project
+    type, keyed by the full path to each warmer.
+
+    A cache warmer is a function that takes no arguments and returns an
+    iterable of ``(key, value, timeout)`` tuples to write to the TieredCache.
+    See the ``warm_tiered_cache`` management command.
+    """
+    cache_warmers = {}
+    for app_config in registry.get_plugin_app_configs(project_type):
+        cache_warmers_config = _get_config(app_config, project_type)
+        if cache_warmers_config is None:
+            continue
+
+        cache_warmers_module_path = utils.get_module_path(
+            app_config, cache_warmers_config, constants.PluginCacheWarmers
+        )
+        cache_warmers_module = utils.import_module(cache_warmers_module_path)
+        for warmer_func_name in cache_warmers_config.get(constants.PluginCacheWarmers.WARMERS, []):
+            cache_warmers[f"{cache_warmers_module_path}.{warmer_func_name}"] = utils.import_attr_in_module(
+                cache_warmers_module, warmer_func_name
+            )
+
+        log.debug(
+            "Plugin Apps [Cache Warmers]: Found %s with %d warmer(s) for %s",
+            app_config.name,
+            len(cache_warmers_config.get(constants.PluginCacheWarmers.WARMERS, [])),
+            project_type,
+        )
+    return cache_warmers
+
+
+def _get_config(app_config, project_type):
+    plugin_config = getattr(app_config, constants.PLUGIN_APP_CLASS_ATTRIBUTE_NAME, {})
+    cache_warmers_config = plugin_config.get(constants.PluginCacheWarmers.CONFIG, {})
+    return cache_warmers_config.get(project_type)
@@ -39,6 +39,7 @@ INSTALLED_APPS = (
     "django.contrib.contenttypes",
     "waffle",
     "edx_django_utils",
+    "edx_django_utils.cache",
     "edx_django_utils.admin.tests",
     "edx_django_utils.user",
     'edx_django_utils.data_generation',